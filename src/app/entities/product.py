@@ -1,8 +1,50 @@
+import hashlib
+import json
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Mapping, Optional
 
 from pydantic import BaseModel, Field
 
+# Scraped fields that make up a listing's content; "price" maps to current_price
+FINGERPRINT_FIELDS = (
+    "title",
+    "description",
+    "source_product_code",
+    "city",
+    "state",
+    "seller_name",
+    "is_available",
+    "image_urls",
+    "price",
+)
+
+# Client-writable columns left out of the fingerprint; a write that only changes
+# one of them still has to be saved
+UNFINGERPRINTED_FIELDS = ("url", "source_website_id", "condition", "source_metadata")
+
+
+def _normalize_fingerprint_value(field: str, value: Any) -> Any:
+    if value is None or value == "":
+        return None
+    if field == "price":
+        try:
+            return f"{float(value):.2f}"
+        except (TypeError, ValueError):
+            return str(value).strip()
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return value
+
+
+def compute_content_fingerprint(data: Mapping[str, Any]) -> str:
+    """Stable hash of a product's normalized content, shared by the API and workers."""
+    normalized = [
+        _normalize_fingerprint_value(field, data.get(field))
+        for field in FINGERPRINT_FIELDS
+    ]
+    payload = json.dumps(normalized, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
 
 class Product(BaseModel):
     url: str
@@ -20,4 +62,11 @@ class Product(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     current_price: Optional[float] = None
+    current_price_at: Optional[datetime] = None
+    content_fingerprint: Optional[str] = None
+    last_checked_at: Optional[datetime] = None
     id: Optional[int] = None
+
+    def compute_content_fingerprint(self, price: Optional[float] = None) -> str:
+        price = self.current_price if price is None else price
+        return compute_content_fingerprint({**self.model_dump(), "price": price})
@@ -6,3 +6,5 @@ class SourceWebsite(BaseModel):
     name: str
     base_url: str
     is_active: bool = True
+    rate_limit_per_second: float | None = None
+    rate_limit_burst: int | None = None
@@ -10,24 +10,32 @@ def get_fixtures():
                 "name": "olx",
                 "base_url": "https://www.olx.com.br/brasil",
                 "is_active": True,
+                "rate_limit_per_second": 2,
+                "rate_limit_burst": 5,
             },
             {
                 "id": 2,
                 "name": "enjoei",
                 "base_url": "https://enjusearch.enjoei.com.br",
                 "is_active": True,
+                "rate_limit_per_second": 5,
+                "rate_limit_burst": 10,
             },
             {
                 "id": 3,
                 "name": "mercado_livre",
                 "base_url": "https://lista.mercadolivre.com.br",
                 "is_active": True,
+                "rate_limit_per_second": 2,
+                "rate_limit_burst": 5,
             },
             {
                 "id": 4,
                 "name": "estante_virtual",
                 "base_url": "https://www.estantevirtual.com.br",
                 "is_active": True,
+                "rate_limit_per_second": 3,
+                "rate_limit_burst": 6,
             },
         ],
         "products": [
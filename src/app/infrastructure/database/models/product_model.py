@@ -10,6 +10,8 @@ from sqlalchemy import (
     Boolean,
     JSON,
     Text,
+    Numeric,
+    Index,
 )
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship
@@ -28,11 +30,7 @@ class Product(Base):
     __tablename__ = "products"
 
     id = Column(Integer, primary_key=True, index=True)
-    url = Column(
-        Text,
-        # unique=True,
-        # index=True
-    )
+    url = Column(Text, unique=True)
     title = Column(String(255), index=True)
     description = Column(Text)
 
@@ -55,6 +53,15 @@ class Product(Base):
     seller_name = Column(String(255))
     is_available = Column(Boolean, default=True)
 
+    # Latest price, kept in sync with price_history on every price write
+    current_price = Column(Numeric(10, 2), nullable=True, index=True)
+    current_price_at = Column(DateTime, nullable=True)
+
+    # Hash of the normalized scraped content, lets refreshes skip no-op writes
+    content_fingerprint = Column(String(32), nullable=True)
+    # Last time the listing was scraped, including refreshes that changed nothing
+    last_checked_at = Column(DateTime, nullable=True)
+
     # Images (URLs separated by commas)
     image_urls = Column(Text)
 
@@ -81,3 +88,6 @@ class Product(Base):
         "PriceHistory", back_populates="product", cascade="all, delete-orphan"
     )
     source_website = relationship("SourceWebsite", back_populates="products")
+
+    # Update sweeps page one website's products in id order
+    __table_args__ = (Index("ix_products_source_website_id_id", source_website_id, id),)
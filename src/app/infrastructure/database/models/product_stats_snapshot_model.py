@@ -0,0 +1,21 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, Numeric
+
+from src.app.infrastructure.database_config import Base
+
+PRODUCT_STATS_SNAPSHOT_ID = 1
+
+
+class ProductStatsSnapshot(Base):
+    __tablename__ = "product_stats_snapshot"
+
+    # Single-row table, see PRODUCT_STATS_SNAPSHOT_ID
+    id = Column(Integer, primary_key=True)
+    total_products = Column(Integer, nullable=False, default=0)
+    priced_products = Column(Integer, nullable=False, default=0)
+    price_sum = Column(Numeric(16, 2), nullable=False, default=0)
+    min_price = Column(Numeric(10, 2), nullable=True)
+    max_price = Column(Numeric(10, 2), nullable=True)
+    is_stale = Column(Boolean, nullable=False, default=False)
+    refreshed_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
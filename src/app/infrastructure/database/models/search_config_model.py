@@ -26,11 +26,13 @@ class SearchConfig(Base):
     preferred_time = Column(Time, default=time(0, 0))
     search_metadata = Column(JSON)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # Watermark for the beat scheduler's incremental sync (see beat_schedule.py)
     updated_at = Column(
         DateTime,
-        default=datetime.now(timezone.utc),
-        onupdate=datetime.now(timezone.utc),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        index=True,
     )
 
     # Relationships
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float
 from sqlalchemy.orm import relationship
 from .search_config_source_website_model import search_config_source_website
 
@@ -13,6 +13,9 @@ class SourceWebsite(Base):
     name = Column(String(255), unique=True, nullable=False)
     base_url = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
+    # Requests per second shared by all workers scraping this site, NULL = unlimited
+    rate_limit_per_second = Column(Float, nullable=True)
+    rate_limit_burst = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.now(timezone.utc))
     updated_at = Column(
         DateTime,
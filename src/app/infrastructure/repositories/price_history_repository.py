@@ -1,10 +1,14 @@
 from typing import List, Optional
 
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from src.app.infrastructure.database.models.price_history_model import (
     PriceHistory as PriceHistoryModel,
 )
+from src.app.infrastructure.database.models.product_model import (
+    Product as ProductModel,
+)
 from src.app.entities import price_history as PriceHistoryEntity
 from src.app.interfaces.repositories.price_history_repository import (
     PriceHistoryRepositoryInterface,
@@ -21,6 +25,9 @@ class PriceHistoryRepository(PriceHistoryRepositoryInterface):
         try:
             db_price_history = PriceHistoryModel(**price_history.__dict__)
             self.db.add(db_price_history)
+            self._sync_current_price(
+                price_history.product_id, price_history.price, price_history.created_at
+            )
             self.db.commit()
             self.db.refresh(db_price_history)
             return PriceHistoryEntity.PriceHistory(**db_price_history.__dict__)
@@ -28,6 +35,22 @@ class PriceHistoryRepository(PriceHistoryRepositoryInterface):
             self.db.rollback()
             raise e
 
+    def _sync_current_price(self, product_id: int, price: float, created_at) -> None:
+        # Skip older entries so a backdated insert never replaces a newer price
+        self.db.query(ProductModel).filter(
+            ProductModel.id == product_id,
+            or_(
+                ProductModel.current_price_at.is_(None),
+                ProductModel.current_price_at <= created_at,
+            ),
+        ).update(
+            {
+                ProductModel.current_price: price,
+                ProductModel.current_price_at: created_at,
+            },
+            synchronize_session=False,
+        )
+
     def get_by_product_id(
         self, product_id: int
     ) -> List[PriceHistoryEntity.PriceHistory]:
@@ -1,8 +1,11 @@
+import base64
+import json
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any, Tuple
 
-from sqlalchemy import func, cast, Date
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, cast, case, Date, literal_column, update, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
 from sqlalchemy import inspect
 from sqlalchemy.types import Boolean
 
@@ -12,11 +15,45 @@ from src.app.infrastructure.database.models.product_model import (
 from src.app.infrastructure.database.models.price_history_model import (
     PriceHistory as PriceHistoryModel,
 )
-from src.app.entities.product import Product as ProductEntity
+from src.app.infrastructure.database.models.product_stats_snapshot_model import (
+    PRODUCT_STATS_SNAPSHOT_ID,
+    ProductStatsSnapshot as ProductStatsSnapshotModel,
+)
+from src.app.entities.product import (
+    FINGERPRINT_FIELDS,
+    UNFINGERPRINTED_FIELDS,
+    Product as ProductEntity,
+)
 from src.app.interfaces.repositories.product_repository import (
     ProductRepositoryInterface,
 )
 
+KEYSET_SORT_FIELDS = ("id", "title", "created_at", "updated_at")
+
+# Maintained by the price history write path, never by plain product writes
+DENORMALIZED_PRICE_FIELDS = ("current_price", "current_price_at")
+
+
+def encode_cursor(sort_by: str, sort_value: Any, product_id: int) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_by, sort_value, product_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(cursor: str, sort_by: str) -> Tuple[Any, int]:
+    try:
+        cursor_sort_by, sort_value, product_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+        if sort_value is not None and sort_by in ("created_at", "updated_at"):
+            sort_value = datetime.fromisoformat(sort_value)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if cursor_sort_by != sort_by or not isinstance(product_id, int):
+        raise ValueError("Cursor does not match the requested sort order")
+    return sort_value, product_id
+
 
 class ProductRepository(ProductRepositoryInterface):
     def __init__(self, db: Session):
@@ -27,7 +64,7 @@ class ProductRepository(ProductRepositoryInterface):
             db_product_data = {
                 key: value
                 for key, value in product.__dict__.items()
-                if key != "current_price"
+                if key not in DENORMALIZED_PRICE_FIELDS
             }
             db_product = ProductModel(**db_product_data)
             self.db.add(db_product)
@@ -38,6 +75,205 @@ class ProductRepository(ProductRepositoryInterface):
             self.db.rollback()
             raise e
 
+    def bulk_upsert(self, products: List[ProductEntity]) -> Dict[str, List[int]]:
+        if not products:
+            return {"created": [], "updated": []}
+
+        # ON CONFLICT cannot touch the same row twice in one statement
+        products_by_url = {product.url: product for product in products}
+        # Prices of rows the upsert may hit, to record their price changes the
+        # same way bulk_update does
+        existing_prices = dict(
+            self.db.query(ProductModel.url, ProductModel.current_price)
+            .filter(ProductModel.url.in_(list(products_by_url)))
+            .all()
+        )
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                **product.model_dump(exclude={"id"}),
+                "current_price_at": now if product.current_price is not None else None,
+                "content_fingerprint": product.compute_content_fingerprint(),
+                "updated_at": now,
+                "last_checked_at": now,
+            }
+            for product in products_by_url.values()
+        ]
+
+        stmt = insert(ProductModel).values(rows)
+        update_columns = {
+            column: stmt.excluded[column]
+            for column in rows[0]
+            if column not in ("url", "created_at", *DENORMALIZED_PRICE_FIELDS)
+        }
+        # The fingerprint covers the price, so the price moves with it; a missing
+        # or equal price keeps the current one and its timestamp
+        price_changed = stmt.excluded.current_price.isnot(None) & (
+            ProductModel.current_price.is_distinct_from(stmt.excluded.current_price)
+        )
+        for column in DENORMALIZED_PRICE_FIELDS:
+            update_columns[column] = case(
+                (price_changed, stmt.excluded[column]),
+                else_=getattr(ProductModel, column),
+            )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductModel.url], set_=update_columns
+        ).returning(
+            ProductModel.id,
+            ProductModel.url,
+            literal_column("(xmax = 0)").label("inserted"),
+        )
+
+        try:
+            result = self.db.execute(stmt).all()
+            created = [row.id for row in result if row.inserted]
+            updated = [row.id for row in result if not row.inserted]
+
+            price_rows = []
+            for row in result:
+                price = products_by_url[row.url].current_price
+                if price is None:
+                    continue
+                if not row.inserted:
+                    old_price = existing_prices.get(row.url)
+                    if not self._price_changed(old_price, price):
+                        continue
+                price_rows.append(
+                    {"product_id": row.id, "price": price, "created_at": now}
+                )
+            if price_rows:
+                self.db.execute(insert(PriceHistoryModel).values(price_rows))
+            self.db.commit()
+            return {"created": created, "updated": updated}
+        except Exception as e:
+            self.db.rollback()
+            raise e
+
+    def bulk_update(
+        self, products: List[ProductEntity], unchanged_ids: Optional[List[int]] = None
+    ) -> Dict[str, List[int]]:
+        """Apply changed products and mark unchanged ones as checked.
+
+        unchanged_ids are products the caller already found unchanged; like
+        products whose fingerprint matches, they only get last_checked_at moved.
+        """
+        if not products and not unchanged_ids:
+            return {
+                "updated": [],
+                "prices_changed": [],
+                "unchanged": [],
+                "not_found": [],
+            }
+
+        products_by_id = {product.id: product for product in products}
+        ids = list(products_by_id)
+
+        # id -> (current_price, content_fingerprint, *UNFINGERPRINTED_FIELDS)
+        existing = (
+            {
+                row[0]: tuple(row[1:])
+                for row in self.db.query(
+                    ProductModel.id,
+                    ProductModel.current_price,
+                    ProductModel.content_fingerprint,
+                    *(getattr(ProductModel, field) for field in UNFINGERPRINTED_FIELDS),
+                )
+                .filter(ProductModel.id.in_(ids))
+                .all()
+            }
+            if ids
+            else {}
+        )
+        existing_prices = {pid: values[0] for pid, values in existing.items()}
+
+        now = datetime.now(timezone.utc)
+        rows = []
+        price_rows = []
+        unchanged = []
+        for product_id, product in products_by_id.items():
+            if product_id not in existing:
+                continue
+            fingerprint = self._payload_fingerprint(product)
+            if (
+                fingerprint is not None
+                and fingerprint == existing[product_id][1]
+                and not self._changes_unfingerprinted_fields(
+                    product, existing[product_id][2:]
+                )
+            ):
+                unchanged.append(product_id)
+                continue
+            row = {
+                **product.model_dump(
+                    exclude=set(DENORMALIZED_PRICE_FIELDS), exclude_unset=True
+                ),
+                "id": product_id,
+                "content_fingerprint": fingerprint,
+                "updated_at": now,
+                "last_checked_at": now,
+            }
+            if product.current_price is not None and self._price_changed(
+                existing_prices[product_id], product.current_price
+            ):
+                row["current_price"] = product.current_price
+                row["current_price_at"] = now
+                price_rows.append(
+                    {
+                        "product_id": product_id,
+                        "price": product.current_price,
+                        "created_at": now,
+                    }
+                )
+            rows.append(row)
+
+        unchanged.extend(pid for pid in unchanged_ids or [] if pid not in existing)
+        try:
+            if rows:
+                self.db.execute(update(ProductModel), rows)
+            if unchanged:
+                # One statement for all of them; updated_at keeps meaning "changed"
+                self.db.execute(
+                    update(ProductModel)
+                    .where(ProductModel.id.in_(unchanged))
+                    .values(last_checked_at=now, updated_at=ProductModel.updated_at)
+                )
+            if price_rows:
+                self.db.execute(insert(PriceHistoryModel).values(price_rows))
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise e
+
+        return {
+            "updated": [row["id"] for row in rows],
+            "prices_changed": [row["product_id"] for row in price_rows],
+            "unchanged": unchanged,
+            "not_found": [pid for pid in ids if pid not in existing],
+        }
+
+    @staticmethod
+    def _payload_fingerprint(product: ProductEntity) -> Optional[str]:
+        # A partial payload says nothing about the fields it leaves out
+        sent = product.model_fields_set | (
+            {"price"} if "current_price" in product.model_fields_set else set()
+        )
+        if not set(FINGERPRINT_FIELDS) <= sent:
+            return None
+        return product.compute_content_fingerprint()
+
+    @staticmethod
+    def _changes_unfingerprinted_fields(product: ProductEntity, current_values) -> bool:
+        return any(
+            field in product.model_fields_set and getattr(product, field) != current
+            for field, current in zip(UNFINGERPRINTED_FIELDS, current_values)
+        )
+
+    @staticmethod
+    def _price_changed(current_price, new_price) -> bool:
+        if current_price is None:
+            return True
+        return round(float(current_price), 2) != round(float(new_price), 2)
+
     def get_all(
         self,
         column_filters: Optional[Dict[str, Any]] = None,
@@ -45,9 +281,24 @@ class ProductRepository(ProductRepositoryInterface):
         offset: int = 0,
         sort_by: Optional[str] = None,
         sort_order: Optional[str] = None,
-    ) -> Tuple[List[ProductEntity], int]:
-        query = self.db.query(ProductModel)
+        include_total: bool = True,
+    ) -> Tuple[List[ProductEntity], Optional[int]]:
+        query = self._apply_column_filters(self.db.query(ProductModel), column_filters)
 
+        if sort_by:
+            sort_column = getattr(ProductModel, sort_by, None)
+            if sort_column:
+                if sort_order == "desc":
+                    query = query.order_by(sort_column.desc())
+                else:
+                    query = query.order_by(sort_column.asc())
+
+        total_count = query.count() if include_total else None
+        db_products = query.limit(limit).offset(offset).all()
+        return [ProductEntity(**p.__dict__) for p in db_products], total_count
+
+    @staticmethod
+    def _apply_column_filters(query, column_filters: Optional[Dict[str, Any]]):
         if column_filters:
             for field, filter_info in column_filters.items():
                 value = filter_info.get("value")
@@ -132,59 +383,88 @@ class ProductRepository(ProductRepositoryInterface):
                         else:
                             query = query.filter(column.endswith(value))
 
-        if sort_by:
-            sort_column = getattr(ProductModel, sort_by, None)
-            if sort_column:
-                if sort_order == "desc":
-                    query = query.order_by(sort_column.desc())
-                else:
-                    query = query.order_by(sort_column.asc())
+        return query
 
-        total_count = query.count()
-        db_products = (
-            query.options(joinedload(ProductModel.price_history))
-            .limit(limit)
-            .offset(offset)
-            .all()
+    def get_all_by_cursor(
+        self,
+        column_filters: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[ProductEntity], Optional[int], Optional[str]]:
+        query = self._apply_column_filters(self.db.query(ProductModel), column_filters)
+        total_count = query.count() if include_total else None
+        db_products, next_cursor = self._paginate_by_cursor(
+            query, limit, cursor, sort_by or "id", sort_order
+        )
+        return (
+            [ProductEntity(**p.__dict__) for p in db_products],
+            total_count,
+            next_cursor,
         )
-        products = []
 
-        for db_product in db_products:
-            product_entity = ProductEntity(**db_product.__dict__)
-            if db_product.price_history:
-                product_entity.current_price = db_product.price_history[-1].price
-            products.append(product_entity)
+    def _paginate_by_cursor(
+        self,
+        query,
+        limit: int,
+        cursor: Optional[str],
+        sort_by: str,
+        sort_order: Optional[str],
+    ) -> Tuple[list, Optional[str]]:
+        if sort_by not in KEYSET_SORT_FIELDS:
+            raise ValueError(f"Cursor pagination does not support sorting by {sort_by}")
+
+        sort_column = getattr(ProductModel, sort_by)
+        descending = sort_order == "desc"
+        key = (
+            ProductModel.id if sort_by == "id" else tuple_(sort_column, ProductModel.id)
+        )
+
+        if cursor:
+            sort_value, last_id = decode_cursor(cursor, sort_by)
+            position = last_id if sort_by == "id" else tuple_(sort_value, last_id)
+            query = query.filter(key < position if descending else key > position)
+
+        if descending:
+            query = query.order_by(sort_column.desc(), ProductModel.id.desc())
+        else:
+            query = query.order_by(sort_column.asc(), ProductModel.id.asc())
 
-        return products, total_count
+        db_products = query.limit(limit + 1).all()
+
+        next_cursor = None
+        if len(db_products) > limit:
+            db_products = db_products[:limit]
+            last = db_products[-1]
+            next_cursor = encode_cursor(sort_by, getattr(last, sort_by), last.id)
+        return db_products, next_cursor
 
     def get_by_id(self, product_id: int) -> Optional[ProductEntity]:
         db_product = (
-            self.db.query(ProductModel)
-            .options(joinedload(ProductModel.price_history))
-            .filter(ProductModel.id == product_id)
-            .first()
+            self.db.query(ProductModel).filter(ProductModel.id == product_id).first()
         )
         if db_product:
-            product_entity = ProductEntity(**db_product.__dict__)
-            if db_product.price_history:
-                product_entity.current_price = db_product.price_history[-1].price
-            return product_entity
+            return ProductEntity(**db_product.__dict__)
         return None
 
     def get_by_url(self, url: str) -> Optional[ProductEntity]:
-        db_product = (
-            self.db.query(ProductModel)
-            .options(joinedload(ProductModel.price_history))
-            .filter(ProductModel.url == url)
-            .first()
-        )
+        db_product = self.db.query(ProductModel).filter(ProductModel.url == url).first()
         if db_product:
-            product_entity = ProductEntity(**db_product.__dict__)
-            if db_product.price_history:
-                product_entity.current_price = db_product.price_history[-1].price
-            return product_entity
+            return ProductEntity(**db_product.__dict__)
         return None
 
+    def get_existing_urls(
+        self, urls: List[str], source_website_id: Optional[int] = None
+    ) -> List[str]:
+        if not urls:
+            return []
+        query = self.db.query(ProductModel.url).filter(ProductModel.url.in_(set(urls)))
+        if source_website_id is not None:
+            query = query.filter(ProductModel.source_website_id == source_website_id)
+        return [url for (url,) in query.all()]
+
     def update(
         self, product_id: int, product: ProductEntity
     ) -> Optional[ProductEntity]:
@@ -196,7 +476,10 @@ class ProductRepository(ProductRepositoryInterface):
             )
             if db_product:
                 for key, value in product.__dict__.items():
-                    if hasattr(db_product, key) and key != "current_price":
+                    if (
+                        hasattr(db_product, key)
+                        and key not in DENORMALIZED_PRICE_FIELDS
+                    ):
                         setattr(db_product, key, value)
                 db_product.updated_at = datetime.now(timezone.utc)
                 self.db.commit()
@@ -216,6 +499,7 @@ class ProductRepository(ProductRepositoryInterface):
             return False
         try:
             self.db.delete(db_product)
+            self._mark_stats_stale()
             self.db.commit()
             return True
         except Exception as e:
@@ -227,7 +511,6 @@ class ProductRepository(ProductRepositoryInterface):
     ) -> List[ProductEntity]:
         db_products = (
             self.db.query(ProductModel)
-            .options(joinedload(ProductModel.price_history))
             .filter(ProductModel.title.ilike(f"%{query}%"))
             .limit(limit)
             .offset(offset)
@@ -238,27 +521,23 @@ class ProductRepository(ProductRepositoryInterface):
     def filter_products(
         self, filter_data: Dict, limit: int, offset: int
     ) -> List[ProductEntity]:
-        query = self.db.query(ProductModel).options(
-            joinedload(ProductModel.price_history)
-        )
+        query = self._apply_filters(self.db.query(ProductModel), filter_data)
+        db_products = query.limit(limit).offset(offset).all()
+        return [ProductEntity(**db_product.__dict__) for db_product in db_products]
 
+    @staticmethod
+    def _apply_filters(query, filter_data: Dict):
         if "url" in filter_data and filter_data["url"]:
             query = query.filter(ProductModel.url.ilike(f"%{filter_data['url']}%"))
 
         if "title" in filter_data and filter_data["title"]:
             query = query.filter(ProductModel.title.ilike(f"%{filter_data['title']}%"))
 
-            if (
-                "min_current_price" in filter_data
-                and filter_data["min_current_price"] is not None
-            ):
-                pass
+        if "min_price" in filter_data and filter_data["min_price"] is not None:
+            query = query.filter(ProductModel.current_price >= filter_data["min_price"])
 
-            if (
-                "max_current_price" in filter_data
-                and filter_data["max_current_price"] is not None
-            ):
-                pass
+        if "max_price" in filter_data and filter_data["max_price"] is not None:
+            query = query.filter(ProductModel.current_price <= filter_data["max_price"])
 
         if "created_after" in filter_data and filter_data["created_after"]:
             query = query.filter(
@@ -280,83 +559,124 @@ class ProductRepository(ProductRepositoryInterface):
                 ProductModel.updated_at <= filter_data["updated_before"]
             )
 
-        db_products = query.limit(limit).offset(offset).all()
-        products = []
-
-        for db_product in db_products:
-            product_entity = ProductEntity(**db_product.__dict__)
-            if db_product.price_history:
-                product_entity.current_price = db_product.price_history[-1].price
-            products.append(product_entity)
-        return products
-        # return [ProductEntity(**db_product.__dict__) for db_product in db_products]
-
-    def get_product_stats(self) -> dict:
-        subquery = (
-            self.db.query(
-                PriceHistoryModel.product_id,
-                func.max(PriceHistoryModel.created_at).label("latest_created_at"),
+        if filter_data.get("checked_before"):
+            query = query.filter(
+                func.coalesce(ProductModel.last_checked_at, ProductModel.updated_at)
+                <= filter_data["checked_before"]
             )
-            .group_by(PriceHistoryModel.product_id)
-            .subquery()
-        )
 
-        latest_prices_subquery = (
-            self.db.query(PriceHistoryModel.price)
-            .join(
-                subquery,
-                (PriceHistoryModel.product_id == subquery.c.product_id)
-                & (PriceHistoryModel.created_at == subquery.c.latest_created_at),
+        if filter_data.get("source_website_id") is not None:
+            query = query.filter(
+                ProductModel.source_website_id == filter_data["source_website_id"]
             )
-            .subquery()
-        )
 
-        total_products = self.db.query(func.count(ProductModel.id)).scalar()
+        return query
 
-        average_price = (
-            self.db.query(func.avg(latest_prices_subquery.c.price)).scalar()
-            if total_products > 0
-            else 0.0
+    def filter_products_by_cursor(
+        self, filter_data: Dict, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[ProductEntity], Optional[str]]:
+        query = self._apply_filters(self.db.query(ProductModel), filter_data)
+        db_products, next_cursor = self._paginate_by_cursor(
+            query, limit, cursor, "id", "asc"
         )
-        min_price = (
-            self.db.query(func.min(latest_prices_subquery.c.price)).scalar()
-            if total_products > 0
-            else 0.0
+        return [ProductEntity(**p.__dict__) for p in db_products], next_cursor
+
+    def get_product_stats(self) -> dict:
+        return self._stats_to_dict(*self._aggregate_product_stats())
+
+    def get_product_stats_snapshot(self) -> Optional[dict]:
+        snapshot = (
+            self.db.query(ProductStatsSnapshotModel)
+            .filter(ProductStatsSnapshotModel.id == PRODUCT_STATS_SNAPSHOT_ID)
+            .first()
         )
-        max_price = (
-            self.db.query(func.max(latest_prices_subquery.c.price)).scalar()
-            if total_products > 0
-            else 0.0
+        if not snapshot:
+            return None
+        return {
+            **self._stats_to_dict(
+                snapshot.total_products,
+                snapshot.priced_products,
+                snapshot.price_sum,
+                snapshot.min_price,
+                snapshot.max_price,
+            ),
+            "is_stale": snapshot.is_stale,
+            "refreshed_at": snapshot.refreshed_at,
+        }
+
+    def refresh_product_stats_snapshot(self) -> dict:
+        total, priced, price_sum, min_price, max_price = self._aggregate_product_stats()
+        values = {
+            "total_products": total,
+            "priced_products": priced,
+            "price_sum": price_sum,
+            "min_price": min_price,
+            "max_price": max_price,
+            "is_stale": False,
+            "refreshed_at": datetime.now(timezone.utc),
+        }
+        stmt = (
+            insert(ProductStatsSnapshotModel)
+            .values(id=PRODUCT_STATS_SNAPSHOT_ID, **values)
+            .on_conflict_do_update(
+                index_elements=[ProductStatsSnapshotModel.id], set_=values
+            )
         )
+        try:
+            self.db.execute(stmt)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise e
+        return {
+            **self._stats_to_dict(total, priced, price_sum, min_price, max_price),
+            "is_stale": False,
+            "refreshed_at": values["refreshed_at"],
+        }
 
+    def _aggregate_product_stats(self) -> tuple:
+        return self.db.query(
+            func.count(ProductModel.id),
+            func.count(ProductModel.current_price),
+            func.coalesce(func.sum(ProductModel.current_price), 0),
+            func.min(ProductModel.current_price),
+            func.max(ProductModel.current_price),
+        ).one()
+
+    @staticmethod
+    def _stats_to_dict(total, priced, price_sum, min_price, max_price) -> dict:
         return {
-            "total_products": total_products if total_products is not None else 0,
-            "average_price": float(average_price) if average_price is not None else 0.0,
+            "total_products": total or 0,
+            "average_price": float(price_sum) / priced if priced else 0.0,
             "min_price": float(min_price) if min_price is not None else 0.0,
             "max_price": float(max_price) if max_price is not None else 0.0,
         }
 
+    def _mark_stats_stale(self) -> None:
+        self.db.query(ProductStatsSnapshotModel).filter(
+            ProductStatsSnapshotModel.id == PRODUCT_STATS_SNAPSHOT_ID
+        ).update({ProductStatsSnapshotModel.is_stale: True}, synchronize_session=False)
+
     def get_minimal_products(self, limit: int, offset: int) -> List[dict]:
         db_products = (
-            self.db.query(ProductModel)
-            .options(joinedload(ProductModel.price_history))
+            self.db.query(
+                ProductModel.id,
+                ProductModel.title,
+                ProductModel.url,
+                ProductModel.current_price,
+            )
             .limit(limit)
             .offset(offset)
             .all()
         )
-        minimal_products_list = []
-        for db_product in db_products:
-            current_price = None
-            if db_product.price_history:
-                current_price = db_product.price_history[-1].price
-            minimal_products_list.append(
-                {
-                    "id": db_product.id,
-                    "title": db_product.title,
-                    "url": db_product.url,
-                    "current_price": float(current_price)
-                    if current_price is not None
-                    else None,
-                }
-            )
-        return minimal_products_list
+        return [
+            {
+                "id": db_product.id,
+                "title": db_product.title,
+                "url": db_product.url,
+                "current_price": float(db_product.current_price)
+                if db_product.current_price is not None
+                else None,
+            }
+            for db_product in db_products
+        ]
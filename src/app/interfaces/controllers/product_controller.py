@@ -2,24 +2,31 @@ from datetime import datetime
 from typing import List
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from starlette.requests import Request
 
 from src.app.infrastructure.database_config import get_db
+from src.config import settings
 from src.app.infrastructure.repositories.product_repository import ProductRepository
 from src.app.infrastructure.repositories.price_history_repository import (
     PriceHistoryRepository,
 )
 from src.app.use_cases.product_use_cases import (
     CreateProductUseCase,
+    BulkUpsertProductsUseCase,
     GetProductByIdUseCase,
     GetProductByUrlUseCase,
+    GetExistingProductUrlsUseCase,
     ListProductsUseCase,
+    ListProductsByCursorUseCase,
     UpdateProductUseCase,
+    BulkUpdateProductsUseCase,
     DeleteProductUseCase,
     SearchProductsUseCase,
     FilterProductsUseCase,
+    FilterProductsByCursorUseCase,
     GetProductStatsUseCase,
     GetMinimalProductsUseCase,
 )
@@ -27,9 +34,13 @@ from src.app.interfaces.schemas.product_schema import (
     ProductCreate,
     ProductRead,
     ProductUpdate,
+    ProductBulkUpdate,
     ProductMinimal,
     PaginatedProductResponse,
     ProductsBulkDeleteRequest,
+    ProductsBulkUpsertRequest,
+    ProductsBulkUpdateRequest,
+    ProductUrlsExistingRequest,
 )
 from src.app.entities.product import Product as ProductEntity
 from src.app.entities.user import User as UserEntity
@@ -93,6 +104,16 @@ def read_product_by_url(
     return product
 
 
+@router.post("/urls/existing", response_model=List[str])
+def read_existing_product_urls(
+    data: ProductUrlsExistingRequest,
+    product_repo: ProductRepository = Depends(get_product_repository),
+    current_user: UserEntity = Depends(get_current_active_user),
+):
+    use_case = GetExistingProductUrlsUseCase(product_repo)
+    return use_case.execute(data.urls, data.source_website_id)
+
+
 @router.get("/", response_model=PaginatedProductResponse)
 def read_products(
     request: Request,
@@ -100,6 +121,12 @@ def read_products(
     offset: int = Query(0, ge=0, description="Offset to start fetching items"),
     sort_by: Optional[str] = Query(None, description="Field to sort by"),
     sort_order: Optional[str] = Query(None, description="Sort order (asc or desc)"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from a previous next_cursor; send it empty to start "
+        "cursor pagination (offset is then ignored)",
+    ),
+    include_total: bool = Query(True, description="Count all matching products"),
     product_repo: ProductRepository = Depends(get_product_repository),
     current_user: UserEntity = Depends(get_current_active_user),
 ):
@@ -118,6 +145,28 @@ def read_products(
             column_filters[field] = {"value": param_value, "operator": operator}
 
     filter_data = {"column_filters": column_filters}
+
+    if cursor is not None:
+        use_case = ListProductsByCursorUseCase(product_repo)
+        try:
+            items, total_count, next_cursor = use_case.execute(
+                filter_data=filter_data,
+                limit=limit,
+                cursor=cursor,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                include_total=include_total,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {
+            "items": items,
+            "total_count": total_count,
+            "limit": limit,
+            "offset": 0,
+            "next_cursor": next_cursor,
+        }
+
     use_case = ListProductsUseCase(product_repo)
 
     items, total_count = use_case.execute(
@@ -126,6 +175,7 @@ def read_products(
         offset=offset,
         sort_by=sort_by,
         sort_order=sort_order,
+        include_total=include_total,
     )
     return {
         "items": items,
@@ -135,6 +185,44 @@ def read_products(
     }
 
 
+@router.put("/bulk", response_model=dict)
+def bulk_update_products(
+    data: ProductsBulkUpdateRequest,
+    product_repo: ProductRepository = Depends(get_product_repository),
+    current_user: UserEntity = Depends(get_current_active_user),
+):
+    products = []
+    rejected = []
+    for item in data.products:
+        try:
+            product_in = ProductBulkUpdate.model_validate(item)
+        except ValidationError as e:
+            rejected.append(
+                {
+                    "id": item.get("id"),
+                    "errors": e.errors(include_url=False, include_context=False),
+                }
+            )
+            continue
+        products.append(
+            ProductEntity(
+                **product_in.model_dump(exclude={"price"}, exclude_unset=True),
+                current_price=product_in.price,
+            )
+        )
+
+    use_case = BulkUpdateProductsUseCase(product_repo)
+    result = use_case.execute(products, data.unchanged_ids)
+    return {
+        **result,
+        "rejected": rejected,
+        "message": f"{len(result['updated'])} products updated, "
+        f"{len(result['prices_changed'])} price changes, "
+        f"{len(result['unchanged'])} unchanged, "
+        f"{len(result['not_found'])} not found, {len(rejected)} rejected.",
+    }
+
+
 @router.put("/{product_id}", response_model=ProductRead)
 def update_product(
     product_id: int,
@@ -184,6 +272,43 @@ def bulk_delete_products(
     }
 
 
+@router.post("/bulk/upsert", response_model=dict)
+def bulk_upsert_products(
+    data: ProductsBulkUpsertRequest,
+    product_repo: ProductRepository = Depends(get_product_repository),
+    current_user: UserEntity = Depends(get_current_active_user),
+):
+    products = []
+    rejected = []
+    for item in data.products:
+        try:
+            product_in = ProductCreate.model_validate(item)
+        except ValidationError as e:
+            rejected.append(
+                {
+                    "url": item.get("url"),
+                    "errors": e.errors(include_url=False, include_context=False),
+                }
+            )
+            continue
+        products.append(
+            ProductEntity(
+                **product_in.model_dump(exclude={"price"}),
+                current_price=product_in.price,
+            )
+        )
+
+    use_case = BulkUpsertProductsUseCase(product_repo)
+    result = use_case.execute(products)
+    return {
+        "created": result["created"],
+        "updated": result["updated"],
+        "rejected": rejected,
+        "message": f"{len(result['created'])} products created, "
+        f"{len(result['updated'])} updated, {len(rejected)} rejected.",
+    }
+
+
 @router.get("/search/{query}", response_model=List[ProductRead])
 def search_products(
     query: str,
@@ -199,6 +324,7 @@ def search_products(
 
 @router.get("/filter/", response_model=List[ProductRead])
 def filter_products(
+    response: Response,
     url: Optional[str] = Query(None),
     title: Optional[str] = Query(None),
     min_price: Optional[float] = Query(None, ge=0),
@@ -207,9 +333,18 @@ def filter_products(
     created_before: Optional[datetime] = Query(None),
     updated_after: Optional[datetime] = Query(None),
     updated_before: Optional[datetime] = Query(None),
+    checked_before: Optional[datetime] = Query(
+        None, description="Last scraped before this time (updated_at if never)"
+    ),
+    source_website_id: Optional[int] = Query(None),
     product_repo: ProductRepository = Depends(get_product_repository),
     limit: int = Query(default=10, ge=1, description="Number of items per page"),
     offset: int = Query(default=0, ge=0, description="Offset to start fetching items"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from a previous X-Next-Cursor header; send it empty to "
+        "start cursor pagination (offset is then ignored)",
+    ),
     current_user: UserEntity = Depends(get_current_active_user),
 ):
     filter_params = {
@@ -221,7 +356,22 @@ def filter_products(
         "created_before": created_before,
         "updated_after": updated_after,
         "updated_before": updated_before,
+        "checked_before": checked_before,
+        "source_website_id": source_website_id,
     }
+
+    if cursor is not None:
+        use_case = FilterProductsByCursorUseCase(product_repo)
+        try:
+            results, next_cursor = use_case.execute(
+                filter_data=filter_params, limit=limit, cursor=cursor
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return results
+
     use_case = FilterProductsUseCase(product_repo)
     results = use_case.execute(filter_data=filter_params, limit=limit, offset=offset)
     return results
@@ -230,10 +380,15 @@ def filter_products(
 @router.get("/stats/", response_model=dict)
 def get_product_stats(
     product_repo: ProductRepository = Depends(get_product_repository),
+    max_age: int = Query(
+        default=settings.PRODUCT_STATS_SNAPSHOT_MAX_AGE_SECONDS,
+        ge=0,
+        description="Maximum snapshot age in seconds before it is recomputed, 0 forces a refresh",
+    ),
     current_user: UserEntity = Depends(get_current_active_user),
 ):
     use_case = GetProductStatsUseCase(product_repo)
-    return use_case.execute()
+    return use_case.execute(max_age_seconds=max_age)
 
 
 @router.get("/minimal/", response_model=List[ProductMinimal])
@@ -9,6 +9,16 @@ class ProductRepositoryInterface(ABC):
     def create(self, product: Product) -> Product:
         raise NotImplementedError
 
+    @abstractmethod
+    def bulk_upsert(self, products: List[Product]) -> Dict[str, List[int]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def bulk_update(
+        self, products: List[Product], unchanged_ids: Optional[List[int]] = None
+    ) -> Dict[str, List[int]]:
+        raise NotImplementedError
+
     @abstractmethod
     def get_by_id(self, product_id: int) -> Optional[Product]:
         raise NotImplementedError
@@ -17,6 +27,12 @@ class ProductRepositoryInterface(ABC):
     def get_by_url(self, url: str) -> Optional[Product]:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_existing_urls(
+        self, urls: List[str], source_website_id: Optional[int] = None
+    ) -> List[str]:
+        raise NotImplementedError
+
     @abstractmethod
     def get_all(
         self,
@@ -25,7 +41,20 @@ class ProductRepositoryInterface(ABC):
         offset: int = 0,
         sort_by: Optional[str] = None,
         sort_order: Optional[str] = None,
-    ) -> Tuple[List[Product], int]:
+        include_total: bool = True,
+    ) -> Tuple[List[Product], Optional[int]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_all_by_cursor(
+        self,
+        column_filters: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[Product], Optional[int], Optional[str]]:
         raise NotImplementedError
 
     @abstractmethod
@@ -46,10 +75,24 @@ class ProductRepositoryInterface(ABC):
     ) -> List[Product]:
         raise NotImplementedError
 
+    @abstractmethod
+    def filter_products_by_cursor(
+        self, filter_data: dict, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Product], Optional[str]]:
+        raise NotImplementedError
+
     @abstractmethod
     def get_product_stats(self) -> dict:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_product_stats_snapshot(self) -> Optional[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def refresh_product_stats_snapshot(self) -> dict:
+        raise NotImplementedError
+
     @abstractmethod
     def get_minimal_products(self, limit: int, offset: int) -> List[dict]:
         raise NotImplementedError
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 
 from pydantic import BaseModel, Field
 
@@ -37,12 +37,25 @@ class ProductRead(ProductBase):
     created_at: datetime
     updated_at: datetime
     current_price: Optional[float] = Field(None, description="Current product price")
+    current_price_at: Optional[datetime] = Field(
+        None, description="When the current price was recorded"
+    )
+    content_fingerprint: Optional[str] = Field(
+        None, description="Hash of the normalized product content"
+    )
+    last_checked_at: Optional[datetime] = Field(
+        None, description="When the product was last scraped"
+    )
 
 
 class ProductUpdate(ProductBase):
     price: Optional[float] = Field(None, description="New product price (for update)")
 
 
+class ProductBulkUpdate(ProductUpdate):
+    id: int = Field(..., description="ID of the product to update")
+
+
 class ProductMinimal(BaseModel):
     id: int
     title: str
@@ -54,8 +67,34 @@ class ProductsBulkDeleteRequest(BaseModel):
     ids: List[int] = Field(..., description="List of IDs to delete")
 
 
+class ProductsBulkUpsertRequest(BaseModel):
+    products: List[Dict[str, Any]] = Field(
+        ..., description="List of products to create or update, keyed by URL"
+    )
+
+
+class ProductsBulkUpdateRequest(BaseModel):
+    products: List[Dict[str, Any]] = Field(
+        ..., description="List of products to update, keyed by ID"
+    )
+    unchanged_ids: List[int] = Field(
+        default_factory=list,
+        description="IDs of products scraped again without changes, only marked checked",
+    )
+
+
+class ProductUrlsExistingRequest(BaseModel):
+    urls: List[str] = Field(..., description="Candidate product URLs")
+    source_website_id: Optional[int] = Field(
+        None, description="Restrict the lookup to this source website"
+    )
+
+
 class PaginatedProductResponse(BaseModel):
     items: list[ProductRead]
-    total_count: int
+    total_count: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page (cursor pagination only)"
+    )
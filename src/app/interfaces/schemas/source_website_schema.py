@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 
 
 class SourceWebsiteBase(BaseModel):
@@ -9,6 +9,14 @@ class SourceWebsiteBase(BaseModel):
         True,
         description="Indicates if we are currently collecting data from this site.",
     )
+    rate_limit_per_second: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Requests per second allowed across all workers, empty for no limit",
+    )
+    rate_limit_burst: Optional[int] = Field(
+        None, ge=1, description="Requests allowed in a burst above the steady rate"
+    )
 
 
 class SourceWebsiteCreate(SourceWebsiteBase):
@@ -5,6 +5,7 @@ from jose import jwt, JWTError
 from src.config import settings
 from src.app.infrastructure.repositories.user_repository import UserRepository
 from src.app.infrastructure.database_config import get_db
+from src.app.security.user_cache import user_cache
 from sqlalchemy.orm import Session
 
 reusable_oauth2 = HTTPBearer()
@@ -27,10 +28,14 @@ async def get_current_user(
             )
     except JWTError:
         raise HTTPException(status_code=401, detail="Could not validate credentials")
+    user = user_cache.get(username)
+    if user is not None:
+        return user
     user_repo = UserRepository(db)
     user = user_repo.get_by_username(username=username)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
+    user_cache.set(username, user)
     return user
 
 
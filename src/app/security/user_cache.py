@@ -0,0 +1,88 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from src.app.entities.user import User as UserEntity
+from src.config import settings
+
+
+class UserCache:
+    """TTL + LRU cache of authenticated users keyed by username.
+
+    The cache is per process, so the TTL bounds how long another worker can keep
+    serving a user that was changed elsewhere.
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, ttl_seconds: float = 60, log_every: int = 0
+    ):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.log_every = log_every
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username: str) -> Optional[UserEntity]:
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[username]
+                self.misses += 1
+                user = None
+            else:
+                self._entries.move_to_end(username)
+                self.hits += 1
+                user = entry[1].model_copy()
+            hits, misses = self.hits, self.misses
+        if self.log_every and (hits + misses) % self.log_every == 0:
+            logging.info(f"User cache: {hits} hits, {misses} misses")
+        return user
+
+    def set(self, username: str, user: UserEntity) -> None:
+        if self.maxsize <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[username] = (
+                time.monotonic() + self.ttl_seconds,
+                user.model_copy(),
+            )
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: str = None, user_id: int = None) -> None:
+        with self._lock:
+            if username is not None:
+                self._entries.pop(username, None)
+            if user_id is not None:
+                for key, (_, user) in list(self._entries.items()):
+                    if user.id == user_id:
+                        del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    log_every=settings.USER_CACHE_LOG_EVERY,
+)
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 
 from src.app.entities.price_history import PriceHistory as PriceHistoryEntity
@@ -8,7 +9,7 @@ from src.app.interfaces.repositories.price_history_repository import (
     PriceHistoryRepositoryInterface,
 )
 from src.app.interfaces.schemas.product_schema import ProductUpdate
-from src.app.entities.product import Product as ProductEntity
+from src.app.entities.product import UNFINGERPRINTED_FIELDS, Product as ProductEntity
 from src.app.infrastructure.database.models.product_model import Product
 
 
@@ -22,6 +23,7 @@ class CreateProductUseCase:
         self.price_history_repository = price_history_repository
 
     def execute(self, product: ProductEntity, initial_price: float):
+        product.content_fingerprint = product.compute_content_fingerprint(initial_price)
         created_product = self.product_repository.create(product)
 
         if created_product is not None and initial_price is not None:
@@ -35,6 +37,14 @@ class CreateProductUseCase:
         return created_product
 
 
+class BulkUpsertProductsUseCase:
+    def __init__(self, product_repository: ProductRepositoryInterface):
+        self.product_repository = product_repository
+
+    def execute(self, products: List[ProductEntity]) -> Dict[str, List[int]]:
+        return self.product_repository.bulk_upsert(products)
+
+
 class GetProductByIdUseCase:
     def __init__(self, product_repository: ProductRepositoryInterface):
         self.product_repository = product_repository
@@ -51,6 +61,16 @@ class GetProductByUrlUseCase:
         return self.product_repository.get_by_url(url)
 
 
+class GetExistingProductUrlsUseCase:
+    def __init__(self, product_repository: ProductRepositoryInterface):
+        self.product_repository = product_repository
+
+    def execute(
+        self, urls: List[str], source_website_id: Optional[int] = None
+    ) -> List[str]:
+        return self.product_repository.get_existing_urls(urls, source_website_id)
+
+
 class ListProductsUseCase:
     def __init__(self, product_repository: ProductRepositoryInterface):
         self.product_repository = product_repository
@@ -62,7 +82,8 @@ class ListProductsUseCase:
         offset: int,
         sort_by: Optional[str] = None,
         sort_order: Optional[str] = None,
-    ) -> tuple[List[Product], int]:
+        include_total: bool = True,
+    ) -> tuple[List[Product], Optional[int]]:
         column_filters = filter_data.get("column_filters", {})
 
         return self.product_repository.get_all(
@@ -71,6 +92,32 @@ class ListProductsUseCase:
             offset=offset,
             sort_by=sort_by,
             sort_order=sort_order,
+            include_total=include_total,
+        )
+
+
+class ListProductsByCursorUseCase:
+    def __init__(self, product_repository: ProductRepositoryInterface):
+        self.product_repository = product_repository
+
+    def execute(
+        self,
+        filter_data: Dict[str, Any],
+        limit: int,
+        cursor: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[List[ProductEntity], Optional[int], Optional[str]]:
+        column_filters = filter_data.get("column_filters", {})
+
+        return self.product_repository.get_all_by_cursor(
+            column_filters=column_filters,
+            limit=limit,
+            cursor=cursor,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            include_total=include_total,
         )
 
 
@@ -94,14 +141,33 @@ class UpdateProductUseCase:
         if not existing_product:
             return None
 
+        previous_fingerprint = existing_product.content_fingerprint
+        previous_values = {
+            field: getattr(existing_product, field) for field in UNFINGERPRINTED_FIELDS
+        }
+        price_changed = new_price is not None and (
+            existing_product.current_price is None
+            or round(float(existing_product.current_price), 2) != round(new_price, 2)
+        )
+
         for key, value in product_update.model_dump(
             exclude={"price"}, exclude_unset=True
         ).items():
             setattr(existing_product, key, value)
 
+        existing_product.content_fingerprint = (
+            existing_product.compute_content_fingerprint(new_price)
+        )
+        if existing_product.content_fingerprint == previous_fingerprint and all(
+            getattr(existing_product, field) == value
+            for field, value in previous_values.items()
+        ):
+            # Nothing to write, neither the product nor its price history
+            return existing_product
+
         updated_product = self.product_repository.update(product_id, existing_product)
 
-        if updated_product is not None and new_price is not None:
+        if updated_product is not None and price_changed:
             price_history_entry = PriceHistoryEntity(
                 product_id=updated_product.id, price=new_price
             )
@@ -112,6 +178,16 @@ class UpdateProductUseCase:
         return updated_product
 
 
+class BulkUpdateProductsUseCase:
+    def __init__(self, product_repository: ProductRepositoryInterface):
+        self.product_repository = product_repository
+
+    def execute(
+        self, products: List[ProductEntity], unchanged_ids: Optional[List[int]] = None
+    ) -> Dict[str, List[int]]:
+        return self.product_repository.bulk_update(products, unchanged_ids)
+
+
 class DeleteProductUseCase:
     def __init__(self, product_repository: ProductRepositoryInterface):
         self.product_repository = product_repository
@@ -142,12 +218,47 @@ class FilterProductsUseCase:
         )
 
 
+class FilterProductsByCursorUseCase:
+    def __init__(self, product_repository: ProductRepositoryInterface):
+        self.product_repository = product_repository
+
+    def execute(
+        self, filter_data: Dict, limit: int, cursor: Optional[str] = None
+    ) -> tuple[List[ProductEntity], Optional[str]]:
+        return self.product_repository.filter_products_by_cursor(
+            filter_data=filter_data, limit=limit, cursor=cursor
+        )
+
+
 class GetProductStatsUseCase:
     def __init__(self, product_repository: ProductRepositoryInterface):
         self.product_repository = product_repository
 
-    def execute(self) -> dict:
-        return self.product_repository.get_product_stats()
+    def execute(self, max_age_seconds: Optional[int] = None) -> dict:
+        if max_age_seconds is None:
+            return self.product_repository.get_product_stats()
+
+        snapshot = self.product_repository.get_product_stats_snapshot()
+        if (
+            snapshot is None
+            or snapshot["is_stale"]
+            or self._age_seconds(snapshot["refreshed_at"]) >= max_age_seconds
+        ):
+            snapshot = self.product_repository.refresh_product_stats_snapshot()
+
+        stats = {k: v for k, v in snapshot.items() if k != "is_stale"}
+        stats["snapshot_age_seconds"] = round(
+            self._age_seconds(snapshot["refreshed_at"]), 3
+        )
+        return stats
+
+    @staticmethod
+    def _age_seconds(refreshed_at: Optional[datetime]) -> float:
+        if refreshed_at is None:
+            return float("inf")
+        if refreshed_at.tzinfo is None:
+            refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+        return (datetime.now(timezone.utc) - refreshed_at).total_seconds()
 
 
 class GetMinimalProductsUseCase:
@@ -3,6 +3,7 @@ from passlib.context import CryptContext
 from src.app.entities import user as UserEntity
 from src.app.interfaces.repositories.user_repository import UserRepositoryInterface
 from src.app.interfaces.schemas.user_schema import UserCreate, UserUpdate
+from src.app.security.user_cache import UserCache, user_cache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -63,8 +64,11 @@ class GetAllUsersUseCase:
 
 
 class UpdateUserUseCase:
-    def __init__(self, user_repo: UserRepositoryInterface):
+    def __init__(
+        self, user_repo: UserRepositoryInterface, cache: UserCache = user_cache
+    ):
         self.user_repo = user_repo
+        self.cache = cache
 
     def execute(self, user_id: int, user_in: UserUpdate) -> Optional[UserEntity.User]:
         existing_user = self.user_repo.get_by_id(user_id)
@@ -97,15 +101,23 @@ class UpdateUserUseCase:
             if self.user_repo.get_by_email(update_data["email"]):
                 raise ValueError("New email already registered by another user")
 
+        previous_username = existing_user.username
         for key, value in update_data.items():
             setattr(existing_user, key, value)
 
-        return self.user_repo.update(user_id, existing_user)
+        updated_user = self.user_repo.update(user_id, existing_user)
+        self.cache.invalidate(username=previous_username, user_id=user_id)
+        return updated_user
 
 
 class DeleteUserUseCase:
-    def __init__(self, user_repo: UserRepositoryInterface):
+    def __init__(
+        self, user_repo: UserRepositoryInterface, cache: UserCache = user_cache
+    ):
         self.user_repo = user_repo
+        self.cache = cache
 
     def execute(self, user_id: int) -> bool:
-        return self.user_repo.delete(user_id)
+        deleted = self.user_repo.delete(user_id)
+        self.cache.invalidate(user_id=user_id)
+        return deleted
@@ -6,3 +6,12 @@ SECRET_KEY = os.environ.get(
 )
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+
+USER_CACHE_MAX_SIZE = int(os.environ.get("USER_CACHE_MAX_SIZE", 1024))
+USER_CACHE_TTL_SECONDS = int(os.environ.get("USER_CACHE_TTL_SECONDS", 60))
+# Log the user cache hit/miss counts every this many lookups, 0 disables it
+USER_CACHE_LOG_EVERY = int(os.environ.get("USER_CACHE_LOG_EVERY", 10000))
+
+PRODUCT_STATS_SNAPSHOT_MAX_AGE_SECONDS = int(
+    os.environ.get("PRODUCT_STATS_SNAPSHOT_MAX_AGE_SECONDS", 300)
+)
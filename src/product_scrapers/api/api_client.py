@@ -1,17 +1,88 @@
 import os
-from typing import List, Dict, Any
+import threading
+from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.product_scrapers.api.token_cache import TokenCache
+
+API_POOL_CONNECTIONS = int(os.getenv("API_POOL_CONNECTIONS", 4))
+API_POOL_MAXSIZE = int(os.getenv("API_POOL_MAXSIZE", 10))
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", 3))
+API_RETRY_BACKOFF = float(os.getenv("API_RETRY_BACKOFF", 0.5))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def build_session(
+    pool_connections: int = API_POOL_CONNECTIONS,
+    pool_maxsize: int = API_POOL_MAXSIZE,
+    max_retries: int = API_MAX_RETRIES,
+    backoff_factor: float = API_RETRY_BACKOFF,
+) -> requests.Session:
+    """Session with keep-alive pooling and retries on transient gateway errors.
+
+    pool_connections is the number of hosts kept in the pool and pool_maxsize the
+    connections kept open per host.
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def _reset_session():
+    # Sockets must not be shared between a forked Celery worker and its parent
+    global _session
+    _session = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_session)
 
 
 class ApiClient:
-    def __init__(self, access_token=None):
+    def __init__(
+        self,
+        access_token=None,
+        session: requests.Session = None,
+        token_cache: Optional[TokenCache] = None,
+    ):
         self.base_url = os.getenv("API_URL", "web:8000")
-        self.access_token = access_token
+        self.session = session or get_session()
+        self.token_cache = token_cache
         self.headers = {}
+        if access_token is None and token_cache is not None:
+            access_token = token_cache.get_token()
+        self._set_access_token(access_token)
 
+    def _set_access_token(self, access_token: Optional[str]) -> None:
+        self.access_token = access_token
         if self.access_token:
             self.headers["Authorization"] = f"Bearer {self.access_token}"
+        else:
+            self.headers.pop("Authorization", None)
 
     def _make_request(
         self, method: str, endpoint: str, data: dict = None, params: dict = None
@@ -19,9 +90,23 @@ class ApiClient:
         url = f"{self.base_url}{endpoint}"
         print("data: ", data)
         try:
-            response = requests.request(
+            response = self.session.request(
                 method, url, headers=self.headers, json=data, params=params, timeout=10
             )
+            if response.status_code == 401 and self.token_cache is not None:
+                # The cached token was rejected (rotated key, deactivated user):
+                # drop it so no worker keeps using it, then retry once
+                print("🔑 Access token rejected, logging in again")
+                self.token_cache.invalidate(self.access_token)
+                self._set_access_token(self.token_cache.get_token())
+                response = self.session.request(
+                    method,
+                    url,
+                    headers=self.headers,
+                    json=data,
+                    params=params,
+                    timeout=10,
+                )
             response.raise_for_status()
             return response
         except Exception as e:  # Alterado para capturar qualquer exceção
@@ -62,11 +147,23 @@ class ApiClient:
             response.json() if response.status_code == 200 and response.json() else {}
         )
 
-    def get_existing_product_urls(self, scraper_name):
-        print("🔎 Checking existing products")
-        response = self._make_request("GET", "/products/")
-        existing_products = response.json() if response.status_code == 200 else []
-        return {p["url"] for p in existing_products if scraper_name in ["url"]}
+    def get_existing_product_urls(
+        self, urls: list[str], source_website_id: int = None, chunk_size: int = 1000
+    ) -> set[str]:
+        print(f"🔎 Checking which of {len(urls)} URLs already exist")
+        existing_urls = set()
+        for start in range(0, len(urls), chunk_size):
+            response = self._make_request(
+                "POST",
+                "/products/urls/existing",
+                data={
+                    "urls": urls[start : start + chunk_size],
+                    "source_website_id": source_website_id,
+                },
+            )
+            if response.status_code == 200 and response.json():
+                existing_urls.update(response.json())
+        return existing_urls
 
     def create_product(self, product):
         print(f"💾 Creating product: {product['url']}")
@@ -92,6 +189,22 @@ class ApiClient:
         print(f"✅ {created} new products created")
         return created
 
+    def upsert_products(self, products: list[dict]) -> Optional[int]:
+        """Number of products created, or None when the API did not confirm the write."""
+        print(f"💾 Upserting {len(products)} products")
+        response = self._make_request(
+            "POST", "/products/bulk/upsert", data={"products": products}
+        )
+        if response.status_code != 200 or not response.json():
+            print("🔴 Bulk upsert failed")
+            return None
+        result = response.json()
+        for rejected in result.get("rejected", []):
+            print(f"🔴 Product rejected: {rejected.get('url')}")
+        created = len(result.get("created", []))
+        print(f"✅ {created} new products created")
+        return created
+
     def get_products(self, params=None):
         print("🔄 Updating products by URLs")
         response = self._make_request("GET", "/products/filter/", params=params)
@@ -99,6 +212,65 @@ class ApiClient:
             response.json() if response.status_code == 200 and response.json() else []
         )
 
+    def get_products_page(
+        self, params: dict = None, cursor: str = "", limit: int = 500
+    ) -> Optional[tuple[list[dict], Optional[str]]]:
+        """One cursor page from /products/filter/; the cursor is None on the last page.
+
+        An empty cursor starts from the beginning. Returns None when the page could
+        not be fetched, so callers can tell a failure from the end of the data.
+        """
+        response = self._make_request(
+            "GET",
+            "/products/filter/",
+            params={**(params or {}), "cursor": cursor, "limit": limit},
+        )
+        if response.status_code != 200:
+            print("🔴 Failed to fetch products page")
+            return None
+        return response.json() or [], response.headers.get("X-Next-Cursor")
+
+    def bulk_update_products(
+        self,
+        products: list[dict],
+        unchanged_ids: list[int] = None,
+        chunk_size: int = 500,
+    ) -> Optional[int]:
+        """Number of products updated, or None when any chunk was not confirmed.
+
+        unchanged_ids are products scraped again without changes, which the API
+        only marks as checked. The remaining chunks are still sent after a
+        failure; resending the whole batch is safe as already applied updates
+        then match their fingerprint.
+        """
+        unchanged_ids = unchanged_ids or []
+        print(
+            f"💾 Bulk updating {len(products)} products, "
+            f"{len(unchanged_ids)} unchanged"
+        )
+        updated = 0
+        failed = False
+        for start in range(0, max(len(products), len(unchanged_ids)), chunk_size):
+            chunk = products[start : start + chunk_size]
+            response = self._make_request(
+                "PUT",
+                "/products/bulk",
+                data={
+                    "products": chunk,
+                    "unchanged_ids": unchanged_ids[start : start + chunk_size],
+                },
+            )
+            if response.status_code != 200 or not response.json():
+                print(f"🔴 Bulk update failed for {len(chunk)} products")
+                failed = True
+                continue
+            result = response.json()
+            for rejected in result.get("rejected", []):
+                print(f"🔴 Product rejected: {rejected.get('id')}")
+            updated += len(result.get("updated", []))
+        print(f"✅ {updated} products updated")
+        return None if failed else updated
+
     def update_product_list(self, products):
         print(f"💾 Updating {len(products)} products")
         updated = 0
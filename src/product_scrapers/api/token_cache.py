@@ -0,0 +1,114 @@
+import threading
+import time
+from typing import Callable, Optional
+
+import redis
+from jose import jwt, JWTError
+
+
+class TokenCache:
+    """Process-wide cache for the worker access token.
+
+    The token is reused until `refresh_margin` seconds before its `exp` claim.
+    When a Redis URL is given the token is also shared between worker processes,
+    so a fleet logs in roughly once per token lifetime instead of once per task.
+    """
+
+    def __init__(
+        self,
+        login: Callable[[], Optional[str]],
+        refresh_margin: int = 60,
+        redis_url: Optional[str] = None,
+        redis_key: str = "celery_worker_token",
+    ):
+        self.login = login
+        self.refresh_margin = refresh_margin
+        self.redis_key = redis_key
+        self._redis_url = redis_url
+        self._redis = None
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_token(self) -> Optional[str]:
+        if self._is_fresh(self._expires_at):
+            return self._token
+
+        with self._lock:
+            if self._is_fresh(self._expires_at):
+                return self._token
+
+            token = self._get_shared_token()
+            if token is None:
+                token = self.login()
+                if token is None:
+                    return None
+                self._set_shared_token(token)
+
+            self._token = token
+            self._expires_at = self._get_expiration(token)
+            return token
+
+    def invalidate(self, token: Optional[str] = None) -> None:
+        """Drop the cached token, e.g. after the API rejected it.
+
+        When `token` is given only that token is dropped, so a token another
+        thread or worker already refreshed is kept.
+        """
+        with self._lock:
+            if token is None or self._token == token:
+                self._token = None
+                self._expires_at = 0.0
+            client = self._get_redis()
+            if client is None:
+                return
+            try:
+                shared = client.get(self.redis_key)
+                if isinstance(shared, bytes):
+                    shared = shared.decode()
+                if token is None or shared == token:
+                    client.delete(self.redis_key)
+            except Exception as e:
+                print(f"🔴 Error when clearing shared worker token: {e}")
+
+    def _is_fresh(self, expires_at: float) -> bool:
+        return expires_at - self.refresh_margin > time.time()
+
+    @staticmethod
+    def _get_expiration(token: str) -> float:
+        try:
+            exp = jwt.get_unverified_claims(token).get("exp")
+        except JWTError:
+            return 0.0
+        return float(exp) if exp else 0.0
+
+    def _get_redis(self):
+        if self._redis is None and self._redis_url:
+            self._redis = redis.Redis.from_url(self._redis_url)
+        return self._redis
+
+    def _get_shared_token(self) -> Optional[str]:
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            token = client.get(self.redis_key)
+        except Exception as e:
+            print(f"🔴 Error when reading shared worker token: {e}")
+            return None
+        if token is None:
+            return None
+        token = token.decode() if isinstance(token, bytes) else token
+        return token if self._is_fresh(self._get_expiration(token)) else None
+
+    def _set_shared_token(self, token: str) -> None:
+        client = self._get_redis()
+        if client is None:
+            return
+        ttl = int(self._get_expiration(token) - self.refresh_margin - time.time())
+        if ttl <= 0:
+            return
+        try:
+            client.set(self.redis_key, token, ex=ttl)
+        except Exception as e:
+            print(f"🔴 Error when sharing worker token: {e}")
@@ -0,0 +1,207 @@
+"""Parse-throughput benchmark over recorded scraper pages.
+
+Pages live in corpus/<site>/<search|product>/ and are replayed offline through the
+same parsing code the workers run. Drop newly recorded pages next to the existing
+ones to widen the corpus.
+
+    python -m src.product_scrapers.benchmarks.parse_benchmark
+    python -m src.product_scrapers.benchmarks.parse_benchmark --update-baseline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+
+from src.product_scrapers.scrapers.base.parsers import parse_html
+from src.product_scrapers.scrapers.factory.scraper_factory import ScraperFactory
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCHMARKS_DIR, "corpus")
+BASELINE_PATH = os.path.join(BENCHMARKS_DIR, "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+
+class RecordedResponse:
+    """Stands in for requests/httpx responses when replaying a corpus page."""
+
+    def __init__(self, url: str, content: bytes):
+        self.url = url
+        self.content = content
+        self.status_code = 200
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self) -> Any:
+        return orjson.loads(self.content)
+
+
+def _parse_search(site: str) -> Callable:
+    def parse(scraper, page: RecordedResponse):
+        match site:
+            case "olx":
+                return scraper._extract_links(page.content)
+            case "mercado_livre":
+                soup = parse_html(page.text)
+                links = scraper._extract_links(soup)
+                scraper._extract_total_results(soup)
+                return links
+            case "estante_virtual":
+                return scraper._get_products_list(page.json())
+            case "enjoei":
+                return scraper._extract_links(page.json())[0]
+
+    return parse
+
+
+def _parse_product(scraper, page: RecordedResponse):
+    return scraper.parse_product(page.url, page)
+
+
+PARSERS = {"search": _parse_search, "product": lambda site: _parse_product}
+
+
+def load_corpus(sites: Optional[List[str]] = None) -> Dict[str, Dict[str, List]]:
+    corpus = {}
+    for site in sorted(os.listdir(CORPUS_DIR)):
+        if sites and site not in sites:
+            continue
+        for kind in PARSERS:
+            kind_dir = os.path.join(CORPUS_DIR, site, kind)
+            if not os.path.isdir(kind_dir):
+                continue
+            pages = []
+            for name in sorted(os.listdir(kind_dir)):
+                with open(os.path.join(kind_dir, name), "rb") as f:
+                    pages.append(RecordedResponse(f"https://{site}/{name}", f.read()))
+            if pages:
+                corpus.setdefault(site, {})[kind] = pages
+    return corpus
+
+
+def _percentile(samples: List[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def benchmark_pages(parse: Callable, scraper, pages: List, iterations: int) -> dict:
+    for page in pages:
+        parse(scraper, page)  # warm up imports and caches
+
+    samples = []
+    for _ in range(iterations):
+        for page in pages:
+            start = time.perf_counter()
+            parse(scraper, page)
+            samples.append(time.perf_counter() - start)
+
+    # Separate pass, tracemalloc slows parsing down too much to time it
+    tracemalloc.start()
+    for page in pages:
+        parse(scraper, page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "pages": len(samples),
+        "pages_per_sec": round(len(samples) / sum(samples), 1),
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p99_ms": round(_percentile(samples, 99) * 1000, 3),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def run_benchmark(iterations: int = 20, sites: Optional[List[str]] = None) -> dict:
+    results = {}
+    for site, kinds in load_corpus(sites).items():
+        scraper = ScraperFactory.create_scraper(site)
+        for kind, pages in kinds.items():
+            parse = PARSERS[kind](site)
+            results[f"{site}.{kind}"] = benchmark_pages(
+                parse, scraper, pages, iterations
+            )
+    return results
+
+
+def find_regressions(
+    results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE
+) -> List[str]:
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        floor = expected["pages_per_sec"] * (1 - tolerance)
+        if result["pages_per_sec"] < floor:
+            regressions.append(
+                f"{name}: {result['pages_per_sec']} pages/s, "
+                f"baseline {expected['pages_per_sec']} pages/s"
+            )
+        ceiling = expected["peak_memory_kb"] * (1 + tolerance)
+        if result["peak_memory_kb"] > ceiling:
+            regressions.append(
+                f"{name}: {result['peak_memory_kb']} KB peak, "
+                f"baseline {expected['peak_memory_kb']} KB"
+            )
+    return regressions
+
+
+def load_baseline(path: str = BASELINE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(results: dict, path: str = BASELINE_PATH) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def print_results(results: dict) -> None:
+    print(f"{'scenario':<28}{'pages/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak KB':>10}")
+    for name, r in results.items():
+        print(
+            f"{name:<28}{r['pages_per_sec']:>10}{r['p50_ms']:>10}"
+            f"{r['p99_ms']:>10}{r['peak_memory_kb']:>10}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scraper parse benchmark")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--sites", nargs="*", help="Only benchmark these sites")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the results as the new baseline instead of comparing",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(iterations=args.iterations, sites=args.sites)
+    print_results(results)
+
+    if args.update_baseline:
+        save_baseline({**load_baseline(), **results})
+        print(f"✅ Baseline saved to {BASELINE_PATH}")
+        return 0
+
+    regressions = find_regressions(results, load_baseline(), args.tolerance)
+    for regression in regressions:
+        print(f"🔴 Regression {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,65 +1,138 @@
+import os
 import time
+from datetime import timedelta
 
 from celery.schedules import crontab
+from sqlalchemy import func
 from src.app.infrastructure.database.models.search_config_model import SearchConfig
 from celery.beat import Scheduler, ScheduleEntry
 
+SEARCH_SCHEDULE_SYNC_SECONDS = float(os.getenv("SEARCH_SCHEDULE_SYNC_SECONDS", 10))
+
+
+def search_entry_name(search_config_id: int) -> str:
+    return f"run_search_{search_config_id}"
+
+
+def search_schedule(search) -> dict:
+    return {
+        "task": "src.product_scrapers.celery.tasks.run_scraper_search",
+        "schedule": crontab(
+            hour=search.preferred_time.hour,
+            minute=search.preferred_time.minute,
+            day_of_month=f"*/{search.frequency_days}",
+        ),
+        "args": (search.id,),
+    }
+
 
 def get_dynamic_schedule():
     from src.app.infrastructure.database_config import SessionLocal
 
     db = SessionLocal()
     try:
-        schedules = {}
         searches = db.query(SearchConfig).filter(SearchConfig.is_active).all()
-
-        for idx, search in enumerate(searches):
-            schedules[f"run_search_{search.id}"] = {
-                "task": "src.product_scrapers.celery.tasks.run_scraper_search",
-                "schedule": crontab(
-                    hour=search.preferred_time.hour,
-                    minute=search.preferred_time.minute,
-                    day_of_month=f"*/{search.frequency_days}",
-                ),
-                "args": (search.id,),
-            }
-        return schedules
+        return {
+            search_entry_name(search.id): search_schedule(search) for search in searches
+        }
     finally:
         db.close()
 
 
 class DynamicDBScheduler(Scheduler):
-    # last_sync = 0
-    # sync_interval = 10
+    """Beat scheduler driven by the active SearchConfig rows.
+
+    Each sync only reads the rows whose updated_at moved past the last seen
+    watermark, so unchanged entries keep their last run state. Deleted rows
+    leave no updated_at behind; they are found when the active row count no
+    longer matches the entries held here.
+    """
+
+    sync_interval = SEARCH_SCHEDULE_SYNC_SECONDS
 
     def setup_schedule(self):
-        while True:
-            time.sleep(10)
-            self.tick()
+        self.install_default_entries(self.schedule)
+        self._search_ids = set()
+        self._watermark = None
+        self._last_db_sync = 0.0
+        self.sync_from_db()
+
+    def tick(self, *args, **kwargs):
+        if time.monotonic() - self._last_db_sync >= self.sync_interval:
             self.sync_from_db()
+        return min(super().tick(*args, **kwargs), self.sync_interval)
 
     def sync_from_db(self):
-        print("DynamicDBScheduler is running...")
-
-        self.schedule.clear()
-
-        for name, entry in get_dynamic_schedule().items():
-            self.schedule[name] = ScheduleEntry(
-                name=name,
-                task=entry["task"],
-                schedule=entry["schedule"],
-                args=entry.get("args", ()),
-                kwargs=entry.get("kwargs", {}),
-                options=entry.get("options", {}),
-                app=self.app,
+        from src.app.infrastructure.database_config import SessionLocal
+
+        self._last_db_sync = time.monotonic()
+        db = SessionLocal()
+        try:
+            changed = [self.apply_search(search) for search in self._changed(db)]
+            removed = self.remove_deleted(db)
+        except Exception as e:
+            # Keep the current schedule and retry on the next sync
+            print(f"🔴 Failed to sync search schedules: {e}")
+            return
+        finally:
+            db.close()
+
+        if any(changed) or removed:
+            self._heap = None
+            print(f"🗓️ Search schedules synced, {len(self._search_ids)} active")
+
+    def _changed(self, db):
+        query = db.query(SearchConfig)
+        if self._watermark is None:
+            query = query.filter(SearchConfig.is_active)
+        else:
+            # Overlap one interval so rows committed late with an older
+            # updated_at are not missed; applying a row twice is a no-op
+            query = query.filter(
+                SearchConfig.updated_at
+                >= self._watermark - timedelta(seconds=self.sync_interval)
             )
+        searches = query.all()
+        stamps = [s.updated_at for s in searches if s.updated_at is not None]
+        if self._watermark is not None:
+            stamps.append(self._watermark)
+        if stamps:
+            self._watermark = max(stamps)
+        return searches
+
+    def apply_search(self, search) -> bool:
+        """Add, update or drop the search's entry; returns True when it changed."""
+        name = search_entry_name(search.id)
+        if not search.is_active:
+            self._search_ids.discard(search.id)
+            return self.schedule.pop(name, None) is not None
+
+        self._search_ids.add(search.id)
+        entry = ScheduleEntry(name=name, app=self.app, **search_schedule(search))
+        current = self.schedule.get(name)
+        if current is None:
+            self.schedule[name] = entry
+            return True
+        if current.schedule == entry.schedule and current.args == entry.args:
+            return False
+        # Keeps last_run_at and total_run_count
+        current.update(entry)
+        return True
+
+    def remove_deleted(self, db) -> bool:
+        active = db.query(func.count(SearchConfig.id)).filter(SearchConfig.is_active)
+        if active.scalar() == len(self._search_ids):
+            return False
 
-    # def tick(self):
-    #     now = time.time()
-    #     if now - self.last_sync > self.sync_interval:
-    #         self.sync_from_db()
-    #         self.last_sync = now
-    #     return super().tick()
+        active_ids = {
+            search_id
+            for (search_id,) in db.query(SearchConfig.id).filter(SearchConfig.is_active)
+        }
+        deleted = self._search_ids - active_ids
+        for search_id in deleted:
+            self.schedule.pop(search_entry_name(search_id), None)
+        self._search_ids -= deleted
+        return bool(deleted)
 
 
 # Celery beat static scheduling example:
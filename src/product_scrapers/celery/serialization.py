@@ -0,0 +1,92 @@
+import os
+import threading
+import zlib
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict
+
+import orjson
+from kombu.serialization import register
+
+COMPACT_SERIALIZER = "compact"
+COMPACT_CONTENT_TYPE = "application/x-compact-json"
+COMPRESSION_THRESHOLD = int(os.getenv("CELERY_COMPRESSION_THRESHOLD", 1024))
+COMPRESSION_LEVEL = int(os.getenv("CELERY_COMPRESSION_LEVEL", 6))
+
+# First byte of every payload says whether the orjson body is zlib-compressed
+_RAW = b"j"
+_ZLIB = b"z"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not serializable: {type(value).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    body = orjson.dumps(obj, default=_default)
+    if len(body) >= COMPRESSION_THRESHOLD:
+        payload = _ZLIB + zlib.compress(body, COMPRESSION_LEVEL)
+    else:
+        payload = _RAW + body
+    return payload
+
+
+def loads(payload) -> Any:
+    if isinstance(payload, str):
+        payload = payload.encode("latin-1")
+    payload = bytes(payload)
+    if payload[:1] == _ZLIB:
+        return orjson.loads(zlib.decompress(payload[1:]))
+    return orjson.loads(payload[1:])
+
+
+def encoded_size(obj: Any) -> int:
+    """Bytes obj takes on the wire with the compact serializer."""
+    return len(dumps(obj))
+
+
+class PayloadStats:
+    """Per-task result sizes for this worker process."""
+
+    def __init__(self, log_every: int = 500):
+        self.log_every = log_every
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._bytes: Dict[str, int] = defaultdict(int)
+
+    def record(self, task_name: str, size: int) -> None:
+        with self._lock:
+            self._counts[task_name] += 1
+            self._bytes[task_name] += size
+            count = self._counts[task_name]
+            total = self._bytes[task_name]
+        if self.log_every and count % self.log_every == 0:
+            print(
+                f"📦 {task_name}: {count} results, "
+                f"{total / count:.0f} bytes per result"
+            )
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    "results": count,
+                    "bytes": self._bytes[name],
+                    "bytes_per_result": round(self._bytes[name] / count, 1),
+                }
+                for name, count in self._counts.items()
+            }
+
+
+def register_compact_serializer() -> None:
+    register(
+        COMPACT_SERIALIZER,
+        dumps,
+        loads,
+        content_type=COMPACT_CONTENT_TYPE,
+        content_encoding="binary",
+    )
@@ -1,18 +1,74 @@
+import math
 import os
+import redis
 import requests
 
 from datetime import datetime, timedelta
-from celery import Celery, group, chord
+from celery import Celery, group, chord, signals
 
+from src.app.entities.product import compute_content_fingerprint
 from src.product_scrapers.api.api_client import ApiClient
-from src.product_scrapers.scrapers.factory.scraper_factory import ScraperFactory
+from src.product_scrapers.api.token_cache import TokenCache
+from src.product_scrapers.celery.claim_check import (
+    build_claim_check_store,
+    check_in,
+    iter_results,
+    release,
+)
+from src.product_scrapers.celery.serialization import (
+    COMPACT_SERIALIZER,
+    PayloadStats,
+    encoded_size,
+    register_compact_serializer,
+)
+from src.product_scrapers.scrapers.base.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    set_circuit_breaker,
+)
+from src.product_scrapers.scrapers.base.http_cache import (
+    PageNotModified,
+    build_http_cache,
+    set_http_cache,
+)
+from src.product_scrapers.scrapers.base.rate_limiter import (
+    RateLimiter,
+    set_rate_limiter,
+)
+from src.product_scrapers.scrapers.factory.scraper_pool import scraper_pool
 from src.product_scrapers.scrapers.manager.scraper_manager import ScraperManager
 
 broker_url = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
 app = Celery(main="product_scrapers", broker=broker_url, backend="redis://redis:6379/0")
 
-
-def get_celery_worker_token():
+SEARCH_DISPATCH_CHUNK_SIZE = int(os.getenv("SEARCH_DISPATCH_CHUNK_SIZE", 100))
+# Build products from search results on sites that support it (see ScraperInterface).
+# Opt-in: harvested records lack the description and seller until the update sweep
+SEARCH_HARVEST_MODE = os.getenv("SEARCH_HARVEST_MODE", "false").lower() == "true"
+SCRAPE_CHUNK_SIZE = int(os.getenv("SCRAPE_CHUNK_SIZE", 100))
+# Scraped batches are stored here and only their keys travel through Celery
+claim_check_store = build_claim_check_store(os.getenv("CLAIM_CHECK_URL"))
+UPDATE_STALE_AFTER_DAYS = int(os.getenv("UPDATE_STALE_AFTER_DAYS", 30))
+# Products refreshed per chord by run_scraper_update
+UPDATE_PAGE_SIZE = int(os.getenv("UPDATE_PAGE_SIZE", 500))
+# Retries of run_scraper_update when the API fails to list a page of products
+UPDATE_PAGE_MAX_RETRIES = int(os.getenv("UPDATE_PAGE_MAX_RETRIES", 5))
+UPDATE_PAGE_RETRY_DELAY_SECONDS = int(os.getenv("UPDATE_PAGE_RETRY_DELAY_SECONDS", 60))
+# How many times a task waits for a site's open circuit before giving up
+CIRCUIT_OPEN_MAX_RETRIES = int(os.getenv("CIRCUIT_OPEN_MAX_RETRIES", 5))
+# How long run_search remembers what it dispatched, for retries after an open circuit
+SEARCH_DISPATCHED_TTL_SECONDS = int(os.getenv("SEARCH_DISPATCHED_TTL_SECONDS", 86400))
+# Retries of save_products/update_products when the API does not confirm a write
+SAVE_MAX_RETRIES = int(os.getenv("SAVE_MAX_RETRIES", 5))
+SAVE_RETRY_DELAY_SECONDS = int(os.getenv("SAVE_RETRY_DELAY_SECONDS", 60))
+# Page bodies are only reused when a new-URL scrape revalidates a cached page; the
+# update sweep needs just the validators
+HTTP_CACHE_STORE_BODIES = (
+    os.getenv("SCRAPER_HTTP_CACHE_STORE_BODIES", "false").lower() == "true"
+)
+
+
+def login_celery_worker():
     api_base_url = os.getenv("API_URL", "web:8000")
     auth_url = f"{api_base_url}/auth/login"
     payload = {
@@ -33,9 +89,80 @@ def get_celery_worker_token():
         return None
 
 
-@app.task(name="src.product_scrapers.celery.tasks.run_scraper_search")
+worker_token_cache = TokenCache(
+    login=login_celery_worker,
+    refresh_margin=int(os.getenv("CELERY_WORKER_TOKEN_REFRESH_MARGIN", 60)),
+    redis_url=os.getenv("CELERY_WORKER_TOKEN_REDIS_URL"),
+)
+
+
+def get_celery_worker_token():
+    return worker_token_cache.get_token()
+
+
+def get_source_website_rate_limit(source_website_name: str):
+    source_website = ApiClient(
+        token_cache=worker_token_cache
+    ).get_source_website_by_name(source_website_name)
+    rate = source_website.get("rate_limit_per_second")
+    if not rate:
+        return None
+    return rate, source_website.get("rate_limit_burst") or max(1, math.ceil(rate))
+
+
+scraper_redis = redis.Redis.from_url(
+    os.getenv("SCRAPER_RATE_LIMIT_REDIS_URL", broker_url)
+)
+set_rate_limiter(
+    RateLimiter(scraper_redis, rate_provider=get_source_website_rate_limit)
+)
+set_circuit_breaker(
+    CircuitBreaker(
+        scraper_redis,
+        failure_threshold=int(os.getenv("SCRAPER_CIRCUIT_FAILURE_THRESHOLD", 5)),
+        window_seconds=int(os.getenv("SCRAPER_CIRCUIT_WINDOW_SECONDS", 60)),
+        open_seconds=int(os.getenv("SCRAPER_CIRCUIT_OPEN_SECONDS", 300)),
+    )
+)
+
+
+set_http_cache(
+    build_http_cache(
+        os.getenv("SCRAPER_HTTP_CACHE_URL"),
+        ttl_seconds=int(os.getenv("SCRAPER_HTTP_CACHE_TTL_SECONDS", 60 * 60 * 24 * 45)),
+        store_bodies=HTTP_CACHE_STORE_BODIES,
+    )
+)
+
+
+payload_stats = PayloadStats(log_every=int(os.getenv("PAYLOAD_STATS_LOG_EVERY", 500)))
+
+
+@signals.task_success.connect
+def record_result_size(sender=None, result=None, **kwargs):
+    # Encode the return value itself: the backend also encodes chord state on this
+    # thread, and ignored results (e.g. chunks) still travel down their chain
+    if sender is not None and result is not None:
+        payload_stats.record(sender.name, encoded_size(result))
+
+
+@signals.worker_process_init.connect
+def reset_scraper_pool(**kwargs):
+    # Instances created before the fork would share sockets with the parent
+    scraper_pool.clear()
+
+
+@signals.worker_process_shutdown.connect
+@signals.worker_shutdown.connect
+def close_scraper_pool(**kwargs):
+    scraper_pool.close_all()
+
+
+@app.task(
+    name="src.product_scrapers.celery.tasks.run_scraper_search", ignore_result=True
+)
 def run_scraper_search(search_config_id: int):
-    search_config = ApiClient(get_celery_worker_token()).get_search_configs_by_id(
+    search_config = ApiClient(token_cache=worker_token_cache).get_search_configs_by_id(
         search_config_id
     )
 
@@ -55,118 +182,345 @@ def run_scraper_search(search_config_id: int):
     )()
 
 
-@app.task(name="src.product_scrapers.celery.tasks.run_search")
-def run_search(search: str, scraper_name: str):
-    scraper = ScraperManager(ScraperFactory().create_scraper(scraper_name))
-    existing_urls = ApiClient(get_celery_worker_token()).get_existing_product_urls(
-        scraper_name
-    )
-    urls = list(scraper.get_products_urls(search))
-    new_urls = scraper.get_urls_to_update(existing_urls, urls)
-
-    process_urls_list.apply_async(
-        args=[
-            {"status": "success", "search": search, "urls": new_urls},
-            scraper_name,
-        ],
-        countdown=10,
-    )
-    return {"status": "success", "search": search, "urls": new_urls}
+@app.task(
+    bind=True,
+    name="src.product_scrapers.celery.tasks.run_search",
+    ignore_result=True,
+    max_retries=CIRCUIT_OPEN_MAX_RETRIES,
+)
+def run_search(self, search: str, scraper_name: str):
+    api_client = ApiClient(token_cache=worker_token_cache)
+    source_website = api_client.get_source_website_by_name(scraper_name.lower())
+    new_urls = 0
+    harvested = 0
+    # A retry walks the result pages again; URLs an earlier attempt already
+    # dispatched may not be saved yet, so they are skipped here as well
+    dispatched_key = f"run_search:dispatched:{self.request.id}"
+    dispatched = _get_dispatched_urls(dispatched_key) if self.request.retries else set()
+
+    def is_known(page_urls):
+        known = api_client.get_existing_product_urls(
+            page_urls, source_website.get("id")
+        )
+        return known | (set(page_urls) & dispatched)
+
+    try:
+        with scraper_pool.lease(scraper_name) as scraper:
+            manager = ScraperManager(scraper)
+            if SEARCH_HARVEST_MODE and scraper.supports_harvest:
+                chunks = manager.harvest_new_products_by_chunk(
+                    search, is_known, SEARCH_DISPATCH_CHUNK_SIZE
+                )
+            else:
+                chunks = (
+                    [{"url": url} for url in urls]
+                    for urls in manager.get_new_urls_by_chunk(
+                        search, is_known, SEARCH_DISPATCH_CHUNK_SIZE
+                    )
+                )
+
+            # Each chunk is dispatched as soon as enough new URLs are found, so
+            # scraping starts while later result pages are still being crawled
+            for records in chunks:
+                complete = [r for r in records if manager.is_complete_record(r)]
+                if complete:
+                    # Harvested straight from the results pages, no page fetch
+                    save_products.delay(
+                        check_in(
+                            claim_check_store,
+                            [{"status": "success", "data": r} for r in complete],
+                        ),
+                        scraper_name,
+                    )
+                urls = [r["url"] for r in records if not manager.is_complete_record(r)]
+                if urls:
+                    process_urls_list.apply_async(
+                        args=[
+                            {"status": "success", "search": search, "urls": urls},
+                            scraper_name,
+                        ],
+                    )
+                new_urls += len(records)
+                harvested += len(complete)
+                _add_dispatched_urls(dispatched_key, [r["url"] for r in records])
+    except CircuitOpenError as e:
+        # The site is blocking us, come back once the circuit closes instead of
+        # holding the worker
+        raise self.retry(exc=e, countdown=e.retry_in)
+
+    _forget_dispatched_urls(dispatched_key)
+    return {
+        "status": "success",
+        "search": search,
+        "new_urls": new_urls,
+        "harvested": harvested,
+    }
+
+
+def _get_dispatched_urls(key: str) -> set:
+    try:
+        return {url.decode() for url in scraper_redis.smembers(key)}
+    except Exception as e:
+        # Worst case the retry dispatches some URLs twice
+        print(f"🔴 Could not read dispatched URLs: {e}")
+        return set()
 
 
-@app.task(name="src.product_scrapers.celery.tasks.process_urls_list")
+def _add_dispatched_urls(key: str, urls: list) -> None:
+    if not urls:
+        return
+    try:
+        pipe = scraper_redis.pipeline()
+        pipe.sadd(key, *urls)
+        pipe.expire(key, SEARCH_DISPATCHED_TTL_SECONDS)
+        pipe.execute()
+    except Exception as e:
+        print(f"🔴 Could not record dispatched URLs: {e}")
+
+
+def _forget_dispatched_urls(key: str) -> None:
+    try:
+        scraper_redis.delete(key)
+    except Exception as e:
+        print(f"🔴 Could not clear dispatched URLs: {e}")
+
+
+@app.task(
+    name="src.product_scrapers.celery.tasks.process_urls_list", ignore_result=True
+)
 def process_urls_list(search_results: dict, scraper_name: str):
-    scraper = ScraperManager(ScraperFactory().create_scraper(scraper_name))
-    chunks = scraper.split_search_urls(search_results, 100)
+    with scraper_pool.lease(scraper_name) as scraper:
+        chunks = ScraperManager(scraper).split_search_urls(
+            search_results, SCRAPE_CHUNK_SIZE
+        )
 
     task_group = group(
-        chord(
-            scrape_product_page.s(url, scraper_name).set(countdown=5) for url in chunk
-        )(save_products.s(scraper_name))
+        scrape_products_chunk.s(chunk, scraper_name) | save_products.s(scraper_name)
         for chunk in chunks
     )
 
     return task_group.apply_async()
 
 
-@app.task(name="src.product_scrapers.celery.tasks.scrape_product_page")
-def scrape_product_page(url: str, scraper_name: str):
-    scraper = ScraperManager(ScraperFactory().create_scraper(scraper_name))
+@app.task(
+    name="src.product_scrapers.celery.tasks.scrape_products_chunk", ignore_result=True
+)
+def scrape_products_chunk(urls: list, scraper_name: str, attempt: int = 0):
+    with scraper_pool.lease(scraper_name) as scraper:
+        results = ScraperManager(scraper).scrape_products(urls)
+
+    deferred = [r for r in results if r["status"] == "deferred"]
+    if deferred and attempt < CIRCUIT_OPEN_MAX_RETRIES:
+        # Scrape what the open circuit blocked once it closes, the rest is saved now
+        (
+            scrape_products_chunk.s(
+                [r["url"] for r in deferred], scraper_name, attempt + 1
+            )
+            | save_products.s(scraper_name)
+        ).apply_async(countdown=max(r["retry_in"] for r in deferred))
+        results = [r for r in results if r["status"] != "deferred"]
+
+    return check_in(claim_check_store, results)
+
 
+@app.task(
+    bind=True,
+    name="src.product_scrapers.celery.tasks.scrape_product_page",
+    max_retries=CIRCUIT_OPEN_MAX_RETRIES,
+)
+def scrape_product_page(self, url: str, scraper_name: str):
     try:
-        product_data = scraper.scrape_product(url)
+        with scraper_pool.lease(scraper_name) as scraper:
+            product_data = ScraperManager(scraper).scrape_product(url)
         return {"status": "success", "data": product_data}
+    except CircuitOpenError as e:
+        return _retry_when_circuit_closes(self, e, url)
     except Exception as e:
         return {"status": "error", "url": url, "message": str(e)}
 
 
-@app.task(name="src.product_scrapers.celery.tasks.save_products")
-def save_products(results, scraper_name: str):
-    if results:
-        source_website = ApiClient(
-            get_celery_worker_token()
-        ).get_source_website_by_name(scraper_name.lower())
+def _retry_when_circuit_closes(task, error: CircuitOpenError, url: str):
+    # Chord members must always return a result, so give up quietly once retries
+    # are exhausted instead of failing the whole chord
+    if task.request.retries >= task.max_retries:
+        return {"status": "error", "url": url, "message": str(error)}
+    raise task.retry(exc=error, countdown=error.retry_in)
+
+
+class BatchSaveError(Exception):
+    """The API did not confirm a batch write."""
+
+
+def _retry_unsaved_batch(task, what: str):
+    # The batch is not released, so the retry reads it again from the claim-check
+    # store; once retries are exhausted the task fails and the batch stays there
+    raise task.retry(
+        exc=BatchSaveError(f"{what} not confirmed by the API"),
+        countdown=SAVE_RETRY_DELAY_SECONDS,
+    )
+
+
+@app.task(
+    bind=True,
+    name="src.product_scrapers.celery.tasks.save_products",
+    ignore_result=True,
+    max_retries=SAVE_MAX_RETRIES,
+)
+def save_products(self, payloads, scraper_name: str):
+    if payloads:
+        api_client = ApiClient(token_cache=worker_token_cache)
+        source_website = api_client.get_source_website_by_name(scraper_name.lower())
         website_id = source_website.get("id")
         successful = [
             {**r["data"], **{"source_website_id": website_id}}
-            for r in results
+            for r in iter_results(claim_check_store, payloads)
             if r["status"] == "success"
         ]
 
         if successful:
-            created = ApiClient(get_celery_worker_token()).create_new_products(
-                successful
-            )
+            created = api_client.upsert_products(successful)
+            if created is None:
+                _retry_unsaved_batch(self, f"Upsert of {len(successful)} products")
+        release(claim_check_store, payloads)
+        if successful:
             return {"status": "success", "created": created}
 
     return {"status": "error", "message": "No products to save"}
 
 
-@app.task(name="src.product_scrapers.celery.tasks.run_scraper_update")
-def run_scraper_update(scraper_name: str):
-    cutoff_date = (datetime.today() - timedelta(days=30)).date()
-    products = ApiClient(get_celery_worker_token()).get_products(
-        {"updated_before": cutoff_date}
+class ProductsPageError(Exception):
+    """The API failed to return a page of products to update."""
+
+
+@app.task(
+    bind=True,
+    name="src.product_scrapers.celery.tasks.run_scraper_update",
+    ignore_result=True,
+    max_retries=UPDATE_PAGE_MAX_RETRIES,
+)
+def run_scraper_update(
+    self,
+    scraper_name: str,
+    cursor: str = "",
+    checked_before: str = None,
+    source_website_id: int = None,
+):
+    """Refresh the site's products not checked lately, one cursor page at a time.
+
+    Each page becomes one bounded chord and the next page is only fetched once
+    that chord's callback has run, so a sweep keeps a single page in flight.
+    """
+    api_client = ApiClient(token_cache=worker_token_cache)
+    if source_website_id is None:
+        source_website = api_client.get_source_website_by_name(scraper_name.lower())
+        source_website_id = source_website.get("id")
+        if not source_website_id:
+            print(f"🔴 Source website '{scraper_name}' not found")
+            return
+    if checked_before is None:
+        # Fixed for the whole sweep, checked products then drop out of it
+        checked_before = (
+            (datetime.today() - timedelta(days=UPDATE_STALE_AFTER_DAYS))
+            .date()
+            .isoformat()
+        )
+
+    page = api_client.get_products_page(
+        {"checked_before": checked_before, "source_website_id": source_website_id},
+        cursor=cursor,
+        limit=UPDATE_PAGE_SIZE,
     )
-
-    return chord(
-        update_product.s(product, scraper_name).set(countdown=10)
-        for product in products
-    )(update_products.s(scraper_name))
-
-
-@app.task(name="src.product_scrapers.celery.tasks.update_product")
-def update_product(product: dict, scraper_name: str):
-    scraper = ScraperManager(ScraperFactory().create_scraper(scraper_name))
-
+    if page is None:
+        # Resume from the same cursor instead of ending the sweep
+        raise self.retry(
+            args=(scraper_name, cursor, checked_before, source_website_id),
+            exc=ProductsPageError(f"Products page {cursor!r} not fetched"),
+            countdown=UPDATE_PAGE_RETRY_DELAY_SECONDS,
+        )
+    products, next_cursor = page
+    if not products:
+        print(f"✅ Update sweep finished for {scraper_name}")
+        return
+
+    callback = update_products.s(scraper_name)
+    if next_cursor:
+        callback |= run_scraper_update.si(
+            scraper_name, next_cursor, checked_before, source_website_id
+        )
+    chord(update_product.s(product, scraper_name) for product in products)(callback)
+
+
+@app.task(
+    bind=True,
+    name="src.product_scrapers.celery.tasks.update_product",
+    max_retries=CIRCUIT_OPEN_MAX_RETRIES,
+)
+def update_product(self, product: dict, scraper_name: str):
     try:
-        product_data = scraper.update_product(product)
-        return {"status": "success", "data": product_data}
+        with scraper_pool.lease(scraper_name) as scraper:
+            product_data = ScraperManager(scraper).update_product(product)
+    except PageNotModified:
+        return {"status": "unchanged", "id": product["id"], "url": product["url"]}
+    except CircuitOpenError as e:
+        return _retry_when_circuit_closes(self, e, product["url"])
     except Exception as e:
         return {"status": "error", "url": product["url"], "message": str(e)}
 
-
-@app.task(name="src.product_scrapers.celery.tasks.update_products")
-def update_products(results, scraper_name: str):
-    if results:
-        source_website = ApiClient(
-            get_celery_worker_token()
-        ).get_source_website_by_name(scraper_name.lower())
+    fingerprint = product.get("content_fingerprint")
+    if fingerprint and compute_content_fingerprint(product_data) == fingerprint:
+        return {"status": "unchanged", "id": product["id"], "url": product["url"]}
+    result = {"status": "success", "data": product_data}
+    if claim_check_store:
+        # Only the key goes through the result backend and the chord
+        return claim_check_store.check_in([result])
+    return result
+
+
+@app.task(
+    bind=True,
+    name="src.product_scrapers.celery.tasks.update_products",
+    ignore_result=True,
+    max_retries=SAVE_MAX_RETRIES,
+)
+def update_products(self, payloads, scraper_name: str):
+    if payloads:
+        api_client = ApiClient(token_cache=worker_token_cache)
+        source_website = api_client.get_source_website_by_name(scraper_name.lower())
         website_id = source_website.get("id")
-        successful = [
-            {**r["data"], **{"source_website_id": website_id}}
-            for r in results
-            if r["status"] == "success"
-        ]
-
+        successful = []
+        unchanged = 0
+        unchanged_ids = []
+        for r in iter_results(claim_check_store, payloads):
+            if r["status"] == "success":
+                successful.append({**r["data"], **{"source_website_id": website_id}})
+            elif r["status"] == "unchanged":
+                unchanged += 1
+                if r.get("id") is not None:
+                    unchanged_ids.append(r["id"])
+
+        updated = 0
+        if successful or unchanged_ids:
+            # Unchanged products are still marked checked so sweeps skip them
+            updated = api_client.bulk_update_products(successful, unchanged_ids)
+            if updated is None:
+                _retry_unsaved_batch(self, f"Update of {len(successful)} products")
+        release(claim_check_store, payloads)
         if successful:
-            updated = ApiClient(get_celery_worker_token()).update_product_list(
-                successful
-            )
-            return {"status": "success", "updated": updated}
+            return {"status": "success", "updated": updated, "unchanged": unchanged}
+        if unchanged:
+            return {"status": "success", "updated": 0, "unchanged": unchanged}
 
     return {"status": "error", "message": "No products to update"}
 
 
+# Results only live long enough for chords to collect them, and travel as
+# (compressed) orjson instead of plain JSON
+register_compact_serializer()
+app.conf.task_serializer = COMPACT_SERIALIZER
+app.conf.result_serializer = COMPACT_SERIALIZER
+app.conf.accept_content = [COMPACT_SERIALIZER, "json"]
+app.conf.result_accept_content = [COMPACT_SERIALIZER, "json"]
+app.conf.result_expires = int(os.getenv("CELERY_RESULT_EXPIRES_SECONDS", 3600))
+
 app.conf.timezone = "America/Sao_Paulo"
 app.conf.beat_scheduler = "src.product_scrapers.celery.beat_schedule.DynamicDBScheduler"
@@ -0,0 +1,160 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from src.product_scrapers.scrapers.base.circuit_breaker import (
+    BLOCKING_STATUSES,
+    CircuitOpenError,
+    get_circuit_breaker,
+)
+from src.product_scrapers.scrapers.base.http_cache import get_http_cache
+from src.product_scrapers.scrapers.base.rate_limiter import get_rate_limiter
+from src.product_scrapers.scrapers.base.retry_policy import (
+    RetryPolicy,
+    default_retry_policy,
+)
+
+ASYNC_SCRAPING_SITES = {
+    site.strip()
+    for site in os.getenv("SCRAPER_ASYNC_SITES", "").split(",")
+    if site.strip()
+}
+
+
+class AsyncRequestScraper(ABC):
+    """Fetches many product pages concurrently over a single httpx.AsyncClient.
+
+    Subclasses only provide `headers` and `parse_product`; the latter is shared with
+    the synchronous `scrape_data` path so both produce the same records.
+
+    Plain httpx carries no cloudscraper challenge cookies, so a scraper only fetches
+    this way once it sets `async_scraping` or its site is listed in
+    SCRAPER_ASYNC_SITES.
+    """
+
+    source_website_name: Optional[str] = None
+    async_scraping = False
+    max_concurrency = int(os.getenv("SCRAPER_MAX_CONCURRENCY", 20))
+    request_timeout = float(os.getenv("SCRAPER_REQUEST_TIMEOUT", 20))
+    retry_policy: RetryPolicy = default_retry_policy
+
+    @abstractmethod
+    def headers(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def parse_product(self, url: str, response) -> Dict[str, Any]:
+        """
+        Build the product record from a fetched product page response.
+        """
+        raise NotImplementedError
+
+    def async_scraping_enabled(self) -> bool:
+        return self.async_scraping or self.source_website_name in ASYNC_SCRAPING_SITES
+
+    def scrape_many(self, urls: List[str]) -> List[Dict[str, Any]]:
+        return asyncio.run(self.async_scrape_many(urls))
+
+    async def async_scrape_many(self, urls: List[str]) -> List[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._build_async_client() as client:
+            return await asyncio.gather(
+                *(self._scrape_result(client, url, semaphore) for url in urls)
+            )
+
+    async def async_scrape_data(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Dict[str, Any]:
+        response = await self.async_retry_request(
+            client, url, self.headers(), semaphore=semaphore
+        )
+        if response is None:
+            raise Exception(f"Could not fetch {url}")
+        http_cache = get_http_cache()
+        if http_cache:
+            http_cache.set(url, response)
+        return self.parse_product(url, response)
+
+    async def async_retry_request(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        max_retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Optional[httpx.Response]:
+        policy = self.retry_policy.with_overrides(max_retries, backoff_factor)
+        semaphore = semaphore or asyncio.Semaphore(1)
+        for i in range(policy.max_retries + 1):
+            self._check_circuit_async()
+            try:
+                async with semaphore:
+                    await self._wait_for_rate_limit_async()
+                    response = await client.get(url, headers=headers, params=params)
+                response.raise_for_status()
+                return response
+            except httpx.HTTPError as e:
+                print(f"Connection error during attempt {i + 1}: {str(e)}")
+                response = getattr(e, "response", None)
+                status_code = response.status_code if response is not None else None
+                self._record_blocking_status_async(status_code)
+                wait_time = policy.next_delay(
+                    i, status_code, response.headers if response is not None else None
+                )
+                if wait_time is None:
+                    print("Giving up on request.")
+                    return None
+                print(f"Retrying in {wait_time:.2f} seconds...")
+                await asyncio.sleep(wait_time)
+            except Exception as e:
+                print(f"unexpected error during attempt {i + 1}: {str(e)}")
+                return None
+
+        return None
+
+    def _check_circuit_async(self) -> None:
+        circuit_breaker = get_circuit_breaker()
+        if circuit_breaker and self.source_website_name:
+            circuit_breaker.check(self.source_website_name)
+
+    def _record_blocking_status_async(self, status_code: Optional[int]) -> None:
+        circuit_breaker = get_circuit_breaker()
+        if (
+            circuit_breaker
+            and self.source_website_name
+            and status_code in BLOCKING_STATUSES
+        ):
+            circuit_breaker.record_failure(self.source_website_name)
+
+    async def _wait_for_rate_limit_async(self) -> None:
+        rate_limiter = get_rate_limiter()
+        if rate_limiter and self.source_website_name:
+            await rate_limiter.acquire_async(self.source_website_name)
+
+    def _build_async_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency,
+        )
+        return httpx.AsyncClient(
+            follow_redirects=True, timeout=self.request_timeout, limits=limits
+        )
+
+    async def _scrape_result(
+        self, client: httpx.AsyncClient, url: str, semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        try:
+            data = await self.async_scrape_data(client, url, semaphore=semaphore)
+            return {"status": "success", "data": data}
+        except CircuitOpenError as e:
+            return {"status": "deferred", "url": url, "retry_in": e.retry_in}
+        except Exception as e:
+            return {"status": "error", "url": url, "message": str(e)}
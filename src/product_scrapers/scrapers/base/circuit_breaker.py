@@ -0,0 +1,101 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Responses that mean the site is blocking or throttling us as a whole
+BLOCKING_STATUSES = frozenset({403, 429})
+
+
+class CircuitOpenError(Exception):
+    """Requests to the site are paused until the circuit closes again."""
+
+    def __init__(self, site: str, retry_in: float):
+        super().__init__(f"Circuit open for {site}, retry in {retry_in:.0f}s")
+        self.site = site
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Per-source-website circuit breaker shared by all workers through Redis.
+
+    `failure_threshold` blocking responses within `window_seconds` open the circuit
+    for `open_seconds`. The open state is cached locally for `check_interval`
+    seconds so a closed circuit costs at most one Redis round trip per interval.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        failure_threshold: int = 5,
+        window_seconds: int = 60,
+        open_seconds: int = 300,
+        check_interval: float = 1.0,
+        key_prefix: str = "circuit",
+    ):
+        self.redis = redis_client
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.check_interval = check_interval
+        self.key_prefix = key_prefix
+        # site -> (checked_at, open_until), both on the time.monotonic() clock
+        self._state: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def retry_in(self, site: str) -> float:
+        """Seconds until the site's circuit closes, 0 when requests may go out."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._state.get(site)
+        if cached and now - cached[0] < self.check_interval:
+            return max(0.0, cached[1] - now)
+
+        try:
+            ttl_ms = self.redis.pttl(f"{self.key_prefix}:{site}:open")
+        except Exception as e:
+            # Never stall scraping because Redis is unavailable
+            print(f"🔴 Circuit breaker unavailable for {site}: {e}")
+            ttl_ms = -1
+        retry_in = ttl_ms / 1000 if ttl_ms and ttl_ms > 0 else 0.0
+        with self._lock:
+            self._state[site] = (now, now + retry_in)
+        return retry_in
+
+    def check(self, site: str) -> None:
+        retry_in = self.retry_in(site)
+        if retry_in > 0:
+            raise CircuitOpenError(site, retry_in)
+
+    def record_failure(self, site: str) -> bool:
+        """Count a blocking response; returns True when it opened the circuit."""
+        failures_key = f"{self.key_prefix}:{site}:failures"
+        try:
+            pipe = self.redis.pipeline()
+            pipe.incr(failures_key)
+            pipe.expire(failures_key, self.window_seconds)
+            failures = pipe.execute()[0]
+            if failures < self.failure_threshold:
+                return False
+            self.redis.set(f"{self.key_prefix}:{site}:open", 1, ex=self.open_seconds)
+            self.redis.delete(failures_key)
+        except Exception as e:
+            print(f"🔴 Circuit breaker unavailable for {site}: {e}")
+            return False
+
+        print(f"🚧 Circuit opened for {site} for {self.open_seconds}s")
+        now = time.monotonic()
+        with self._lock:
+            self._state[site] = (now, now + self.open_seconds)
+        return True
+
+
+_circuit_breaker: Optional[CircuitBreaker] = None
+
+
+def set_circuit_breaker(circuit_breaker: Optional[CircuitBreaker]) -> None:
+    global _circuit_breaker
+    _circuit_breaker = circuit_breaker
+
+
+def get_circuit_breaker() -> Optional[CircuitBreaker]:
+    return _circuit_breaker
@@ -0,0 +1,186 @@
+import hashlib
+import os
+import tempfile
+import zlib
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import orjson
+import redis
+
+
+class PageNotModified(Exception):
+    """The server answered 304, the cached copy of the page is still current."""
+
+    def __init__(self, url: str):
+        super().__init__(f"Page not modified: {url}")
+        self.url = url
+
+
+class CachedPage:
+    """Cached page, usable wherever the scrapers expect a response.
+
+    content is None when only the validators were stored.
+    """
+
+    status_code = 200
+
+    def __init__(
+        self,
+        url: str,
+        content: Optional[bytes],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        self.url = url
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return orjson.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        pass
+
+    @property
+    def has_body(self) -> bool:
+        return self.content is not None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """Stores validators (ETag/Last-Modified) per URL, and zlib-compressed bodies
+    when store_bodies is set.
+
+    The update sweep only revalidates pages, so bodies are off by default to keep
+    the store (often the broker's Redis) small.
+    """
+
+    store_bodies = False
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        try:
+            raw = self._read(self._key(url))
+        except Exception as e:
+            print(f"🔴 Error reading HTTP cache for {url}: {e}")
+            return None
+        if not raw:
+            return None
+        payload = zlib.decompress(raw)
+        header_size = int.from_bytes(payload[:4], "big")
+        meta = orjson.loads(payload[4 : 4 + header_size])
+        # Entries written before bodies became optional always carry one
+        body = payload[4 + header_size :] if meta.get("body", True) else None
+        return CachedPage(url, body, meta.get("etag"), meta.get("last_modified"))
+
+    def set(self, url: str, response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        header = orjson.dumps(
+            {"etag": etag, "last_modified": last_modified, "body": self.store_bodies}
+        )
+        payload = len(header).to_bytes(4, "big") + header
+        if self.store_bodies:
+            payload += response.content
+        try:
+            self._write(self._key(url), zlib.compress(payload))
+        except Exception as e:
+            print(f"🔴 Error writing HTTP cache for {url}: {e}")
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _read(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def _write(self, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+
+class FileHttpCache(HttpCache):
+    def __init__(self, directory: str, store_bodies: bool = False):
+        self.directory = directory
+        self.store_bodies = store_bodies
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, key: str, value: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so concurrent workers never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+
+
+class RedisHttpCache(HttpCache):
+    def __init__(
+        self,
+        client,
+        ttl_seconds: int,
+        key_prefix: str = "http_cache",
+        store_bodies: bool = False,
+    ):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self.store_bodies = store_bodies
+
+    def _read(self, key: str) -> Optional[bytes]:
+        return self.client.get(f"{self.key_prefix}:{key}")
+
+    def _write(self, key: str, value: bytes) -> None:
+        self.client.set(f"{self.key_prefix}:{key}", value, ex=self.ttl_seconds)
+
+
+def build_http_cache(
+    url: Optional[str], ttl_seconds: int, store_bodies: bool = False
+) -> Optional[HttpCache]:
+    """Build the cache from a redis:// or file:// URL; empty disables caching."""
+    if not url:
+        return None
+    parsed = urlparse(url)
+    if parsed.scheme in ("redis", "rediss"):
+        return RedisHttpCache(
+            redis.Redis.from_url(url), ttl_seconds, store_bodies=store_bodies
+        )
+    if parsed.scheme == "file":
+        return FileHttpCache(parsed.path, store_bodies=store_bodies)
+    raise ValueError(f"Unsupported HTTP cache URL: {url}")
+
+
+_http_cache: Optional[HttpCache] = None
+
+
+def set_http_cache(http_cache: Optional[HttpCache]) -> None:
+    global _http_cache
+    _http_cache = http_cache
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    return _http_cache
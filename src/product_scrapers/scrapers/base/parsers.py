@@ -0,0 +1,70 @@
+import html
+import os
+from typing import Any, Optional, Union
+
+import orjson
+from bs4 import BeautifulSoup
+
+Content = Union[str, bytes]
+
+# lxml builds the tree several times faster than the pure-Python "html.parser"
+PARSER_BACKEND = os.getenv("SCRAPER_PARSER_BACKEND", "lxml")
+
+
+def parse_html(content: Content, backend: str = None) -> BeautifulSoup:
+    return BeautifulSoup(content, backend or PARSER_BACKEND)
+
+
+def loads_json(data: Content) -> Any:
+    return orjson.loads(data)
+
+
+def _to_bytes(content: Content) -> bytes:
+    return content.encode("utf-8") if isinstance(content, str) else content
+
+
+def extract_script_json(content: Content, script_id: str) -> Optional[Any]:
+    """Decode the JSON body of `<script id="script_id">` without building a DOM."""
+    content = _to_bytes(content)
+    marker = content.find(f'id="{script_id}"'.encode())
+    if marker == -1:
+        return None
+    start = content.find(b">", marker)
+    end = content.find(b"</script>", start)
+    if start == -1 or end == -1:
+        return None
+    return orjson.loads(content[start + 1 : end])
+
+
+def extract_attribute_json(
+    content: Content, element_id: str, attribute: str
+) -> Optional[Any]:
+    """Decode an HTML-escaped JSON attribute, e.g. `<script id=".." data-json="..">`."""
+    content = _to_bytes(content)
+    marker = content.find(f'id="{element_id}"'.encode())
+    if marker == -1:
+        return None
+    tag_start = content.rfind(b"<", 0, marker)
+    attr = content.find(f"{attribute}=".encode(), tag_start)
+    if attr == -1:
+        return None
+    quote_at = attr + len(attribute) + 1
+    quote = content[quote_at : quote_at + 1]
+    end = content.find(quote, quote_at + 1)
+    if quote not in (b'"', b"'") or end == -1:
+        return None
+    value = content[quote_at + 1 : end].decode("utf-8")
+    return orjson.loads(html.unescape(value))
+
+
+def extract_assigned_json(content: Content, variable: str) -> Optional[Any]:
+    """Decode `variable = {...};` from an inline script, e.g. window.__INITIAL_STATE__."""
+    content = _to_bytes(content)
+    marker = content.find(variable.encode())
+    if marker == -1:
+        return None
+    start = content.find(b"=", marker + len(variable))
+    end = content.find(b"</script>", start)
+    if start == -1 or end == -1:
+        return None
+    return orjson.loads(content[start + 1 : end].strip().rstrip(b";"))
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+# Token bucket kept in a Redis hash so every worker draws from the same budget.
+# Returns 0 when a token was taken, otherwise the seconds until one is available.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+RateLimit = Tuple[float, int]
+
+
+class RateLimiter:
+    """Per-source-website token bucket shared by all workers through Redis.
+
+    `rate_provider` returns the (requests per second, burst) configured for a site,
+    or None when the site is unlimited. Results are cached for `config_ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        rate_provider: Callable[[str], Optional[RateLimit]],
+        config_ttl: float = 300,
+        key_prefix: str = "rate_limit",
+    ):
+        self.redis = redis_client
+        self.rate_provider = rate_provider
+        self.config_ttl = config_ttl
+        self.key_prefix = key_prefix
+        self._script = redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+        self._rates: Dict[str, Tuple[float, Optional[RateLimit]]] = {}
+        self._lock = threading.Lock()
+
+    def get_rate(self, site: str) -> Optional[RateLimit]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._rates.get(site)
+            if cached and cached[0] > now:
+                return cached[1]
+        try:
+            rate = self.rate_provider(site)
+        except Exception as e:
+            print(f"🔴 Error loading rate limit for {site}: {e}")
+            rate = cached[1] if cached else None
+        with self._lock:
+            self._rates[site] = (now + self.config_ttl, rate)
+        return rate
+
+    def try_acquire(self, site: str) -> float:
+        rate = self.get_rate(site)
+        if not rate:
+            return 0.0
+        per_second, burst = rate
+        try:
+            return float(
+                self._script(
+                    keys=[f"{self.key_prefix}:{site}"], args=[per_second, burst]
+                )
+            )
+        except Exception as e:
+            # Never stall scraping because Redis is unavailable
+            print(f"🔴 Rate limiter unavailable for {site}: {e}")
+            return 0.0
+
+    def acquire(self, site: str) -> float:
+        waited = 0.0
+        while (wait := self.try_acquire(site)) > 0:
+            time.sleep(wait)
+            waited += wait
+        return waited
+
+    async def acquire_async(self, site: str) -> float:
+        waited = 0.0
+        while (wait := self.try_acquire(site)) > 0:
+            await asyncio.sleep(wait)
+            waited += wait
+        return waited
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def set_rate_limiter(rate_limiter: Optional[RateLimiter]) -> None:
+    global _rate_limiter
+    _rate_limiter = rate_limiter
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    return _rate_limiter
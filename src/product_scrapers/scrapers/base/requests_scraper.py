@@ -1,30 +1,69 @@
 import cloudscraper
+import os
 import requests
+import threading
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterable, Iterator
+
+from src.product_scrapers.scrapers.base.circuit_breaker import (
+    BLOCKING_STATUSES,
+    get_circuit_breaker,
+)
+from src.product_scrapers.scrapers.base.http_cache import (
+    PageNotModified,
+    get_http_cache,
+)
+from src.product_scrapers.scrapers.base.rate_limiter import get_rate_limiter
+from src.product_scrapers.scrapers.base.retry_policy import (
+    RetryPolicy,
+    default_retry_policy,
+)
 
 
 class RequestScraper(ABC):
+    source_website_name: Optional[str] = None
+    search_concurrency = int(os.getenv("SCRAPER_SEARCH_CONCURRENCY", 8))
+    retry_policy: RetryPolicy = default_retry_policy
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._session = cloudscraper.create_scraper()
+        self._main_session = cloudscraper.create_scraper()
+        self._local = threading.local()
+
+    @property
+    def _session(self):
+        # map_concurrently threads get their own session, sessions are not
+        # thread-safe; everything else runs on the owning thread's session
+        return getattr(self._local, "session", None) or self._main_session
 
     @abstractmethod
     def headers(self) -> Dict[str, Any]:
         raise NotImplementedError
 
+    def reset_session(self) -> None:
+        """Drop pooled connections and challenge cookies, e.g. after repeated errors."""
+        self._main_session.close()
+        self._main_session = cloudscraper.create_scraper()
+
+    def close(self) -> None:
+        self._main_session.close()
+
     def retry_request(
         self,
         url: str,
         headers: dict = {},
         params: dict = {},
-        max_retries: int = 3,
-        backoff_factor: float = 2,
+        max_retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
     ) -> Optional[requests.Response]:
-        for i in range(max_retries + 1):
+        policy = self.retry_policy.with_overrides(max_retries, backoff_factor)
+        for i in range(policy.max_retries + 1):
+            self._check_circuit()
             try:
+                self._wait_for_rate_limit()
                 response = self._session.get(
                     url, headers=headers, params=params, allow_redirects=True
                 )
@@ -32,15 +71,99 @@ class RequestScraper(ABC):
                 return response
             except requests.exceptions.RequestException as e:
                 print(f"Connection error during attempt {i + 1}: {str(e)}")
-                if i < max_retries:
-                    wait_time = (backoff_factor**i) * 1  # Exponential backoff
-                    print(f"Retrying in {wait_time:.2f} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    print("Maximum number of retries reached.")
+                status_code, response_headers = self._error_details(e)
+                self._record_blocking_status(status_code)
+                wait_time = policy.next_delay(i, status_code, response_headers)
+                if wait_time is None:
+                    print("Giving up on request.")
                     return None
+                print(f"Retrying in {wait_time:.2f} seconds...")
+                time.sleep(wait_time)
             except Exception as e:
                 print(f"unexpected error during attempt {i + 1}: {str(e)}")
                 return None
 
         return None
+
+    def fetch_page(self, url: str, headers: dict = None, only_if_modified=False):
+        """Fetch a product page, revalidating the cached copy when there is one.
+
+        On a 304 the cached body is returned, or PageNotModified is raised when
+        only_if_modified is set so callers can skip parsing altogether. Without a
+        cached body the page is only revalidated for only_if_modified callers.
+        """
+        http_cache = get_http_cache()
+        cached = http_cache.get(url) if http_cache else None
+        if cached and not (only_if_modified or cached.has_body):
+            cached = None
+        request_headers = dict(headers or {})
+        if cached:
+            request_headers.update(cached.conditional_headers())
+
+        response = self.retry_request(url, request_headers)
+        if response is None:
+            return None
+        if response.status_code == 304 and cached:
+            if only_if_modified:
+                raise PageNotModified(url)
+            return cached
+        if http_cache:
+            http_cache.set(url, response)
+        return response
+
+    def map_concurrently(self, func: Callable, items: Iterable) -> Iterator:
+        """Apply func to items on a bounded thread pool, yielding in input order.
+
+        Each pool thread requests through its own session, seeded with the main
+        session's cookies so challenge clearance carries over.
+        """
+        items = list(items)
+        if len(items) <= 1 or self.search_concurrency <= 1:
+            yield from map(func, items)
+            return
+
+        sessions = []
+        sessions_lock = threading.Lock()
+
+        def start_worker():
+            session = cloudscraper.create_scraper()
+            session.cookies.update(self._main_session.cookies)
+            with sessions_lock:
+                sessions.append(session)
+            self._local.session = session
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(self.search_concurrency, len(items)),
+                initializer=start_worker,
+            ) as pool:
+                yield from pool.map(func, items)
+        finally:
+            for session in sessions:
+                session.close()
+
+    @staticmethod
+    def _error_details(error: requests.exceptions.RequestException):
+        response = getattr(error, "response", None)
+        if response is None:
+            return None, None
+        return response.status_code, response.headers
+
+    def _check_circuit(self) -> None:
+        circuit_breaker = get_circuit_breaker()
+        if circuit_breaker and self.source_website_name:
+            circuit_breaker.check(self.source_website_name)
+
+    def _record_blocking_status(self, status_code: Optional[int]) -> None:
+        circuit_breaker = get_circuit_breaker()
+        if (
+            circuit_breaker
+            and self.source_website_name
+            and status_code in BLOCKING_STATUSES
+        ):
+            circuit_breaker.record_failure(self.source_website_name)
+
+    def _wait_for_rate_limit(self) -> None:
+        rate_limiter = get_rate_limiter()
+        if rate_limiter and self.source_website_name:
+            rate_limiter.acquire(self.source_website_name)
@@ -0,0 +1,89 @@
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Throttling and transient server errors; any other 4xx (404/410 on delisted
+# items, 403 blocks) cannot succeed by asking again
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """Decides whether a failed request is retried and how long to wait first.
+
+    Connection errors and RETRY_STATUSES are retried with jittered exponential
+    backoff, capped at `max_backoff`. A `Retry-After` header overrides the backoff;
+    when it asks for more than `max_retry_after` seconds the request is given up
+    instead of keeping the worker asleep.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 2,
+        max_backoff: float = 30,
+        max_retry_after: float = 60,
+        jitter: float = 0.5,
+        retry_statuses=RETRY_STATUSES,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+
+    def with_overrides(
+        self, max_retries: Optional[int] = None, backoff_factor: Optional[float] = None
+    ) -> "RetryPolicy":
+        if max_retries is None and backoff_factor is None:
+            return self
+        return RetryPolicy(
+            max_retries=self.max_retries if max_retries is None else max_retries,
+            backoff_factor=(
+                self.backoff_factor if backoff_factor is None else backoff_factor
+            ),
+            max_backoff=self.max_backoff,
+            max_retry_after=self.max_retry_after,
+            jitter=self.jitter,
+            retry_statuses=self.retry_statuses,
+        )
+
+    def is_retryable(self, status_code: Optional[int]) -> bool:
+        return status_code is None or status_code in self.retry_statuses
+
+    def next_delay(
+        self, attempt: int, status_code: Optional[int] = None, headers=None
+    ) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to give up."""
+        if attempt >= self.max_retries or not self.is_retryable(status_code):
+            return None
+
+        retry_after = parse_retry_after((headers or {}).get("Retry-After"))
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_retry_after else None
+
+        backoff = min(self.max_backoff, self.backoff_factor**attempt)
+        return random.uniform(backoff * (1 - self.jitter), backoff)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+default_retry_policy = RetryPolicy(
+    max_retries=int(os.getenv("SCRAPER_MAX_RETRIES", 3)),
+    max_backoff=float(os.getenv("SCRAPER_MAX_BACKOFF_SECONDS", 30)),
+    max_retry_after=float(os.getenv("SCRAPER_MAX_RETRY_AFTER_SECONDS", 60)),
+)
@@ -1,5 +1,10 @@
+from typing import Iterator
+
 from requests import Response
 
+from src.product_scrapers.scrapers.base.async_requests_scraper import (
+    AsyncRequestScraper,
+)
 from src.product_scrapers.scrapers.base.requests_scraper import RequestScraper
 from src.product_scrapers.scrapers.interfaces.scraper_interface import ScraperInterface
 from src.product_scrapers.scrapers.mixins.rotating_user_agent_mixin import (
@@ -7,7 +12,12 @@ from src.product_scrapers.scrapers.mixins.rotating_user_agent_mixin import (
 )
 
 
-class EnjoeiScraper(ScraperInterface, RequestScraper, RotatingUserAgentMixin):
+class EnjoeiScraper(
+    ScraperInterface, RequestScraper, AsyncRequestScraper, RotatingUserAgentMixin
+):
+    source_website_name = "enjoei"
+    supports_harvest = True
+
     def __init__(self):
         super().__init__()
         self.BASE_URL = "https://enjusearch.enjoei.com.br"
@@ -68,19 +78,76 @@ class EnjoeiScraper(ScraperInterface, RequestScraper, RotatingUserAgentMixin):
 
         return urls, cursor
 
-    def search(self, search_term: str) -> list[str]:
-        all_urls = []
+    def _extract_records(self, data: dict) -> tuple:
+        records = []
+        _, cursor = self._extract_links(data)
+
+        try:
+            edges = data["data"]["search"]["products"]["edges"]
+            nodes = [edge["node"] for edge in edges if "id" in edge["node"]]
+        except (KeyError, TypeError):
+            nodes = []
+
+        for node in nodes:
+            # Products are stored under their canonical URL, without it the
+            # product page has to be fetched to learn it
+            path = node.get("path")
+            if not path:
+                records.append(
+                    {
+                        "url": f"https://pages.enjoei.com.br/products/{node['id']}/v2.json"
+                    }
+                )
+                continue
+
+            canonical_url = f"https://www.enjoei.com.br{path}"
+            price_dict = node.get("price") or {}
+            price = price_dict.get("listed") or price_dict.get("sale") or "0"
+            photo_code = node.get("photo")
+            image_url = (
+                f"https://photos.enjoei.com.br/{canonical_url.split('/')[-1]}/1200xN/{photo_code}"
+                if photo_code
+                else ""
+            )
+            records.append(
+                {
+                    "url": canonical_url,
+                    "title": node.get("title"),
+                    "price": price,
+                    "description": None,
+                    "source_product_code": f"EJ - {node['id']} ",
+                    "city": "not found",
+                    "state": "not found",
+                    "seller_name": "not found",
+                    "is_available": True,
+                    "image_urls": image_url,
+                    "source_metadata": {},
+                }
+            )
+
+        return records, cursor
+
+    def search(self, search_term: str) -> Iterator[list[str]]:
+        yield from self._search_pages(search_term, self._extract_links)
+
+    def harvest(self, search_term: str) -> Iterator[list[dict]]:
+        yield from self._search_pages(search_term, self._extract_records)
+
+    def _search_pages(self, search_term: str, extract) -> Iterator[list]:
         cursor = None
         while True:
             response = self._get_search_data(term=search_term, after=cursor)
-            urls, cursor = self._extract_links(response.json())
-            all_urls.extend(urls)
+            items, cursor = extract(response.json())
+            if items:
+                yield items
             if not cursor:
                 break
-        return all_urls
 
-    def scrape_data(self, url: str) -> dict:
-        response = self.retry_request(url, self.headers())
+    def scrape_data(self, url: str, only_if_modified: bool = False) -> dict:
+        response = self.fetch_page(url, self.headers(), only_if_modified)
+        return self.parse_product(url, response)
+
+    def parse_product(self, url: str, response) -> dict:
         data = response.json()
         url = data["canonical_url"]
         price_dict = data.get("fallback_pricing", {}).get("price", {})
@@ -113,7 +180,7 @@ class EnjoeiScraper(ScraperInterface, RequestScraper, RotatingUserAgentMixin):
     def update_data(self, product: dict) -> dict:
         product_code = product["url"].split("-")[-1]
         api_url = f"https://pages.enjoei.com.br/products/{product_code}/v2.json"
-        updated_data = self.scrape_data(api_url)
+        updated_data = self.scrape_data(api_url, only_if_modified=True)
         return {**product, **updated_data}
 
     def __str__(self):
@@ -1,9 +1,12 @@
 import datetime
-import json
 
-from bs4 import BeautifulSoup
+from typing import Iterator
 from urllib.parse import quote_plus
 
+from src.product_scrapers.scrapers.base.async_requests_scraper import (
+    AsyncRequestScraper,
+)
+from src.product_scrapers.scrapers.base.parsers import extract_assigned_json
 from src.product_scrapers.scrapers.base.requests_scraper import RequestScraper
 from src.product_scrapers.scrapers.interfaces.scraper_interface import ScraperInterface
 from src.product_scrapers.scrapers.mixins.rotating_user_agent_mixin import (
@@ -11,7 +14,11 @@ from src.product_scrapers.scrapers.mixins.rotating_user_agent_mixin import (
 )
 
 
-class EstanteVirtualScraper(ScraperInterface, RequestScraper, RotatingUserAgentMixin):
+class EstanteVirtualScraper(
+    ScraperInterface, RequestScraper, AsyncRequestScraper, RotatingUserAgentMixin
+):
+    source_website_name = "estante_virtual"
+
     def __init__(self):
         super().__init__()
         self.BASE_URL = "https://www.estantevirtual.com.br"
@@ -29,41 +36,42 @@ class EstanteVirtualScraper(ScraperInterface, RequestScraper, RotatingUserAgentM
             custom_headers["User-Agent"] = random_user_agent
         return custom_headers
 
-    def search(self, search_term: str) -> list[str]:
-        page_number = 0
-        has_next = True
-        all_links = []
-
-        while has_next:
-            page_number += 1
-
-            params = {
-                "q": quote_plus(search_term),
-                "searchField": "titulo-autor",
-                "page": f"{page_number}",
-            }
-
-            resp = self.retry_request(
-                f"{self.BASE_URL}/busca/api",
-                self.headers(),
-                params=params,
-            )
-
-            if page_number == resp.json().get("totalPages"):
-                has_next = False
+    def search(self, search_term: str) -> Iterator[list[str]]:
+        first_page = self._get_search_page(search_term, 1)
+        yield self._get_products_list(first_page)
+        total_pages = first_page.get("totalPages") or 1
+
+        # totalPages is known after the first request, so the rest can run in parallel
+        yield from self.map_concurrently(
+            lambda page_number: self._get_products_list(
+                self._get_search_page(search_term, page_number)
+            ),
+            range(2, total_pages + 1),
+        )
 
-            urls = self._get_products_list(resp.json())
-            all_links.extend(urls)
+    def _get_search_page(self, search_term: str, page_number: int) -> dict:
+        params = {
+            "q": quote_plus(search_term),
+            "searchField": "titulo-autor",
+            "page": f"{page_number}",
+        }
 
-        return all_links
+        resp = self.retry_request(
+            f"{self.BASE_URL}/busca/api",
+            self.headers(),
+            params=params,
+        )
+        return resp.json()
 
     def _get_products_list(self, data: dict) -> list:
         return [f"{self.BASE_URL}{item['productSlug']}" for item in data["parentSkus"]]
 
-    def scrape_data(self, url: str) -> dict:
-        resp = self._fetch_page(url)
-        soup = self._parse_html(resp.content)
-        data = self._extract_initial_state(soup)
+    def scrape_data(self, url: str, only_if_modified: bool = False) -> dict:
+        resp = self._fetch_page(url, only_if_modified)
+        return self.parse_product(url, resp)
+
+    def parse_product(self, url: str, response) -> dict:
+        data = self._extract_initial_state(response.content)
 
         if not data:
             return {}
@@ -91,22 +99,13 @@ class EstanteVirtualScraper(ScraperInterface, RequestScraper, RotatingUserAgentM
             "source_metadata": {},
         }
 
-    def _fetch_page(self, url: str):
-        resp = self.retry_request(url)
+    def _fetch_page(self, url: str, only_if_modified: bool = False):
+        resp = self.fetch_page(url, only_if_modified=only_if_modified)
         resp.raise_for_status()
         return resp
 
-    def _parse_html(self, content: bytes) -> BeautifulSoup:
-        return BeautifulSoup(content, "html.parser")
-
-    def _extract_initial_state(self, soup: BeautifulSoup) -> dict:
-        script_tag = soup.find(
-            "script", string=lambda t: t and "window.__INITIAL_STATE__" in t
-        )
-        if not script_tag:
-            return {}
-        json_data = script_tag.string.split("=", 1)[1].strip().rstrip(";")
-        return json.loads(json_data)
+    def _extract_initial_state(self, content: bytes) -> dict:
+        return extract_assigned_json(content, "window.__INITIAL_STATE__") or {}
 
     def _extract_product_info(self, data: dict) -> dict:
         return data.get("Product", {})
@@ -170,7 +169,7 @@ class EstanteVirtualScraper(ScraperInterface, RequestScraper, RotatingUserAgentM
         return f"EV - {sku}"
 
     def update_data(self, product: dict) -> dict:
-        data = self.scrape_data(product["url"])
+        data = self.scrape_data(product["url"], only_if_modified=True)
         return {**product, **data}
 
     def __str__(self):
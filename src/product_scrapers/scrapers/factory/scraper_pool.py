@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+from src.product_scrapers.scrapers.base.circuit_breaker import CircuitOpenError
+from src.product_scrapers.scrapers.base.http_cache import PageNotModified
+from src.product_scrapers.scrapers.factory.scraper_factory import ScraperFactory
+from src.product_scrapers.scrapers.interfaces.scraper_interface import ScraperInterface
+
+
+class _PooledScraper:
+    def __init__(self, scraper: ScraperInterface):
+        self.scraper = scraper
+        self.created_at = time.monotonic()
+        self.errors = 0
+
+
+class ScraperPool:
+    """Per-process registry that reuses scraper instances across tasks.
+
+    Each thread gets its own instance per site, so sessions are never shared
+    between threads. Sessions are recycled once they are older than
+    `max_age_seconds` or after `max_errors` consecutive failed leases.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], ScraperInterface] = ScraperFactory.create_scraper,
+        max_age_seconds: float = 1800,
+        max_errors: int = 3,
+    ):
+        self.factory = factory
+        self.max_age_seconds = max_age_seconds
+        self.max_errors = max_errors
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._entries: List[_PooledScraper] = []
+
+    @contextmanager
+    def lease(self, name: str) -> Iterator[ScraperInterface]:
+        entry = self._get_entry(name)
+        try:
+            yield entry.scraper
+        except (PageNotModified, CircuitOpenError):
+            raise
+        except Exception:
+            entry.errors += 1
+            if entry.errors >= self.max_errors:
+                print(
+                    f"♻️ Recycling {entry.scraper} session after {entry.errors} errors"
+                )
+                self._recycle(entry)
+            raise
+        else:
+            entry.errors = 0
+
+    def clear(self) -> None:
+        """Forget every instance, e.g. after a fork, without closing sessions."""
+        with self._lock:
+            self._entries = []
+        self._local = threading.local()
+
+    def close_all(self) -> None:
+        with self._lock:
+            entries, self._entries = self._entries, []
+        self._local = threading.local()
+        for entry in entries:
+            close = getattr(entry.scraper, "close", None)
+            if close:
+                close()
+
+    def _get_entry(self, name: str) -> _PooledScraper:
+        entries: Dict[str, _PooledScraper] = getattr(self._local, "entries", None)
+        if entries is None:
+            entries = self._local.entries = {}
+
+        key = name.lower()
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = _PooledScraper(self.factory(key))
+            with self._lock:
+                self._entries.append(entry)
+        elif time.monotonic() - entry.created_at >= self.max_age_seconds:
+            self._recycle(entry)
+        return entry
+
+    @staticmethod
+    def _recycle(entry: _PooledScraper) -> None:
+        reset_session = getattr(entry.scraper, "reset_session", None)
+        if reset_session:
+            reset_session()
+        entry.created_at = time.monotonic()
+        entry.errors = 0
+
+
+scraper_pool = ScraperPool(
+    max_age_seconds=float(os.getenv("SCRAPER_SESSION_MAX_AGE_SECONDS", 1800)),
+    max_errors=int(os.getenv("SCRAPER_SESSION_MAX_ERRORS", 3)),
+)
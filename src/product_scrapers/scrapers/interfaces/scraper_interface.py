@@ -1,20 +1,34 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import Dict, Any, Iterator, List
+
+
+# A harvested record missing any of these still needs its product page fetched
+HARVEST_REQUIRED_FIELDS = ("url", "title", "price", "city", "state")
 
 
 class ScraperInterface(ABC):
+    supports_harvest = False
+
     @abstractmethod
-    def search(self, search_term: str) -> List:
+    def search(self, search_term: str) -> Iterator[List[str]]:
         """
         Search for a product using the given search term.
-        Returns the HTML content of the search results page.
+        Yields the product URLs of each results page as soon as it is fetched.
+        """
+        raise NotImplementedError
+
+    def harvest(self, search_term: str) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Search like `search`, but yield partial product records built from the
+        results pages. Only available when `supports_harvest` is set.
         """
         raise NotImplementedError
 
     @abstractmethod
-    def scrape_data(self, url: str) -> Dict[str, Any]:
+    def scrape_data(self, url: str, only_if_modified: bool = False) -> Dict[str, Any]:
         """
         Scrape data from the given product URL.
+        With only_if_modified, raise PageNotModified when the page did not change.
         """
         raise NotImplementedError
 
@@ -1,6 +1,14 @@
 from itertools import islice
 
-from src.product_scrapers.scrapers.interfaces.scraper_interface import ScraperInterface
+from src.product_scrapers.scrapers.base.async_requests_scraper import (
+    AsyncRequestScraper,
+)
+from src.product_scrapers.scrapers.base.circuit_breaker import CircuitOpenError
+from src.product_scrapers.scrapers.base.requests_scraper import RequestScraper
+from src.product_scrapers.scrapers.interfaces.scraper_interface import (
+    HARVEST_REQUIRED_FIELDS,
+    ScraperInterface,
+)
 
 
 class ScraperManager:
@@ -11,10 +19,85 @@ class ScraperManager:
         print(f"🔎 Searching term: {search} with {self.scraper}")
         return self.scraper.search(search)
 
+    def get_new_urls_by_chunk(self, search, is_known, chunk_size: int):
+        """Yield chunks of URLs not seen before, as result pages arrive.
+
+        is_known receives one page of unseen URLs and returns those that already exist.
+        """
+        return self._new_items_by_chunk(
+            search,
+            self.get_products_urls(search),
+            lambda url: url,
+            is_known,
+            chunk_size,
+        )
+
+    def harvest_new_products_by_chunk(self, search, is_known, chunk_size: int):
+        """Like get_new_urls_by_chunk, but yields the partial records of new products."""
+        print(f"🌾 Harvesting term: {search} with {self.scraper}")
+        return self._new_items_by_chunk(
+            search,
+            self.scraper.harvest(search),
+            lambda record: record["url"],
+            is_known,
+            chunk_size,
+        )
+
+    @staticmethod
+    def is_complete_record(record: dict) -> bool:
+        return all(
+            record.get(field) not in (None, "") for field in HARVEST_REQUIRED_FIELDS
+        )
+
+    @staticmethod
+    def _new_items_by_chunk(search, pages, get_url, is_known, chunk_size: int):
+        seen_urls = set()
+        pending = []
+        for page in pages:
+            page_items = {}
+            for item in page:
+                url = get_url(item)
+                if url not in seen_urls:
+                    page_items.setdefault(url, item)
+            if not page_items:
+                continue
+            seen_urls.update(page_items)
+            known_urls = is_known(list(page_items))
+            pending.extend(
+                item for url, item in page_items.items() if url not in known_urls
+            )
+            while len(pending) >= chunk_size:
+                yield pending[:chunk_size]
+                pending = pending[chunk_size:]
+
+        print(f"➡ Found {len(seen_urls)} URLs for {search}")
+        if pending:
+            yield pending
+
     def scrape_product(self, url):
         print(f"🛒 Get products data for {url} with {self.scraper}")
         return self.scraper.scrape_data(url)
 
+    def scrape_products(self, urls: list) -> list:
+        print(f"🛒 Get products data for {len(urls)} URLs with {self.scraper}")
+        if (
+            isinstance(self.scraper, AsyncRequestScraper)
+            and self.scraper.async_scraping_enabled()
+        ):
+            return self.scraper.scrape_many(urls)
+        if isinstance(self.scraper, RequestScraper):
+            # Pool threads keep the cloudscraper session's challenge cookies
+            return list(self.scraper.map_concurrently(self._scrape_result, urls))
+        return [self._scrape_result(url) for url in urls]
+
+    def _scrape_result(self, url: str) -> dict:
+        try:
+            return {"status": "success", "data": self.scraper.scrape_data(url)}
+        except CircuitOpenError as e:
+            return {"status": "deferred", "url": url, "retry_in": e.retry_in}
+        except Exception as e:
+            return {"status": "error", "url": url, "message": str(e)}
+
     def update_product(self, product: dict):
         print(f"🔄 Updating product for URL: {product['url']}")
         product_data = self.scraper.update_data(product)
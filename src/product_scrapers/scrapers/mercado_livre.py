@@ -1,8 +1,13 @@
 import datetime
 
-from bs4 import BeautifulSoup
+from typing import Iterator
 from urllib.parse import urlparse, parse_qs
 
+from src.product_scrapers.scrapers.base.async_requests_scraper import (
+    AsyncRequestScraper,
+)
+from src.product_scrapers.scrapers.base.circuit_breaker import CircuitOpenError
+from src.product_scrapers.scrapers.base.parsers import parse_html
 from src.product_scrapers.scrapers.base.requests_scraper import RequestScraper
 from src.product_scrapers.scrapers.interfaces.scraper_interface import ScraperInterface
 from src.product_scrapers.scrapers.mixins.rotating_user_agent_mixin import (
@@ -10,10 +15,16 @@ from src.product_scrapers.scrapers.mixins.rotating_user_agent_mixin import (
 )
 
 
-class MercadoLivreScraper(ScraperInterface, RequestScraper, RotatingUserAgentMixin):
+class MercadoLivreScraper(
+    ScraperInterface, RequestScraper, AsyncRequestScraper, RotatingUserAgentMixin
+):
+    source_website_name = "mercado_livre"
+
     def __init__(self):
         super().__init__()
         self.BASE_URL = "https://lista.mercadolivre.com.br"
+        # Mercado Livre stops paginating after this many results
+        self.MAX_SEARCH_RESULTS = 2000
 
     def headers(self):
         custom_headers = {
@@ -28,8 +39,7 @@ class MercadoLivreScraper(ScraperInterface, RequestScraper, RotatingUserAgentMix
             custom_headers["User-Agent"] = random_user_agent
         return custom_headers
 
-    def _extract_links(self, html: str) -> list:
-        soup = BeautifulSoup(html, "html.parser")
+    def _extract_links(self, soup) -> list:
         links = []
 
         for a in soup.select(".poly-component__title-wrapper a"):
@@ -46,44 +56,104 @@ class MercadoLivreScraper(ScraperInterface, RequestScraper, RotatingUserAgentMix
 
         return f"{self.BASE_URL}/{search_term}_Desde_{start_from}_NoIndex_True"
 
-    def search(self, search_term: str) -> list:
-        page_number = 1
-        total_links = 0
-        has_next = True
-        all_links = []
+    def search(self, search_term: str) -> Iterator[list]:
         search_url = f"{self.BASE_URL}/{search_term}"
 
+        try:
+            html_content = self._get_page_html(search_url)
+            # Parsed once, page 1 also carries the total result count
+            soup = parse_html(html_content) if html_content else None
+            links = self._extract_links(soup) if soup else []
+        except CircuitOpenError:
+            # Not a failed page, the caller retries once the circuit closes
+            raise
+        except Exception as e:
+            print(f"Error on page 1: {str(e)}")
+            print(f"Search URL: {search_url}")
+            return
+
+        if not links:
+            return
+
+        yield links
+        total_results = self._extract_total_results(soup)
+        if total_results > len(links):
+            yield from self._search_remaining_pages(
+                search_term, len(links), total_results
+            )
+        else:
+            yield from self._search_serially(search_term, len(links))
+
+    def _search_remaining_pages(
+        self, search_term: str, page_size: int, total_results: int
+    ) -> Iterator[list]:
+        last_offset = min(total_results, self.MAX_SEARCH_RESULTS)
+        page_urls = [
+            self._get_next_url(offset, search_term)
+            for offset in range(page_size, last_offset, page_size)
+        ]
+        for links in self.map_concurrently(self._get_page_links, page_urls):
+            if links:
+                yield links
+
+    def _search_serially(self, search_term: str, total_links: int) -> Iterator[list]:
+        page_number = 2
+        search_url = self._get_next_url(total_links, search_term)
+        has_next = search_term != ""
+
         while has_next:
             try:
-                resp = self.retry_request(search_url, self.headers())
-                html_content = resp.text if resp.text else ""
+                html_content = self._get_page_html(search_url)
 
                 if not html_content:
                     break
 
-                links = self._extract_links(html_content)
+                links = self._extract_links(parse_html(html_content))
 
                 if not links:
                     break
 
-                all_links.extend(links)
+                yield links
                 print(f"Page Number {page_number}")
                 page_number += 1
                 total_links = total_links + len(links)
                 search_url = self._get_next_url(total_links, search_term)
-                has_next = search_term != ""
 
+            except CircuitOpenError:
+                raise
             except Exception as e:
                 print(f"Error on page {page_number}: {str(e)}")
                 print(f"Search URL: {search_url}")
                 break
 
-        return all_links
-
-    def scrape_data(self, url: str) -> dict:
+    def _get_page_links(self, search_url: str) -> list:
+        try:
+            html_content = self._get_page_html(search_url)
+            return self._extract_links(parse_html(html_content)) if html_content else []
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            print(f"Error on search page {search_url}: {str(e)}")
+            return []
+
+    def _get_page_html(self, url: str) -> str:
         resp = self.retry_request(url, self.headers())
-        html_content = resp.content
-        soup = BeautifulSoup(html_content, "html.parser")
+        return resp.text if resp.text else ""
+
+    def _extract_total_results(self, soup) -> int:
+        quantity = soup.select_one(".ui-search-search-result__quantity-results")
+        if not quantity:
+            return 0
+        digits = "".join(c for c in quantity.get_text() if c.isdigit())
+        return int(digits) if digits else 0
+
+    def scrape_data(self, url: str, only_if_modified: bool = False) -> dict:
+        resp = self.fetch_page(url, self.headers(), only_if_modified)
+        return self.parse_product(url, resp)
+
+    def parse_product(self, url: str, response) -> dict:
+        html_content = response.content
+        soup = parse_html(html_content)
         title = self._extract_title(soup)
         price = self._extract_price(soup)
         description = self._extract_description(soup)
@@ -145,7 +215,7 @@ class MercadoLivreScraper(ScraperInterface, RequestScraper, RotatingUserAgentMix
             return None
 
     def update_data(self, product: dict) -> dict:
-        data = self.scrape_data(product["url"])
+        data = self.scrape_data(product["url"], only_if_modified=True)
         return {**product, **data}
 
     def __str__(self):
@@ -1,10 +1,13 @@
-import html
-import json
-
 from urllib.parse import quote_plus
-from bs4 import BeautifulSoup
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any
 
+from src.product_scrapers.scrapers.base.async_requests_scraper import (
+    AsyncRequestScraper,
+)
+from src.product_scrapers.scrapers.base.parsers import (
+    extract_attribute_json,
+    extract_script_json,
+)
 from src.product_scrapers.scrapers.base.requests_scraper import RequestScraper
 from src.product_scrapers.scrapers.interfaces.scraper_interface import ScraperInterface
 from src.product_scrapers.scrapers.mixins.rotating_user_agent_mixin import (
@@ -12,7 +15,12 @@ from src.product_scrapers.scrapers.mixins.rotating_user_agent_mixin import (
 )
 
 
-class OLXScraper(ScraperInterface, RequestScraper, RotatingUserAgentMixin):
+class OLXScraper(
+    ScraperInterface, RequestScraper, AsyncRequestScraper, RotatingUserAgentMixin
+):
+    source_website_name = "olx"
+    supports_harvest = True
+
     def __init__(self):
         super().__init__()
         self.BASE_URL = "https://www.olx.com.br/brasil"
@@ -31,9 +39,15 @@ class OLXScraper(ScraperInterface, RequestScraper, RotatingUserAgentMixin):
             custom_headers["User-Agent"] = random_user_agent
         return custom_headers
 
-    def search(self, search_term: str) -> List[str]:
+    def search(self, search_term: str) -> Iterator[List[str]]:
+        yield from self._search_pages(search_term, self._extract_links)
+
+    def harvest(self, search_term: str) -> Iterator[List[Dict[str, Any]]]:
+        yield from self._search_pages(search_term, self._extract_records)
+
+    def _search_pages(self, search_term: str, extract) -> Iterator[List[Any]]:
         page_number = 1
-        results = []
+        found_results = False
 
         while True:
             search_url = self._build_search_url(search_term, page_number)
@@ -44,38 +58,32 @@ class OLXScraper(ScraperInterface, RequestScraper, RotatingUserAgentMixin):
                 break
 
             try:
-                links = self._extract_links(html_content)
+                items = extract(html_content)
 
-                if not links:
+                if not items:
                     break
             except Exception as e:
                 print(f"Error extracting links: {e}")
                 break
 
-            results.extend(links)
+            found_results = True
+            yield items
             page_number += 1
 
-        if not results:
+        if not found_results:
             raise Exception("No results found")
 
-        return results
+    def scrape_data(self, url: str, only_if_modified: bool = False) -> Dict[str, Any]:
+        resp = self.fetch_page(url, self.headers(), only_if_modified)
+        return self.parse_product(url, resp)
 
-    def scrape_data(self, url: str) -> Dict[str, Any]:
-        resp = self.retry_request(url, self.headers())
-        html_content = resp.content
-        soup = BeautifulSoup(html_content, "html.parser")
-        json_data = self._extract_json_data(soup)
+    def parse_product(self, url: str, response) -> Dict[str, Any]:
+        json_data = self._extract_json_data(response.content)
 
         title = json_data.get("subject")
         description = json_data.get("body")
         source_product_code = f"OLX - {json_data.get('listId')}"
-        price = (
-            json_data.get("priceValue", "")
-            .replace("R$", "")
-            .replace(".", "")
-            .replace(",", ".")
-            .strip()
-        )
+        price = self._parse_price(json_data.get("priceValue", ""))
         images = json_data.get("images", [])
         image_url = images[0].get("original", "") if images else ""
         seller_name = json_data.get("user", {}).get("name")
@@ -97,7 +105,7 @@ class OLXScraper(ScraperInterface, RequestScraper, RotatingUserAgentMixin):
         }
 
     def update_data(self, product: Dict[str, Any]) -> Dict[str, Any]:
-        data = self.scrape_data(product["url"])
+        data = self.scrape_data(product["url"], only_if_modified=True)
         if "id" in product:
             data["id"] = product["id"]
         return data
@@ -106,36 +114,64 @@ class OLXScraper(ScraperInterface, RequestScraper, RotatingUserAgentMixin):
         encoded_search = quote_plus(search_term.encode("utf-8"))
         return f"{self.BASE_URL}?q={encoded_search}&o={page_number}"
 
-    def _extract_links(self, html_content: str) -> List[str]:
-        soup = BeautifulSoup(html_content, "html.parser")
-        urls = []
-
+    def _extract_ads(self, html_content: str) -> List[Dict[str, Any]]:
         # json_str = document.getElementById("__NEXT_DATA__").innerHTML
-        data_element = soup.find("script", {"id": "__NEXT_DATA__"})
+        data = extract_script_json(html_content, "__NEXT_DATA__")
 
-        if not data_element:
+        if not data:
             raise Exception("No data found")
 
-        data = json.loads(data_element.string)
         ads_data = data.get("props", {}).get("pageProps", {}).get("ads")
 
         if not ads_data:
             raise Exception("No ads data found")
 
-        for ad in ads_data:
-            url = ad.get("url")
+        return ads_data
 
-            if url and url not in urls:
-                urls.append(url)
+    def _extract_links(self, html_content: str) -> List[str]:
+        # dict keeps insertion order, so this dedups in O(n) while preserving ranking
+        urls = dict.fromkeys(ad.get("url") for ad in self._extract_ads(html_content))
+        urls.pop(None, None)
+        urls.pop("", None)
+        return list(urls)
+
+    def _extract_records(self, html_content: str) -> List[Dict[str, Any]]:
+        records = {}
+        for ad in self._extract_ads(html_content):
+            if ad.get("url"):
+                records.setdefault(ad["url"], self._ad_to_record(ad))
+        return list(records.values())
+
+    def _ad_to_record(self, ad: Dict[str, Any]) -> Dict[str, Any]:
+        # Search ads carry no description or seller, and the location only
+        # when OLX sends locationDetails
+        price = self._parse_price(ad.get("priceValue") or ad.get("price") or "")
+        location = ad.get("locationDetails") or {}
+        images = ad.get("images") or []
+
+        return {
+            "url": ad["url"],
+            "title": ad.get("subject") or ad.get("title"),
+            "price": price,
+            "description": None,
+            "source_product_code": f"OLX - {ad.get('listId')}",
+            "city": location.get("municipality"),
+            "state": location.get("uf"),
+            "seller_name": None,
+            "is_available": True if price else False,
+            "image_urls": images[0].get("original", "") if images else "",
+            "source_metadata": {},
+        }
 
-        return urls
+    @staticmethod
+    def _parse_price(price: str) -> str:
+        return str(price).replace("R$", "").replace(".", "").replace(",", ".").strip()
 
-    def _extract_json_data(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        script = soup.find("script", {"id": "initial-data"})
-        if not script:
+    def _extract_json_data(self, html_content) -> Dict[str, Any]:
+        data = extract_attribute_json(html_content, "initial-data", "data-json")
+        if not data:
             return {}
-        decoded_data = html.unescape(script["data-json"])
-        return json.loads(decoded_data).get("ad", {})
+        return data.get("ad", {})
 
     def __str__(self):
         return "OLX Scraper"
@@ -0,0 +1,35 @@
+from sqlalchemy import text
+
+from src.app.infrastructure.database_config import SessionLocal
+
+BACKFILL_CURRENT_PRICE_SQL = text(
+    """
+    UPDATE products
+    SET current_price = latest.price, current_price_at = latest.created_at
+    FROM (
+        SELECT DISTINCT ON (product_id) product_id, price, created_at
+        FROM price_history
+        WHERE product_id IN (SELECT id FROM products WHERE current_price_at IS NULL)
+        ORDER BY product_id, created_at DESC, id DESC
+    ) AS latest
+    WHERE products.id = latest.product_id
+    """
+)
+
+
+def backfill_current_price(db) -> int:
+    result = db.execute(BACKFILL_CURRENT_PRICE_SQL)
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        updated = backfill_current_price(db)
+        db.commit()
+        print(f"Current price backfilled for {updated} products.")
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
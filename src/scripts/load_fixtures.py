@@ -1,5 +1,6 @@
 import argparse
 from src.app.fixtures.fixtures import get_fixtures
+from src.scripts.backfill_current_price import backfill_current_price
 from src.app.infrastructure.database_config import SessionLocal
 from src.app.infrastructure.database.models.source_website_model import SourceWebsite
 from src.app.infrastructure.database.models.product_model import Product
@@ -58,6 +59,8 @@ def load_fixtures(selected_fixtures):
 
         if "price_history" in selected_fixtures:
             db.bulk_insert_mappings(PriceHistory, data["price_history"])
+            # Bulk inserts bypass the repository, so sync products.current_price
+            backfill_current_price(db)
 
         if "search_configs" in selected_fixtures:
             search_configs_data = []
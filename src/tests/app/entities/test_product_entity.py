@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from src.app.entities.product import Product
+from src.app.entities.product import Product, compute_content_fingerprint
 
 
 def test_product_minimal_fields():
@@ -52,3 +52,29 @@ def test_product_defaults_are_independent():
     p1 = Product(url="a", title="b", source_website_id=1)
     p2 = Product(url="c", title="d", source_website_id=2)
     assert p1.created_at != p2.created_at or p1.updated_at != p2.updated_at
+
+
+def test_content_fingerprint_normalizes_whitespace_and_price():
+    scraped = {"title": "  Old   book ", "price": "10.5", "is_available": True}
+    stored = {"title": "Old book", "price": 10.50, "is_available": True}
+
+    assert compute_content_fingerprint(scraped) == compute_content_fingerprint(stored)
+
+
+def test_content_fingerprint_changes_with_price():
+    assert compute_content_fingerprint({"price": "10.00"}) != (
+        compute_content_fingerprint({"price": "10.01"})
+    )
+
+
+def test_product_content_fingerprint_uses_current_price():
+    product = Product(
+        url="http://example.com", title="Book", source_website_id=1, current_price=5
+    )
+
+    assert product.compute_content_fingerprint() == compute_content_fingerprint(
+        {"title": "Book", "price": 5, "is_available": True}
+    )
+    assert product.compute_content_fingerprint(6) != (
+        product.compute_content_fingerprint()
+    )
@@ -32,6 +32,23 @@ def test_create_price_history_success(repo, mock_db):
     assert isinstance(created_entity.created_at, datetime)
 
 
+def test_create_price_history_syncs_product_current_price(repo, mock_db):
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    price_history_entity = PriceHistoryEntity.PriceHistory(
+        product_id=1, price=10.50, created_at=created_at
+    )
+    repo.create(price_history_entity)
+    mock_update = mock_db.query.return_value.filter.return_value.update
+    # Only the product row; the stats snapshot is left to its age-based refresh
+    assert mock_update.call_count == 1
+    values = mock_update.call_args_list[0][0][0]
+    assert {column.key: value for column, value in values.items()} == {
+        "current_price": 10.50,
+        "current_price_at": created_at,
+    }
+    mock_db.commit.assert_called_once()
+
+
 def test_create_price_history_exception(repo, mock_db, mocker):
     price_history_entity = PriceHistoryEntity.PriceHistory(product_id=1, price=10.50)
     mock_db.add.side_effect = Exception("fail")
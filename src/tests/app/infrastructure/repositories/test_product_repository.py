@@ -1,8 +1,15 @@
 from datetime import datetime, timezone
+from decimal import Decimal
 import pytest
 from unittest.mock import MagicMock
 
-from src.app.infrastructure.repositories.product_repository import ProductRepository
+from sqlalchemy.dialects import postgresql
+
+from src.app.infrastructure.repositories.product_repository import (
+    ProductRepository,
+    encode_cursor,
+    decode_cursor,
+)
 from src.app.entities.product import Product as ProductEntity
 from src.app.infrastructure.database.models.product_model import Product as ProductModel
 from src.app.infrastructure.database.models.product_model import ProductCondition
@@ -54,6 +61,8 @@ def test_create_product(repo, mock_db, product_entity, mocker):
     assert isinstance(mock_db.add.call_args[0][0], ProductModel)
     mock_db.commit.assert_called_once()
     mock_db.refresh.assert_called_once_with(mock_db.add.call_args[0][0])
+    # Writes leave the stats snapshot row alone
+    mock_db.query.assert_not_called()
 
     assert isinstance(created_product, ProductEntity)
     assert created_product.id == product_entity.id
@@ -83,14 +92,7 @@ def test_get_all_products(repo, mock_db, product_entity, mocker):
         source_metadata=product_entity.source_metadata,
         created_at=product_entity.created_at,
         updated_at=product_entity.updated_at,
-        price_history=[
-            mocker.Mock(
-                id=1,
-                price=product_entity.current_price,
-                product_id=product_entity.id,
-                created_at=datetime.now(timezone.utc),
-            )
-        ],
+        current_price=product_entity.current_price,
     )
 
     mock_db_product_model.__dict__ = {
@@ -109,10 +111,10 @@ def test_get_all_products(repo, mock_db, product_entity, mocker):
         "source_metadata": mock_db_product_model.source_metadata,
         "created_at": mock_db_product_model.created_at,
         "updated_at": mock_db_product_model.updated_at,
-        "price_history": mock_db_product_model.price_history,
+        "current_price": mock_db_product_model.current_price,
     }
 
-    mock_db.query.return_value.options.return_value.limit.return_value.offset.return_value.all.return_value = [
+    mock_db.query.return_value.limit.return_value.offset.return_value.all.return_value = [
         mock_db_product_model
     ]
     mock_db.query.return_value.count.return_value = 1
@@ -120,7 +122,7 @@ def test_get_all_products(repo, mock_db, product_entity, mocker):
     products, total = repo.get_all(offset=0, limit=10)
 
     mock_db.query.assert_called_once()
-    mock_db.query().options.assert_called_once()
+    mock_db.query().options.assert_not_called()
 
     assert len(products) == 1
     assert total == 1
@@ -150,14 +152,7 @@ def test_get_by_id_found(repo, mock_db, product_entity, mocker):
         source_metadata=product_entity.source_metadata,
         created_at=product_entity.created_at,
         updated_at=product_entity.updated_at,
-        price_history=[
-            mocker.Mock(
-                id=1,
-                price=product_entity.current_price,
-                product_id=product_entity.id,
-                created_at=datetime.now(timezone.utc),
-            )
-        ],
+        current_price=product_entity.current_price,
     )
 
     mock_db_product_model.__dict__.update(
@@ -177,20 +172,19 @@ def test_get_by_id_found(repo, mock_db, product_entity, mocker):
             "source_metadata": mock_db_product_model.source_metadata,
             "created_at": mock_db_product_model.created_at,
             "updated_at": mock_db_product_model.updated_at,
-            "price_history": mock_db_product_model.price_history,
+            "current_price": mock_db_product_model.current_price,
         }
     )
 
     mock_query_result = mock_db.query.return_value
-    mock_options_result = mock_query_result.options.return_value
-    mock_filter_result = mock_options_result.filter.return_value
+    mock_filter_result = mock_query_result.filter.return_value
     mock_filter_result.first.return_value = mock_db_product_model
 
     found_product = repo.get_by_id(product_entity.id)
 
     mock_db.query.assert_called_once_with(ProductModel)
-    mock_query_result.options.assert_called_once()
-    mock_options_result.filter.assert_called_once()
+    mock_query_result.options.assert_not_called()
+    mock_query_result.filter.assert_called_once()
 
     assert found_product is not None
     assert isinstance(found_product, ProductEntity)
@@ -205,16 +199,14 @@ def test_get_by_id_found(repo, mock_db, product_entity, mocker):
 
 def test_get_by_id_not_found(repo, mock_db, mocker):
     mock_query_result = mock_db.query.return_value
-    mock_options_result = mock_query_result.options.return_value
-    mock_filter_result = mock_options_result.filter.return_value
+    mock_filter_result = mock_query_result.filter.return_value
     mock_filter_result.first.return_value = None
 
     non_existent_id = 999
     found_product = repo.get_by_id(non_existent_id)
 
     mock_db.query.assert_called_once_with(ProductModel)
-    mock_query_result.options.assert_called_once()
-    mock_options_result.filter.assert_called_once()
+    mock_query_result.filter.assert_called_once()
     mock_filter_result.first.assert_called_once()
 
     assert found_product is None
@@ -238,14 +230,7 @@ def test_update_product(repo, mock_db, product_entity, mocker):
         source_metadata=product_entity.source_metadata,
         created_at=product_entity.created_at,
         updated_at=product_entity.updated_at,
-        price_history=[
-            mocker.Mock(
-                id=1,
-                price=product_entity.current_price,
-                product_id=product_entity.id,
-                created_at=datetime.now(timezone.utc),
-            )
-        ],
+        current_price=product_entity.current_price,
     )
 
     mock_db_product_model.__dict__.update(
@@ -265,7 +250,7 @@ def test_update_product(repo, mock_db, product_entity, mocker):
             "source_metadata": mock_db_product_model.source_metadata,
             "created_at": mock_db_product_model.created_at,
             "updated_at": mock_db_product_model.updated_at,
-            "price_history": mock_db_product_model.price_history,
+            "current_price": mock_db_product_model.current_price,
         }
     )
 
@@ -361,10 +346,10 @@ def test_delete_product(repo, mock_db, product_entity, mocker):
     )
     deleted_successfully = repo.delete(product_entity.id)
 
-    mock_db.query.assert_called_once_with(ProductModel)
-    mock_db.query().filter.assert_called_once()
+    mock_db.query.assert_any_call(ProductModel)
     mock_db.query().filter().first.assert_called_once()
     mock_db.delete.assert_called_once_with(mock_db_product_model)
+    mock_db.query().filter().update.assert_called_once()
     mock_db.commit.assert_called_once()
 
     assert deleted_successfully is True
@@ -381,3 +366,438 @@ def test_delete_product_not_found(repo, mock_db, mocker):
     mock_db.commit.assert_not_called()
 
     assert deleted_successfully is False
+
+
+def test_bulk_upsert_products(repo, mock_db, product_entity, mocker):
+    new_product = product_entity.model_copy(
+        update={"id": None, "url": "http://example.com/new-product"}
+    )
+    mock_db.execute.return_value.all.return_value = [
+        mocker.Mock(id=1, url=product_entity.url, inserted=False),
+        mocker.Mock(id=2, url=new_product.url, inserted=True),
+    ]
+
+    mock_db.query.return_value.filter.return_value.all.return_value = [
+        (product_entity.url, product_entity.current_price)
+    ]
+
+    result = repo.bulk_upsert([product_entity, new_product])
+
+    assert result == {"created": [2], "updated": [1]}
+    assert mock_db.execute.call_count == 2
+    price_stmt = mock_db.execute.call_args_list[1][0][0]
+    assert price_stmt.table.name == "price_history"
+    # Only the new product gets a price row, the existing one kept its price
+    assert len(price_stmt._multi_values[0]) == 1
+    mock_db.commit.assert_called_once()
+
+
+def test_bulk_upsert_products_records_price_change_on_conflict(
+    repo, mock_db, product_entity, mocker
+):
+    mock_db.query.return_value.filter.return_value.all.return_value = [
+        (product_entity.url, Decimal("150.00"))
+    ]
+    mock_db.execute.return_value.all.return_value = [
+        mocker.Mock(id=1, url=product_entity.url, inserted=False),
+    ]
+
+    repo.bulk_upsert([product_entity])
+
+    upsert_stmt = mock_db.execute.call_args_list[0][0][0]
+    sql = str(upsert_stmt.compile(dialect=postgresql.dialect()))
+    assert "current_price = CASE WHEN" in sql
+    price_stmt = mock_db.execute.call_args_list[1][0][0]
+    assert price_stmt.table.name == "price_history"
+    assert len(price_stmt._multi_values[0]) == 1
+
+
+def test_bulk_upsert_products_deduplicates_urls(repo, mock_db, product_entity):
+    mock_db.execute.return_value.all.return_value = []
+
+    repo.bulk_upsert([product_entity, product_entity])
+
+    upsert_stmt = mock_db.execute.call_args_list[0][0][0]
+    assert len(upsert_stmt._multi_values[0]) == 1
+    mock_db.commit.assert_called_once()
+
+
+def test_bulk_upsert_products_empty(repo, mock_db):
+    assert repo.bulk_upsert([]) == {"created": [], "updated": []}
+    mock_db.execute.assert_not_called()
+    mock_db.commit.assert_not_called()
+
+
+def test_bulk_upsert_products_rollback_on_error(repo, mock_db, product_entity):
+    mock_db.execute.side_effect = Exception("db error")
+
+    with pytest.raises(Exception):
+        repo.bulk_upsert([product_entity])
+
+    mock_db.rollback.assert_called_once()
+    mock_db.commit.assert_not_called()
+
+
+def test_bulk_update_products(repo, mock_db, product_entity):
+    unchanged = product_entity.model_copy(update={"id": 2, "current_price": 50.0})
+    missing = product_entity.model_copy(update={"id": 3})
+    mock_db.query.return_value.filter.return_value.all.return_value = [
+        (product_entity.id, 100.0, None),
+        (unchanged.id, 50.0, None),
+    ]
+
+    result = repo.bulk_update([product_entity, unchanged, missing])
+
+    assert result == {
+        "updated": [product_entity.id, unchanged.id],
+        "prices_changed": [product_entity.id],
+        "unchanged": [],
+        "not_found": [missing.id],
+    }
+    assert mock_db.execute.call_count == 2
+    update_rows = mock_db.execute.call_args_list[0][0][1]
+    assert [row["id"] for row in update_rows] == [product_entity.id, unchanged.id]
+    assert update_rows[0]["current_price"] == product_entity.current_price
+    assert "current_price_at" in update_rows[0]
+    assert "current_price" not in update_rows[1]
+    price_stmt = mock_db.execute.call_args_list[1][0][0]
+    assert price_stmt.table.name == "price_history"
+    mock_db.commit.assert_called_once()
+
+
+def test_bulk_update_products_without_price_changes(repo, mock_db, product_entity):
+    mock_db.query.return_value.filter.return_value.all.return_value = [
+        (product_entity.id, product_entity.current_price, None),
+    ]
+
+    result = repo.bulk_update([product_entity])
+
+    assert result["prices_changed"] == []
+    mock_db.execute.assert_called_once()
+    mock_db.commit.assert_called_once()
+
+
+def test_bulk_update_products_skips_unchanged_fingerprint(repo, mock_db):
+    scraped = ProductEntity(
+        id=1,
+        url="http://example.com/product/1",
+        title="Sample Product",
+        description="Sample",
+        source_product_code="OLX - 1",
+        city="Curitiba",
+        state="PR",
+        seller_name="Seller",
+        is_available=True,
+        image_urls="http://example.com/1.jpg",
+        source_website_id=1,
+        current_price=10.0,
+    )
+    mock_db.query.return_value.filter.return_value.all.return_value = [
+        (1, 10.0, scraped.compute_content_fingerprint(), scraped.url, 1, None, None),
+    ]
+
+    result = repo.bulk_update([scraped])
+
+    assert result["updated"] == []
+    assert result["unchanged"] == [1]
+    # Only marked as checked, without bumping updated_at
+    mock_db.execute.assert_called_once()
+    touch_stmt = mock_db.execute.call_args[0][0]
+    assert {c.key for c in touch_stmt._values} == {"last_checked_at", "updated_at"}
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [{"condition": ProductCondition.NEW}, {"source_metadata": {"b": 2}}],
+)
+def test_bulk_update_products_saves_changes_outside_fingerprint(repo, mock_db, changes):
+    stored = ProductEntity(
+        id=1,
+        url="http://example.com/product/1",
+        title="Sample Product",
+        description="Sample",
+        source_product_code="OLX - 1",
+        city="Curitiba",
+        state="PR",
+        condition=ProductCondition.USED,
+        seller_name="Seller",
+        is_available=True,
+        image_urls="http://example.com/1.jpg",
+        source_website_id=1,
+        source_metadata={"a": 1},
+        current_price=10.0,
+    )
+    scraped = ProductEntity(**{**stored.model_dump(), **changes})
+    mock_db.query.return_value.filter.return_value.all.return_value = [
+        (
+            1,
+            10.0,
+            stored.compute_content_fingerprint(),
+            stored.url,
+            1,
+            ProductCondition.USED,
+            {"a": 1},
+        ),
+    ]
+
+    result = repo.bulk_update([scraped])
+
+    assert result["updated"] == [1]
+    assert result["unchanged"] == []
+    update_rows = mock_db.execute.call_args_list[0][0][1]
+    for field, value in changes.items():
+        assert update_rows[0][field] == value
+
+
+def test_bulk_update_products_marks_unchanged_ids_checked(repo, mock_db):
+    result = repo.bulk_update([], unchanged_ids=[4, 5])
+
+    assert result["unchanged"] == [4, 5]
+    mock_db.query.assert_not_called()
+    mock_db.execute.assert_called_once()
+    mock_db.commit.assert_called_once()
+
+
+def test_bulk_update_products_partial_payload_clears_fingerprint(
+    repo, mock_db, product_entity
+):
+    partial = ProductEntity(
+        id=product_entity.id,
+        url=product_entity.url,
+        title="New title",
+        source_website_id=1,
+    )
+    mock_db.query.return_value.filter.return_value.all.return_value = [
+        (product_entity.id, 100.0, "abc"),
+    ]
+
+    repo.bulk_update([partial])
+
+    update_rows = mock_db.execute.call_args_list[0][0][1]
+    assert update_rows[0]["content_fingerprint"] is None
+
+
+def test_bulk_update_products_rollback_on_error(repo, mock_db, product_entity):
+    mock_db.query.return_value.filter.return_value.all.return_value = [
+        (product_entity.id, None, None),
+    ]
+    mock_db.execute.side_effect = Exception("db error")
+
+    with pytest.raises(Exception):
+        repo.bulk_update([product_entity])
+
+    mock_db.rollback.assert_called_once()
+
+
+def test_get_existing_urls(repo, mock_db):
+    mock_filter = mock_db.query.return_value.filter.return_value
+    mock_filter.filter.return_value.all.return_value = [("http://example.com/a",)]
+
+    urls = repo.get_existing_urls(
+        ["http://example.com/a", "http://example.com/b"], source_website_id=1
+    )
+
+    mock_db.query.assert_called_once_with(ProductModel.url)
+    mock_filter.filter.assert_called_once()
+    assert urls == ["http://example.com/a"]
+
+
+def test_get_existing_urls_without_source_website(repo, mock_db):
+    mock_filter = mock_db.query.return_value.filter.return_value
+    mock_filter.all.return_value = []
+
+    assert repo.get_existing_urls(["http://example.com/a"]) == []
+    mock_filter.filter.assert_not_called()
+
+
+def test_get_existing_urls_empty(repo, mock_db):
+    assert repo.get_existing_urls([]) == []
+    mock_db.query.assert_not_called()
+
+
+def test_encode_decode_cursor():
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor("created_at", created_at, 42)
+    assert decode_cursor(cursor, "created_at") == (created_at, 42)
+
+
+def test_decode_cursor_invalid():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", "id")
+
+
+def test_decode_cursor_sort_mismatch():
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("title", "abc", 1), "id")
+
+
+def _mock_db_product(mocker, product_id):
+    db_product = mocker.Mock(id=product_id)
+    db_product.__dict__.update(
+        {
+            "id": product_id,
+            "url": f"http://example.com/{product_id}",
+            "title": f"Product {product_id}",
+            "source_website_id": 1,
+        }
+    )
+    return db_product
+
+
+def test_get_all_by_cursor_first_page(repo, mock_db, mocker):
+    query = mock_db.query.return_value
+    query.count.return_value = 3
+    query.order_by.return_value.limit.return_value.all.return_value = [
+        _mock_db_product(mocker, product_id) for product_id in (1, 2, 3)
+    ]
+
+    products, total, next_cursor = repo.get_all_by_cursor(limit=2)
+
+    query.filter.assert_not_called()
+    query.order_by.return_value.limit.assert_called_once_with(3)
+    assert [p.id for p in products] == [1, 2]
+    assert total == 3
+    assert decode_cursor(next_cursor, "id") == (2, 2)
+
+
+def test_get_all_by_cursor_last_page_without_total(repo, mock_db, mocker):
+    query = mock_db.query.return_value
+    filtered = query.filter.return_value
+    filtered.order_by.return_value.limit.return_value.all.return_value = [
+        _mock_db_product(mocker, 3)
+    ]
+
+    products, total, next_cursor = repo.get_all_by_cursor(
+        limit=2, cursor=encode_cursor("id", 2, 2), include_total=False
+    )
+
+    query.filter.assert_called_once()
+    query.count.assert_not_called()
+    assert [p.id for p in products] == [3]
+    assert total is None
+    assert next_cursor is None
+
+
+def test_get_all_by_cursor_unsupported_sort(repo):
+    with pytest.raises(ValueError):
+        repo.get_all_by_cursor(sort_by="description")
+
+
+def test_filter_products_by_cursor(repo, mock_db, mocker):
+    query = mock_db.query.return_value
+    query.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+        _mock_db_product(mocker, product_id) for product_id in (1, 2)
+    ]
+
+    products, next_cursor = repo.filter_products_by_cursor(
+        {"title": "Product"}, limit=1
+    )
+
+    assert [p.id for p in products] == [1]
+    assert decode_cursor(next_cursor, "id") == (1, 1)
+
+
+def test_filter_products_by_price_range(repo, mock_db):
+    query = mock_db.query.return_value
+    query.filter.return_value.filter.return_value.limit.return_value.offset.return_value.all.return_value = []
+
+    products = repo.filter_products(
+        {"min_price": 10.0, "max_price": 50.0}, limit=10, offset=0
+    )
+
+    assert products == []
+    min_clause = query.filter.call_args[0][0]
+    max_clause = query.filter.return_value.filter.call_args[0][0]
+    assert min_clause.left.name == "current_price"
+    assert max_clause.left.name == "current_price"
+    query.options.assert_not_called()
+
+
+def test_filter_products_by_source_website(repo, mock_db):
+    query = mock_db.query.return_value
+    query.filter.return_value.limit.return_value.offset.return_value.all.return_value = []
+
+    repo.filter_products({"source_website_id": 3}, limit=10, offset=0)
+
+    clause = query.filter.call_args[0][0]
+    assert clause.left.name == "source_website_id"
+    assert clause.right.value == 3
+
+
+def test_filter_products_by_checked_before(repo, mock_db):
+    query = mock_db.query.return_value
+    query.filter.return_value.limit.return_value.offset.return_value.all.return_value = []
+
+    repo.filter_products({"checked_before": datetime(2026, 1, 1)}, limit=10, offset=0)
+
+    sql = str(query.filter.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert "coalesce(products.last_checked_at, products.updated_at) <=" in sql
+
+
+def test_get_minimal_products(repo, mock_db, mocker):
+    mock_db.query.return_value.limit.return_value.offset.return_value.all.return_value = [
+        mocker.Mock(id=1, title="A", url="http://a", current_price=Decimal("9.90")),
+        mocker.Mock(id=2, title="B", url="http://b", current_price=None),
+    ]
+
+    products = repo.get_minimal_products(limit=10, offset=0)
+
+    assert products == [
+        {"id": 1, "title": "A", "url": "http://a", "current_price": 9.9},
+        {"id": 2, "title": "B", "url": "http://b", "current_price": None},
+    ]
+
+
+def test_get_product_stats_single_query(repo, mock_db):
+    mock_db.query.return_value.one.return_value = (
+        4,
+        3,
+        Decimal("60.00"),
+        Decimal("10.00"),
+        Decimal("30.00"),
+    )
+
+    stats = repo.get_product_stats()
+
+    mock_db.query.assert_called_once()
+    assert stats == {
+        "total_products": 4,
+        "average_price": 20.0,
+        "min_price": 10.0,
+        "max_price": 30.0,
+    }
+
+
+def test_get_product_stats_empty(repo, mock_db):
+    mock_db.query.return_value.one.return_value = (0, 0, 0, None, None)
+
+    assert repo.get_product_stats() == {
+        "total_products": 0,
+        "average_price": 0.0,
+        "min_price": 0.0,
+        "max_price": 0.0,
+    }
+
+
+def test_refresh_product_stats_snapshot(repo, mock_db):
+    mock_db.query.return_value.one.return_value = (
+        2,
+        2,
+        Decimal("30.00"),
+        Decimal("10.00"),
+        Decimal("20.00"),
+    )
+
+    stats = repo.refresh_product_stats_snapshot()
+
+    mock_db.execute.assert_called_once()
+    mock_db.commit.assert_called_once()
+    assert stats["average_price"] == 15.0
+    assert stats["is_stale"] is False
+    assert stats["refreshed_at"] is not None
+
+
+def test_get_product_stats_snapshot_missing(repo, mock_db):
+    mock_db.query.return_value.filter.return_value.first.return_value = None
+
+    assert repo.get_product_stats_snapshot() is None
@@ -1,9 +1,20 @@
+import asyncio
+
 import pytest
 from unittest.mock import patch, MagicMock
 from fastapi import HTTPException
 from jose import JWTError
 
+from src.app.entities.user import User as UserEntity
 from src.app.security import auth
+from src.app.security.user_cache import user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    user_cache.clear()
+    yield
+    user_cache.clear()
 
 
 @pytest.fixture
@@ -87,3 +98,42 @@ async def test_get_current_active_user_inactive():
     with pytest.raises(HTTPException) as exc:
         await auth.get_current_active_user(user)
     assert exc.value.status_code == 400
+
+
+@patch("src.app.security.auth.jwt.decode")
+@patch("src.app.security.auth.UserRepository")
+def test_get_current_user_serves_repeat_lookups_from_cache(
+    mock_user_repo_cls, mock_jwt_decode, credentials, db
+):
+    mock_jwt_decode.return_value = {"sub": "john"}
+    user = UserEntity(
+        id=1, username="john", email="john@example.com", hashed_password="x"
+    )
+    mock_user_repo_cls.return_value.get_by_username.return_value = user
+
+    first = asyncio.run(auth.get_current_user(credentials, db))
+    second = asyncio.run(auth.get_current_user(credentials, db))
+
+    assert first == user
+    assert second == user
+    mock_user_repo_cls.return_value.get_by_username.assert_called_once_with(
+        username="john"
+    )
+    assert user_cache.stats()["hits"] == 1
+    assert user_cache.stats()["misses"] == 1
+
+
+@patch("src.app.security.auth.jwt.decode")
+@patch("src.app.security.auth.UserRepository")
+def test_get_current_user_does_not_cache_unknown_user(
+    mock_user_repo_cls, mock_jwt_decode, credentials, db
+):
+    mock_jwt_decode.return_value = {"sub": "ghost"}
+    mock_user_repo_cls.return_value.get_by_username.return_value = None
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            asyncio.run(auth.get_current_user(credentials, db))
+
+    assert mock_user_repo_cls.return_value.get_by_username.call_count == 2
+    assert user_cache.stats()["misses"] == 2
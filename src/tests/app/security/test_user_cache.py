@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+from src.app.entities.user import User as UserEntity
+from src.app.security.user_cache import UserCache
+
+
+def make_user(user_id=1, username="john"):
+    return UserEntity(
+        id=user_id,
+        username=username,
+        email=f"{username}@example.com",
+        hashed_password="hashed",
+    )
+
+
+def test_get_counts_hits_and_misses():
+    cache = UserCache(maxsize=10, ttl_seconds=60)
+    assert cache.get("john") is None
+    cache.set("john", make_user())
+    assert cache.get("john").username == "john"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_get_returns_copy():
+    cache = UserCache()
+    cache.set("john", make_user())
+    cache.get("john").is_active = False
+    assert cache.get("john").is_active is True
+
+
+def test_entries_expire_after_ttl():
+    cache = UserCache(ttl_seconds=60)
+    with patch("src.app.security.user_cache.time.monotonic", return_value=1000):
+        cache.set("john", make_user())
+    with patch("src.app.security.user_cache.time.monotonic", return_value=1061):
+        assert cache.get("john") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = UserCache(maxsize=2)
+    cache.set("a", make_user(1, "a"))
+    cache.set("b", make_user(2, "b"))
+    cache.get("a")
+    cache.set("c", make_user(3, "c"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_invalidate_by_username_and_user_id():
+    cache = UserCache()
+    cache.set("a", make_user(1, "a"))
+    cache.set("b", make_user(2, "b"))
+    cache.invalidate(username="a")
+    cache.invalidate(user_id=2)
+    assert cache.stats()["size"] == 0
+
+
+def test_disabled_cache_stores_nothing():
+    cache = UserCache(ttl_seconds=0)
+    cache.set("john", make_user())
+    assert cache.get("john") is None
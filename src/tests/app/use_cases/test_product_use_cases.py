@@ -1,16 +1,25 @@
 from unittest.mock import MagicMock
+
+import pytest
 from datetime import datetime, timezone
 
 from src.app.entities.product import Product as ProductEntity
 from src.app.entities.price_history import PriceHistory as PriceHistoryEntity
 from src.app.use_cases.product_use_cases import (
     CreateProductUseCase,
+    BulkUpsertProductsUseCase,
+    BulkUpdateProductsUseCase,
     GetProductByIdUseCase,
     GetProductByUrlUseCase,
+    GetExistingProductUrlsUseCase,
+    ListProductsByCursorUseCase,
+    FilterProductsByCursorUseCase,
     DeleteProductUseCase,
+    GetProductStatsUseCase,
 )
 from src.app.use_cases.product_use_cases import UpdateProductUseCase
 from src.app.interfaces.schemas.product_schema import ProductUpdate
+from src.app.infrastructure.database.models.product_model import ProductCondition
 
 
 def test_create_product_use_case_success_with_initial_price():
@@ -210,6 +219,110 @@ def test_update_product_use_case_success_no_new_price():
     assert result == updated_product_entity
 
 
+def test_update_product_use_case_skips_no_op_update():
+    product_repo_mock = MagicMock()
+    price_history_repo_mock = MagicMock()
+    existing = ProductEntity(
+        id=1,
+        url="http://example.com/product/1",
+        title="Sample Product",
+        source_website_id=1,
+        city="City",
+        state="ST",
+        current_price=10.0,
+    )
+    existing.content_fingerprint = existing.compute_content_fingerprint()
+    product_repo_mock.get_by_id.return_value = existing
+    product_update = ProductUpdate(
+        url=existing.url,
+        title=existing.title,
+        source_website_id=1,
+        city="City",
+        state="ST",
+    )
+
+    use_case = UpdateProductUseCase(product_repo_mock, price_history_repo_mock)
+    result = use_case.execute(1, product_update, new_price=10.0)
+
+    assert result is existing
+    product_repo_mock.update.assert_not_called()
+    price_history_repo_mock.create.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [{"condition": ProductCondition.NEW}, {"source_metadata": {"b": 2}}],
+)
+def test_update_product_use_case_saves_changes_outside_fingerprint(changes):
+    product_repo_mock = MagicMock()
+    price_history_repo_mock = MagicMock()
+    existing = ProductEntity(
+        id=1,
+        url="http://example.com/product/1",
+        title="Sample Product",
+        source_website_id=1,
+        city="City",
+        state="ST",
+        condition=ProductCondition.USED,
+        source_metadata={"a": 1},
+        current_price=10.0,
+    )
+    existing.content_fingerprint = existing.compute_content_fingerprint()
+    product_repo_mock.get_by_id.return_value = existing
+    product_repo_mock.update.return_value = existing
+    product_update = ProductUpdate(
+        **{
+            "url": existing.url,
+            "title": existing.title,
+            "source_website_id": 1,
+            "city": "City",
+            "state": "ST",
+            "condition": ProductCondition.USED,
+            "source_metadata": {"a": 1},
+            **changes,
+        }
+    )
+
+    use_case = UpdateProductUseCase(product_repo_mock, price_history_repo_mock)
+    use_case.execute(1, product_update, new_price=10.0)
+
+    product_repo_mock.update.assert_called_once()
+    saved = product_repo_mock.update.call_args[0][1]
+    for field, value in changes.items():
+        assert getattr(saved, field) == value
+    price_history_repo_mock.create.assert_not_called()
+
+
+def test_update_product_use_case_same_price_adds_no_price_history():
+    product_repo_mock = MagicMock()
+    price_history_repo_mock = MagicMock()
+    existing = ProductEntity(
+        id=1,
+        url="http://example.com/product/1",
+        title="Sample Product",
+        source_website_id=1,
+        city="City",
+        state="ST",
+        current_price=10.0,
+    )
+    product_repo_mock.get_by_id.return_value = existing
+    product_repo_mock.update.return_value = existing
+    product_update = ProductUpdate(
+        url=existing.url,
+        title="New title",
+        source_website_id=1,
+        city="City",
+        state="ST",
+    )
+
+    use_case = UpdateProductUseCase(product_repo_mock, price_history_repo_mock)
+    use_case.execute(1, product_update, new_price=10.0)
+
+    product_repo_mock.update.assert_called_once()
+    assert product_repo_mock.update.call_args[0][1].content_fingerprint is not None
+    price_history_repo_mock.create.assert_not_called()
+
+
 def test_delete_product_use_case_success():
     product_repo_mock = MagicMock()
     product_id_to_delete = 1
@@ -218,3 +331,147 @@ def test_delete_product_use_case_success():
     result = use_case.execute(product_id_to_delete)
     product_repo_mock.delete.assert_called_once_with(product_id_to_delete)
     assert result is True
+
+
+def test_bulk_upsert_products_use_case():
+    product_repo_mock = MagicMock()
+    products = [
+        ProductEntity(
+            url="http://example.com/product/1",
+            title="Sample Product",
+            source_website_id=1,
+            current_price=10.0,
+        )
+    ]
+    product_repo_mock.bulk_upsert.return_value = {"created": [1], "updated": []}
+    use_case = BulkUpsertProductsUseCase(product_repo_mock)
+    result = use_case.execute(products)
+    product_repo_mock.bulk_upsert.assert_called_once_with(products)
+    assert result == {"created": [1], "updated": []}
+
+
+def test_bulk_update_products_use_case():
+    product_repo_mock = MagicMock()
+    products = [
+        ProductEntity(
+            id=1,
+            url="http://example.com/product/1",
+            title="Sample Product",
+            source_website_id=1,
+            current_price=10.0,
+        )
+    ]
+    product_repo_mock.bulk_update.return_value = {
+        "updated": [1],
+        "prices_changed": [1],
+        "not_found": [],
+    }
+    use_case = BulkUpdateProductsUseCase(product_repo_mock)
+    result = use_case.execute(products, [2])
+    product_repo_mock.bulk_update.assert_called_once_with(products, [2])
+    assert result["prices_changed"] == [1]
+
+
+def test_get_existing_product_urls_use_case():
+    product_repo_mock = MagicMock()
+    product_repo_mock.get_existing_urls.return_value = ["http://example.com/a"]
+    use_case = GetExistingProductUrlsUseCase(product_repo_mock)
+    result = use_case.execute(["http://example.com/a", "http://example.com/b"], 1)
+    product_repo_mock.get_existing_urls.assert_called_once_with(
+        ["http://example.com/a", "http://example.com/b"], 1
+    )
+    assert result == ["http://example.com/a"]
+
+
+def test_list_products_by_cursor_use_case():
+    product_repo_mock = MagicMock()
+    product_repo_mock.get_all_by_cursor.return_value = ([], None, None)
+    use_case = ListProductsByCursorUseCase(product_repo_mock)
+    result = use_case.execute(
+        filter_data={"column_filters": {"title": {"value": "x"}}},
+        limit=20,
+        cursor="abc",
+        sort_by="created_at",
+        sort_order="desc",
+        include_total=False,
+    )
+    product_repo_mock.get_all_by_cursor.assert_called_once_with(
+        column_filters={"title": {"value": "x"}},
+        limit=20,
+        cursor="abc",
+        sort_by="created_at",
+        sort_order="desc",
+        include_total=False,
+    )
+    assert result == ([], None, None)
+
+
+def test_filter_products_by_cursor_use_case():
+    product_repo_mock = MagicMock()
+    product_repo_mock.filter_products_by_cursor.return_value = ([], "next")
+    use_case = FilterProductsByCursorUseCase(product_repo_mock)
+    result = use_case.execute(filter_data={"url": "olx"}, limit=50, cursor="")
+    product_repo_mock.filter_products_by_cursor.assert_called_once_with(
+        filter_data={"url": "olx"}, limit=50, cursor=""
+    )
+    assert result == ([], "next")
+
+
+STATS = {
+    "total_products": 3,
+    "average_price": 20.0,
+    "min_price": 10.0,
+    "max_price": 30.0,
+}
+
+
+def test_get_product_stats_use_case_uses_fresh_snapshot():
+    product_repo_mock = MagicMock()
+    product_repo_mock.get_product_stats_snapshot.return_value = {
+        **STATS,
+        "is_stale": False,
+        "refreshed_at": datetime.now(timezone.utc),
+    }
+    use_case = GetProductStatsUseCase(product_repo_mock)
+    result = use_case.execute(max_age_seconds=300)
+    product_repo_mock.refresh_product_stats_snapshot.assert_not_called()
+    assert result["total_products"] == 3
+    assert "is_stale" not in result
+    assert result["snapshot_age_seconds"] < 300
+
+
+def test_get_product_stats_use_case_refreshes_stale_or_old_snapshot():
+    product_repo_mock = MagicMock()
+    product_repo_mock.refresh_product_stats_snapshot.return_value = {
+        **STATS,
+        "is_stale": False,
+        "refreshed_at": datetime.now(timezone.utc),
+    }
+    use_case = GetProductStatsUseCase(product_repo_mock)
+
+    product_repo_mock.get_product_stats_snapshot.return_value = {
+        **STATS,
+        "is_stale": True,
+        "refreshed_at": datetime.now(timezone.utc),
+    }
+    use_case.execute(max_age_seconds=300)
+
+    product_repo_mock.get_product_stats_snapshot.return_value = {
+        **STATS,
+        "is_stale": False,
+        "refreshed_at": datetime(2020, 1, 1),
+    }
+    use_case.execute(max_age_seconds=300)
+
+    product_repo_mock.get_product_stats_snapshot.return_value = None
+    use_case.execute(max_age_seconds=300)
+
+    assert product_repo_mock.refresh_product_stats_snapshot.call_count == 3
+
+
+def test_get_product_stats_use_case_without_max_age_computes_live():
+    product_repo_mock = MagicMock()
+    product_repo_mock.get_product_stats.return_value = STATS
+    use_case = GetProductStatsUseCase(product_repo_mock)
+    assert use_case.execute() == STATS
+    product_repo_mock.get_product_stats_snapshot.assert_not_called()
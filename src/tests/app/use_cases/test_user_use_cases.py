@@ -14,6 +14,7 @@ from src.app.use_cases.user_use_cases import (
 )
 from src.app.entities import user as UserEntity
 from src.app.interfaces.schemas.user_schema import UserCreate, UserUpdate
+from src.app.security.user_cache import UserCache
 
 
 def test_create_user_use_case_success():
@@ -517,3 +518,34 @@ def test_delete_user_use_case_user_not_found():
     result = use_case.execute(user_id=user_id_to_delete)
     user_repo_mock.delete.assert_called_once_with(user_id_to_delete)
     assert result is False
+
+
+def _cached_user(user_id=1, username="cached"):
+    return UserEntity.User(
+        id=user_id,
+        username=username,
+        email=f"{username}@example.com",
+        hashed_password="hashed",
+    )
+
+
+def test_update_user_use_case_invalidates_user_cache():
+    cache = UserCache()
+    cache.set("olduser", _cached_user(username="olduser"))
+    user_repo_mock = MagicMock()
+    user_repo_mock.get_by_id.return_value = _cached_user(username="olduser")
+    user_repo_mock.get_by_username.return_value = None
+    user_repo_mock.update.return_value = _cached_user(username="newuser")
+    use_case = UpdateUserUseCase(user_repo_mock, cache=cache)
+    use_case.execute(1, UserUpdate(username="newuser"))
+    assert cache.get("olduser") is None
+
+
+def test_delete_user_use_case_invalidates_user_cache():
+    cache = UserCache()
+    cache.set("cached", _cached_user())
+    user_repo_mock = MagicMock()
+    user_repo_mock.delete.return_value = True
+    use_case = DeleteUserUseCase(user_repo_mock, cache=cache)
+    use_case.execute(user_id=1)
+    assert cache.get("cached") is None
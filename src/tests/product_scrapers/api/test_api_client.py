@@ -1,4 +1,5 @@
 import pytest
+import requests
 from unittest.mock import patch, MagicMock
 
 from src.product_scrapers.api.api_client import ApiClient
@@ -9,7 +10,7 @@ def client():
     return ApiClient(access_token="token123")
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_get_search_configs_by_id_success(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -21,7 +22,7 @@ def test_get_search_configs_by_id_success(mock_request, client):
     assert result["search_term"] == "notebook"
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_get_search_configs_by_id_not_found(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 404
@@ -32,7 +33,7 @@ def test_get_search_configs_by_id_not_found(mock_request, client):
     assert result == {}
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_get_source_website_by_name_found(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -43,7 +44,7 @@ def test_get_source_website_by_name_found(mock_request, client):
     assert result["id"] == 2
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_get_source_website_by_name_not_found(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 404
@@ -54,7 +55,7 @@ def test_get_source_website_by_name_not_found(mock_request, client):
     assert result == {}
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_get_search_configs_by_source_website_found(mock_request, client):
     # Mock get_source_website_by_name
     with patch.object(client, "get_source_website_by_name", return_value={"id": 5}):
@@ -68,14 +69,14 @@ def test_get_search_configs_by_source_website_found(mock_request, client):
         assert len(result) == 2
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_get_search_configs_by_source_website_not_found(mock_request, client):
     with patch.object(client, "get_source_website_by_name", return_value={}):
         result = client.get_search_configs_by_source_website("Desconhecido")
         assert result == []
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_get_active_searches(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -91,19 +92,38 @@ def test_get_active_searches(mock_request, client):
     assert len(result) == 2
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_get_existing_product_urls(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.json.return_value = [{"url": "http://a.com"}, {"url": "http://b.com"}]
+    mock_response.json.return_value = ["http://a.com", "http://b.com"]
     mock_request.return_value = mock_response
 
-    urls = client.get_existing_product_urls("url")
-    assert "http://a.com" in urls
-    assert "http://b.com" in urls
+    urls = client.get_existing_product_urls(
+        ["http://a.com", "http://b.com", "http://c.com"], source_website_id=1
+    )
+    assert urls == {"http://a.com", "http://b.com"}
+    assert mock_request.call_args.kwargs["json"] == {
+        "urls": ["http://a.com", "http://b.com", "http://c.com"],
+        "source_website_id": 1,
+    }
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
+def test_get_existing_product_urls_in_chunks(mock_request, client):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = ["http://a.com"]
+    mock_request.return_value = mock_response
+
+    urls = client.get_existing_product_urls(
+        ["http://a.com", "http://b.com", "http://c.com"], chunk_size=2
+    )
+    assert urls == {"http://a.com"}
+    assert mock_request.call_count == 2
+
+
+@patch("requests.Session.request")
 def test_create_product_success(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 201
@@ -113,7 +133,7 @@ def test_create_product_success(mock_request, client):
     assert client.create_product(product) is True
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_create_product_fail(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 400
@@ -123,7 +143,7 @@ def test_create_product_fail(mock_request, client):
     assert client.create_product(product) is False
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_product_exists_true(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -134,7 +154,7 @@ def test_product_exists_true(mock_request, client):
     assert client.product_exists(product) is True
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_product_exists_false(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 404
@@ -145,7 +165,7 @@ def test_product_exists_false(mock_request, client):
     assert client.product_exists(product) is False
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_create_new_products(mock_request, client):
     # Patch product_exists and create_product
     with patch.object(client, "product_exists", return_value=False), patch.object(
@@ -156,7 +176,34 @@ def test_create_new_products(mock_request, client):
         assert created == 2
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
+def test_upsert_products(mock_request, client):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "created": [1, 2],
+        "updated": [3],
+        "rejected": [{"url": "c"}],
+    }
+    mock_request.return_value = mock_response
+
+    products = [{"url": "a"}, {"url": "b"}, {"url": "c"}, {"url": "d"}]
+    created = client.upsert_products(products)
+    assert created == 2
+    mock_request.assert_called_once()
+    assert mock_request.call_args.kwargs["json"] == {"products": products}
+
+
+@patch("requests.Session.request")
+def test_upsert_products_fail(mock_request, client):
+    mock_response = MagicMock()
+    mock_response.status_code = 500
+    mock_request.return_value = mock_response
+
+    assert client.upsert_products([{"url": "a"}]) is None
+
+
+@patch("requests.Session.request")
 def test_get_products(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -168,7 +215,52 @@ def test_get_products(mock_request, client):
     assert len(result) == 2
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
+def test_get_products_page(mock_request, client):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = [{"id": 1}, {"id": 2}]
+    mock_response.headers = {"X-Next-Cursor": "next"}
+    mock_request.return_value = mock_response
+
+    products, next_cursor = client.get_products_page(
+        {"source_website_id": 3}, cursor="", limit=2
+    )
+
+    assert products == [{"id": 1}, {"id": 2}]
+    assert next_cursor == "next"
+    assert mock_request.call_args.kwargs["params"] == {
+        "source_website_id": 3,
+        "cursor": "",
+        "limit": 2,
+    }
+
+
+@patch("requests.Session.request")
+def test_get_products_page_last_page(mock_request, client):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = [{"id": 3}]
+    mock_response.headers = {}
+    mock_request.return_value = mock_response
+
+    products, next_cursor = client.get_products_page(cursor="abc")
+
+    assert products == [{"id": 3}]
+    assert next_cursor is None
+
+
+@patch("requests.Session.request")
+def test_get_products_page_failure(mock_request, client):
+    mock_response = MagicMock()
+    mock_response.status_code = 503
+    mock_response.raise_for_status.side_effect = requests.HTTPError("503")
+    mock_request.return_value = mock_response
+
+    assert client.get_products_page(cursor="abc") is None
+
+
+@patch("requests.Session.request")
 def test_update_product_list(mock_request, client):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -179,7 +271,71 @@ def test_update_product_list(mock_request, client):
     assert updated == 2
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
+def test_bulk_update_products(mock_request, client):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.side_effect = lambda: {
+        "updated": [1, 2],
+        "prices_changed": [1],
+        "not_found": [],
+        "rejected": [],
+    }
+    mock_request.return_value = mock_response
+
+    products = [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4}]
+    updated = client.bulk_update_products(products, chunk_size=2)
+    assert updated == 4
+    assert mock_request.call_count == 2
+    assert mock_request.call_args.kwargs["json"] == {
+        "products": products[2:],
+        "unchanged_ids": [],
+    }
+
+
+@patch("requests.Session.request")
+def test_bulk_update_products_sends_unchanged_ids(mock_request, client):
+    mock_response = MagicMock(status_code=200)
+    mock_response.json.return_value = {"updated": [], "unchanged": [5, 6]}
+    mock_request.return_value = mock_response
+
+    assert client.bulk_update_products([], unchanged_ids=[5, 6]) == 0
+    assert mock_request.call_args.kwargs["json"] == {
+        "products": [],
+        "unchanged_ids": [5, 6],
+    }
+
+
+@patch("requests.Session.request")
+def test_bulk_update_products_reports_failed_chunk(mock_request, client):
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = {"updated": [1, 2], "rejected": []}
+    failed = MagicMock(status_code=500)
+    failed.json.return_value = None
+    mock_request.side_effect = [failed, ok]
+
+    products = [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4}]
+    assert client.bulk_update_products(products, chunk_size=2) is None
+    assert mock_request.call_count == 2
+
+
+@patch("requests.Session.request")
+def test_make_request_refreshes_rejected_token(mock_request):
+    token_cache = MagicMock()
+    token_cache.get_token.side_effect = ["old-token", "new-token"]
+    client = ApiClient(token_cache=token_cache)
+    rejected = MagicMock(status_code=401)
+    ok = MagicMock(status_code=200)
+    mock_request.side_effect = [rejected, ok]
+
+    assert client._make_request("GET", "/products/") is ok
+    token_cache.invalidate.assert_called_once_with("old-token")
+    assert mock_request.call_args.kwargs["headers"] == {
+        "Authorization": "Bearer new-token"
+    }
+
+
+@patch("requests.Session.request")
 def test_make_request_exception(mock_request, client):
     mock_request.side_effect = Exception("fail")
     resp = client._make_request("GET", "/fail")
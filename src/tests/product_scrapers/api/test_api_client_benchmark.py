@@ -0,0 +1,78 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.product_scrapers.api.api_client import ApiClient, build_session
+
+CALLS = 200
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        body = b'{"id": 1, "name": "OLX"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _calls_per_second(client: ApiClient) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        assert client.get_source_website_by_name("OLX")["id"] == 1
+    return CALLS / (time.perf_counter() - start)
+
+
+class UnpooledApiClient(ApiClient):
+    def _make_request(self, method, endpoint, data=None, params=None):
+        url = f"{self.base_url}{endpoint}"
+        return requests.request(method, url, headers=self.headers, timeout=10)
+
+
+def test_pooled_session_reuses_connections(stub_server, monkeypatch, capsys):
+    monkeypatch.setenv("API_URL", f"http://127.0.0.1:{stub_server.server_port}")
+
+    unpooled_rate = _calls_per_second(UnpooledApiClient("token"))
+    unpooled_connections = stub_server.connections
+
+    stub_server.connections = 0
+    pooled_rate = _calls_per_second(ApiClient("token", session=build_session()))
+    pooled_connections = stub_server.connections
+
+    with capsys.disabled():
+        print(
+            f"\nApiClient {CALLS} calls: unpooled {unpooled_rate:.0f}/s "
+            f"({unpooled_connections} connections), pooled {pooled_rate:.0f}/s "
+            f"({pooled_connections} connections)"
+        )
+
+    assert unpooled_connections == CALLS
+    assert pooled_connections == 1
@@ -0,0 +1,122 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from jose import jwt
+
+from src.product_scrapers.api.token_cache import TokenCache
+
+
+def make_token(expires_in: int) -> str:
+    return jwt.encode(
+        {"sub": "celery_user", "exp": int(time.time()) + expires_in},
+        "secret",
+        algorithm="HS256",
+    )
+
+
+def test_get_token_reuses_token_until_refresh_margin():
+    token = make_token(1800)
+    login = MagicMock(return_value=token)
+    cache = TokenCache(login=login, refresh_margin=60)
+
+    assert cache.get_token() == token
+    assert cache.get_token() == token
+    login.assert_called_once()
+
+
+def test_get_token_refreshes_token_close_to_expiry():
+    login = MagicMock(side_effect=[make_token(30), make_token(1800)])
+    cache = TokenCache(login=login, refresh_margin=60)
+
+    first = cache.get_token()
+    second = cache.get_token()
+
+    assert first != second
+    assert login.call_count == 2
+
+
+def test_get_token_does_not_cache_failed_login():
+    login = MagicMock(side_effect=[None, make_token(1800)])
+    cache = TokenCache(login=login)
+
+    assert cache.get_token() is None
+    assert cache.get_token() is not None
+    assert login.call_count == 2
+
+
+def test_get_token_logs_in_once_across_threads():
+    token = make_token(1800)
+
+    def slow_login():
+        time.sleep(0.05)
+        return token
+
+    login = MagicMock(side_effect=slow_login)
+    cache = TokenCache(login=login)
+    threads = [threading.Thread(target=cache.get_token) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    login.assert_called_once()
+
+
+def test_get_token_uses_shared_redis_token():
+    token = make_token(1800)
+    login = MagicMock()
+    cache = TokenCache(login=login, redis_url="redis://localhost:6379/1")
+    cache._redis = MagicMock()
+    cache._redis.get.return_value = token.encode()
+
+    assert cache.get_token() == token
+    login.assert_not_called()
+
+
+def test_get_token_shares_new_token_in_redis():
+    token = make_token(1800)
+    cache = TokenCache(
+        login=MagicMock(return_value=token), redis_url="redis://localhost:6379/1"
+    )
+    cache._redis = MagicMock()
+    cache._redis.get.return_value = None
+
+    cache.get_token()
+
+    args, kwargs = cache._redis.set.call_args
+    assert args == ("celery_worker_token", token)
+    assert 1700 < kwargs["ex"] <= 1740
+
+
+def test_invalidate_forces_new_login():
+    login = MagicMock(side_effect=[make_token(1800), make_token(1800)])
+    cache = TokenCache(login=login)
+
+    cache.get_token()
+    cache.invalidate()
+    cache.get_token()
+
+    assert login.call_count == 2
+
+
+def test_invalidate_keeps_token_refreshed_meanwhile():
+    old_token, new_token = make_token(1800), make_token(1900)
+    cache = TokenCache(login=MagicMock(return_value=new_token))
+
+    cache.get_token()
+    cache.invalidate(old_token)
+
+    assert cache.get_token() == new_token
+    cache.login.assert_called_once()
+
+
+def test_invalidate_drops_rejected_shared_token():
+    token = make_token(1800)
+    cache = TokenCache(login=MagicMock(), redis_url="redis://localhost:6379/1")
+    cache._redis = MagicMock()
+    cache._redis.get.return_value = token.encode()
+
+    cache.invalidate(token)
+
+    cache._redis.delete.assert_called_once_with("celery_worker_token")
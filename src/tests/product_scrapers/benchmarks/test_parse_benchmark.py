@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from src.product_scrapers.benchmarks import parse_benchmark
+from src.product_scrapers.scrapers.factory.scraper_factory import ScraperFactory
+
+SITES = ["olx", "mercado_livre", "estante_virtual", "enjoei"]
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return parse_benchmark.load_corpus()
+
+
+@pytest.mark.parametrize("site", SITES)
+def test_corpus_search_pages_yield_links(corpus, site):
+    scraper = ScraperFactory.create_scraper(site)
+    parse = parse_benchmark.PARSERS["search"](site)
+    for page in corpus[site]["search"]:
+        assert parse(scraper, page)
+
+
+@pytest.mark.parametrize("site", SITES)
+def test_corpus_product_pages_yield_records(corpus, site):
+    scraper = ScraperFactory.create_scraper(site)
+    parse = parse_benchmark.PARSERS["product"](site)
+    for page in corpus[site]["product"]:
+        record = parse(scraper, page)
+        assert record["title"]
+        assert record["price"]
+
+
+def test_benchmark_pages_reports_metrics(corpus):
+    scraper = ScraperFactory.create_scraper("olx")
+    result = parse_benchmark.benchmark_pages(
+        parse_benchmark.PARSERS["product"]("olx"),
+        scraper,
+        corpus["olx"]["product"],
+        iterations=2,
+    )
+    assert result["pages"] == 2 * len(corpus["olx"]["product"])
+    assert result["pages_per_sec"] > 0
+    assert result["p99_ms"] >= result["p50_ms"]
+    assert result["peak_memory_kb"] > 0
+
+
+def test_find_regressions_flags_slowdowns_and_memory_growth():
+    baseline = {
+        "olx.search": {"pages_per_sec": 100, "peak_memory_kb": 100},
+        "olx.product": {"pages_per_sec": 100, "peak_memory_kb": 100},
+    }
+    results = {
+        "olx.search": {"pages_per_sec": 70, "peak_memory_kb": 100},
+        "olx.product": {"pages_per_sec": 90, "peak_memory_kb": 130},
+        "enjoei.search": {"pages_per_sec": 1, "peak_memory_kb": 1},
+    }
+    regressions = parse_benchmark.find_regressions(results, baseline, tolerance=0.25)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("olx.search")
+    assert regressions[1].startswith("olx.product")
+
+
+@pytest.mark.skipif(
+    not os.getenv("RUN_SCRAPER_BENCHMARKS"),
+    reason="set RUN_SCRAPER_BENCHMARKS=1 to compare parse throughput to the baseline",
+)
+def test_parse_throughput_has_not_regressed():
+    results = parse_benchmark.run_benchmark()
+    assert (
+        parse_benchmark.find_regressions(results, parse_benchmark.load_baseline()) == []
+    )
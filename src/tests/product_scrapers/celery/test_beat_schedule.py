@@ -0,0 +1,95 @@
+from datetime import datetime, time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from celery import Celery
+
+from src.product_scrapers.celery.beat_schedule import DynamicDBScheduler
+
+
+def _search(search_id, hour=8, is_active=True, updated_at=None):
+    return SimpleNamespace(
+        id=search_id,
+        is_active=is_active,
+        preferred_time=time(hour, 30),
+        frequency_days=1,
+        updated_at=updated_at or datetime(2026, 1, 1),
+    )
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = DynamicDBScheduler(app=Celery(), lazy=True)
+    scheduler._search_ids = set()
+    scheduler._watermark = None
+    return scheduler
+
+
+def test_apply_search_adds_entry(scheduler):
+    assert scheduler.apply_search(_search(1)) is True
+
+    entry = scheduler.schedule["run_search_1"]
+    assert entry.args == (1,)
+    assert entry.schedule.hour == {8}
+
+
+def test_unchanged_search_keeps_entry(scheduler):
+    scheduler.apply_search(_search(1))
+    entry = scheduler.schedule["run_search_1"]
+
+    assert scheduler.apply_search(_search(1)) is False
+    assert scheduler.schedule["run_search_1"] is entry
+
+
+def test_changed_search_keeps_run_state(scheduler):
+    scheduler.apply_search(_search(1))
+    entry = scheduler.schedule["run_search_1"]
+    entry.total_run_count = 4
+    last_run_at = entry.last_run_at
+
+    assert scheduler.apply_search(_search(1, hour=9)) is True
+    assert scheduler.schedule["run_search_1"] is entry
+    assert entry.schedule.hour == {9}
+    assert entry.total_run_count == 4
+    assert entry.last_run_at == last_run_at
+
+
+def test_deactivated_search_is_removed(scheduler):
+    scheduler.apply_search(_search(1))
+
+    assert scheduler.apply_search(_search(1, is_active=False)) is True
+    assert "run_search_1" not in scheduler.schedule
+    assert scheduler._search_ids == set()
+
+
+def test_remove_deleted_only_scans_ids_when_count_differs(scheduler):
+    scheduler.apply_search(_search(1))
+    scheduler.apply_search(_search(2))
+    db = MagicMock()
+    count_query = db.query.return_value.filter.return_value
+
+    count_query.scalar.return_value = 2
+    assert scheduler.remove_deleted(db) is False
+    count_query.__iter__.assert_not_called()
+
+    count_query.scalar.return_value = 1
+    count_query.__iter__.return_value = iter([(2,)])
+    assert scheduler.remove_deleted(db) is True
+    assert list(scheduler.schedule) == ["run_search_2"]
+
+
+def test_changed_moves_watermark(scheduler):
+    db = MagicMock()
+    query = db.query.return_value.filter.return_value
+    query.all.return_value = [
+        _search(1, updated_at=datetime(2026, 1, 2)),
+        _search(2, updated_at=datetime(2026, 1, 3)),
+    ]
+
+    assert len(scheduler._changed(db)) == 2
+    assert scheduler._watermark == datetime(2026, 1, 3)
+
+    query.all.return_value = []
+    scheduler._changed(db)
+    assert scheduler._watermark == datetime(2026, 1, 3)
@@ -0,0 +1,57 @@
+import pytest
+
+from src.product_scrapers.celery.claim_check import (
+    ClaimCheckStore,
+    build_claim_check_store,
+    check_in,
+    iter_results,
+    release,
+)
+
+RESULTS = [
+    {"status": "success", "data": {"url": "u1", "description": "long text"}},
+    {"status": "error", "url": "u2", "message": "boom"},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ClaimCheckStore(str(tmp_path))
+
+
+def test_check_in_passes_only_a_key(store):
+    claim = check_in(store, RESULTS)
+
+    assert set(claim) == {"claim_check", "count"}
+    assert claim["count"] == 2
+    assert list(iter_results(store, claim)) == RESULTS
+
+
+def test_identical_batches_share_a_key(store):
+    assert store.check_in(RESULTS) == store.check_in(RESULTS)
+
+
+def test_iter_results_mixes_inline_results_and_claim_checks(store):
+    payloads = [RESULTS[0], store.check_in([RESULTS[1]])]
+    assert list(iter_results(store, payloads)) == RESULTS
+
+
+def test_released_claim_check_is_treated_as_consumed(store):
+    claim = store.check_in(RESULTS)
+    release(store, claim)
+
+    assert list(iter_results(store, claim)) == []
+
+
+def test_without_store_results_stay_inline():
+    assert check_in(None, RESULTS) is RESULTS
+    assert list(iter_results(None, RESULTS)) == RESULTS
+    with pytest.raises(ValueError):
+        list(iter_results(None, {"claim_check": "abc", "count": 1}))
+
+
+def test_build_claim_check_store(tmp_path):
+    assert build_claim_check_store(None) is None
+    assert isinstance(build_claim_check_store(f"file://{tmp_path}"), ClaimCheckStore)
+    with pytest.raises(ValueError):
+        build_claim_check_store("s3://bucket")
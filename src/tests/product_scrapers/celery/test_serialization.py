@@ -0,0 +1,62 @@
+from datetime import datetime
+from decimal import Decimal
+
+from kombu.serialization import dumps as kombu_dumps, loads as kombu_loads
+
+from src.product_scrapers.celery import serialization
+from src.product_scrapers.celery.serialization import (
+    COMPACT_CONTENT_TYPE,
+    COMPACT_SERIALIZER,
+    PayloadStats,
+    dumps,
+    encoded_size,
+    loads,
+    register_compact_serializer,
+)
+
+
+def test_small_payloads_are_not_compressed():
+    payload = dumps({"status": "success"})
+    assert payload[:1] == b"j"
+    assert loads(payload) == {"status": "success"}
+
+
+def test_large_payloads_are_compressed(monkeypatch):
+    monkeypatch.setattr(serialization, "COMPRESSION_THRESHOLD", 100)
+    results = [{"status": "success", "data": {"description": "x" * 500}}] * 10
+
+    payload = dumps(results)
+
+    assert payload[:1] == b"z"
+    assert len(payload) < 200
+    assert loads(payload) == results
+    assert encoded_size(results) == len(payload)
+
+
+def test_non_json_values_are_converted():
+    payload = dumps({"price": Decimal("10.50"), "at": datetime(2024, 1, 1)})
+    assert loads(payload) == {"price": 10.5, "at": "2024-01-01T00:00:00"}
+
+
+def test_registered_with_kombu():
+    register_compact_serializer()
+
+    content_type, encoding, body = kombu_dumps(
+        {"urls": ["u1"]}, serializer=COMPACT_SERIALIZER
+    )
+
+    assert content_type == COMPACT_CONTENT_TYPE
+    assert encoding == "binary"
+    assert kombu_loads(body, content_type, encoding, accept=[COMPACT_CONTENT_TYPE]) == {
+        "urls": ["u1"]
+    }
+
+
+def test_payload_stats_reports_bytes_per_result():
+    stats = PayloadStats(log_every=0)
+    stats.record("update_product", 100)
+    stats.record("update_product", 300)
+
+    assert stats.snapshot() == {
+        "update_product": {"results": 2, "bytes": 400, "bytes_per_result": 200.0}
+    }
@@ -0,0 +1,129 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.product_scrapers.celery import tasks
+from src.product_scrapers.celery.claim_check import ClaimCheckStore
+from src.product_scrapers.celery.serialization import dumps
+
+RESULTS = [{"status": "success", "data": {"url": "u1", "title": "A"}}]
+
+
+@pytest.fixture
+def api_client(monkeypatch):
+    client = MagicMock()
+    client.get_source_website_by_name.return_value = {"id": 3}
+    monkeypatch.setattr(tasks, "ApiClient", lambda **kwargs: client)
+    return client
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ClaimCheckStore(str(tmp_path))
+    monkeypatch.setattr(tasks, "claim_check_store", store)
+    return store
+
+
+def test_save_products_releases_saved_batch(api_client, store):
+    claim = store.check_in(RESULTS)
+    api_client.upsert_products.return_value = 1
+
+    assert tasks.save_products.run(claim, "olx") == {
+        "status": "success",
+        "created": 1,
+    }
+    assert store.check_out(claim["claim_check"]) is None
+
+
+def test_save_products_keeps_batch_when_upsert_fails(api_client, store):
+    claim = store.check_in(RESULTS)
+    api_client.upsert_products.return_value = None
+
+    with pytest.raises(tasks.BatchSaveError):
+        tasks.save_products.run(claim, "olx")
+    assert store.check_out(claim["claim_check"]) == RESULTS
+
+
+def test_update_products_keeps_batch_when_update_fails(api_client, store):
+    claim = store.check_in(RESULTS)
+    api_client.bulk_update_products.return_value = None
+
+    with pytest.raises(tasks.BatchSaveError):
+        tasks.update_products.run([claim], "olx")
+    assert store.check_out(claim["claim_check"]) == RESULTS
+
+
+def test_update_products_marks_unchanged_products_checked(api_client, store):
+    api_client.bulk_update_products.return_value = 0
+    unchanged = {"status": "unchanged", "id": 7, "url": "u7"}
+
+    result = tasks.update_products.run([unchanged], "olx")
+
+    api_client.bulk_update_products.assert_called_once_with([], [7])
+    assert result == {"status": "success", "updated": 0, "unchanged": 1}
+
+
+def test_run_scraper_update_retries_page_it_could_not_fetch(api_client, monkeypatch):
+    api_client.get_products_page.return_value = None
+    dispatch = MagicMock()
+    monkeypatch.setattr(tasks, "chord", dispatch)
+
+    with pytest.raises(tasks.ProductsPageError):
+        tasks.run_scraper_update.run("olx", "abc", "2024-01-01", 3)
+    dispatch.assert_not_called()
+
+
+def test_run_scraper_update_ends_on_empty_page(api_client, monkeypatch):
+    api_client.get_products_page.return_value = ([], None)
+    dispatch = MagicMock()
+    monkeypatch.setattr(tasks, "chord", dispatch)
+
+    tasks.run_scraper_update.run("olx", "abc", "2024-01-01", 3)
+
+    dispatch.assert_not_called()
+
+
+def test_run_search_retry_skips_urls_dispatched_before(api_client, monkeypatch):
+    api_client.get_existing_product_urls.return_value = {"u2"}
+    redis_client = MagicMock()
+    redis_client.smembers.return_value = {b"u1"}
+    monkeypatch.setattr(tasks, "scraper_redis", redis_client)
+    monkeypatch.setattr(tasks, "SEARCH_HARVEST_MODE", False)
+    lease = MagicMock()
+    lease.return_value.__enter__.return_value = MagicMock(supports_harvest=False)
+    monkeypatch.setattr(tasks.scraper_pool, "lease", lease)
+    dispatch = MagicMock()
+    monkeypatch.setattr(tasks.process_urls_list, "apply_async", dispatch)
+
+    def get_new_urls_by_chunk(search, is_known, chunk_size):
+        urls = ["u1", "u2", "u3"]
+        known = is_known(urls)
+        yield [url for url in urls if url not in known]
+
+    manager = MagicMock()
+    manager.get_new_urls_by_chunk.side_effect = get_new_urls_by_chunk
+    manager.is_complete_record.return_value = False
+    monkeypatch.setattr(tasks, "ScraperManager", lambda scraper: manager)
+
+    tasks.run_search.push_request(id="search-task", retries=1)
+    try:
+        result = tasks.run_search.run("notebook", "olx")
+    finally:
+        tasks.run_search.pop_request()
+
+    assert result["new_urls"] == 1
+    redis_client.smembers.assert_called_once_with("run_search:dispatched:search-task")
+    assert dispatch.call_args.kwargs["args"][0]["urls"] == ["u3"]
+    redis_client.delete.assert_called_once_with("run_search:dispatched:search-task")
+
+
+def test_result_size_is_measured_for_ignored_chunk_results(monkeypatch):
+    stats = MagicMock()
+    monkeypatch.setattr(tasks, "payload_stats", stats)
+    result = ["claim-check-key"]
+
+    tasks.record_result_size(sender=tasks.scrape_products_chunk, result=result)
+
+    stats.record.assert_called_once_with(
+        tasks.scrape_products_chunk.name, len(dumps(result))
+    )
@@ -0,0 +1,129 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from src.product_scrapers.scrapers.base.async_requests_scraper import (
+    AsyncRequestScraper,
+)
+from src.product_scrapers.scrapers.base.circuit_breaker import (
+    CircuitOpenError,
+    set_circuit_breaker,
+)
+
+
+class DummyAsyncScraper(AsyncRequestScraper):
+    max_concurrency = 3
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    def headers(self):
+        return {"User-Agent": "test"}
+
+    def parse_product(self, url, response):
+        return {"url": url, "title": response.json()["title"]}
+
+    def _build_async_client(self):
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+def test_scrape_many_returns_results_in_order():
+    def handler(request):
+        return httpx.Response(200, json={"title": request.url.path.strip("/")})
+
+    scraper = DummyAsyncScraper(handler)
+    results = scraper.scrape_many([f"http://test.com/{i}" for i in range(10)])
+
+    assert [r["data"]["title"] for r in results] == [str(i) for i in range(10)]
+    assert all(r["status"] == "success" for r in results)
+
+
+def test_scrape_many_bounds_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"title": "ok"})
+
+    scraper = DummyAsyncScraper(handler)
+    scraper.scrape_many([f"http://test.com/{i}" for i in range(12)])
+
+    assert peak == 3
+
+
+def test_scrape_many_reports_errors_per_url():
+    def handler(request):
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"title": "ok"})
+
+    scraper = DummyAsyncScraper(handler)
+    with patch("asyncio.sleep") as mock_sleep:
+        mock_sleep.return_value = None
+        results = scraper.scrape_many(["http://test.com/ok", "http://test.com/missing"])
+
+    assert results[0]["status"] == "success"
+    assert results[1] == {
+        "status": "error",
+        "url": "http://test.com/missing",
+        "message": "Could not fetch http://test.com/missing",
+    }
+
+
+def test_async_retry_request_retries_then_succeeds():
+    responses = iter([httpx.Response(503), httpx.Response(200, json={})])
+
+    def handler(request):
+        return next(responses)
+
+    scraper = DummyAsyncScraper(handler)
+
+    async def run():
+        async with scraper._build_async_client() as client:
+            return await scraper.async_retry_request(
+                client, "http://test.com", backoff_factor=0
+            )
+
+    response = asyncio.run(run())
+    assert response.status_code == 200
+
+
+def test_scrape_many_defers_urls_while_circuit_is_open():
+    class BlockedScraper(DummyAsyncScraper):
+        source_website_name = "olx"
+
+    breaker = MagicMock()
+    breaker.check.side_effect = CircuitOpenError("olx", 120)
+    set_circuit_breaker(breaker)
+    try:
+        results = BlockedScraper(lambda request: httpx.Response(200)).scrape_many(
+            ["http://test.com/1"]
+        )
+    finally:
+        set_circuit_breaker(None)
+
+    assert results == [
+        {"status": "deferred", "url": "http://test.com/1", "retry_in": 120}
+    ]
+
+
+def test_async_scraping_is_opt_in_per_site():
+    scraper = DummyAsyncScraper(handler=None)
+    scraper.source_website_name = "olx"
+    assert not scraper.async_scraping_enabled()
+
+    with patch(
+        "src.product_scrapers.scrapers.base.async_requests_scraper.ASYNC_SCRAPING_SITES",
+        {"olx"},
+    ):
+        assert scraper.async_scraping_enabled()
+
+    scraper.source_website_name = "enjoei"
+    scraper.async_scraping = True
+    assert scraper.async_scraping_enabled()
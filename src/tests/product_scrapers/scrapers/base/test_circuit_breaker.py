@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.product_scrapers.scrapers.base.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+def make_breaker(failures=1, ttl_ms=-2, **kwargs):
+    redis_client = MagicMock()
+    redis_client.pipeline.return_value.execute.return_value = [failures, True]
+    redis_client.pttl.return_value = ttl_ms
+    return CircuitBreaker(redis_client, **kwargs), redis_client
+
+
+def test_closed_circuit_allows_requests():
+    breaker, redis_client = make_breaker()
+    breaker.check("olx")
+    redis_client.pttl.assert_called_once_with("circuit:olx:open")
+
+
+def test_open_circuit_raises_with_remaining_time():
+    breaker, _ = make_breaker(ttl_ms=120000)
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.check("olx")
+    assert exc.value.retry_in == 120
+
+
+def test_state_is_cached_between_checks():
+    breaker, redis_client = make_breaker(check_interval=60)
+    breaker.check("olx")
+    breaker.check("olx")
+    redis_client.pttl.assert_called_once()
+
+
+def test_failures_below_threshold_keep_circuit_closed():
+    breaker, redis_client = make_breaker(failures=2, failure_threshold=5)
+    assert breaker.record_failure("olx") is False
+    redis_client.set.assert_not_called()
+
+
+def test_threshold_opens_circuit_for_every_worker():
+    breaker, redis_client = make_breaker(
+        failures=5, failure_threshold=5, open_seconds=300
+    )
+
+    assert breaker.record_failure("olx") is True
+    redis_client.set.assert_called_once_with("circuit:olx:open", 1, ex=300)
+    with pytest.raises(CircuitOpenError):
+        breaker.check("olx")
+
+
+def test_redis_failure_keeps_circuit_closed():
+    breaker, redis_client = make_breaker()
+    redis_client.pttl.side_effect = Exception("connection refused")
+    redis_client.pipeline.side_effect = Exception("connection refused")
+
+    breaker.check("olx")
+    assert breaker.record_failure("olx") is False
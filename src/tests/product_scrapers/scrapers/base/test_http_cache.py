@@ -0,0 +1,144 @@
+import pytest
+from unittest.mock import MagicMock
+
+from src.product_scrapers.scrapers.base.http_cache import (
+    CachedPage,
+    FileHttpCache,
+    PageNotModified,
+    RedisHttpCache,
+    build_http_cache,
+    set_http_cache,
+)
+from src.product_scrapers.scrapers.base.requests_scraper import RequestScraper
+
+
+class DummyScraper(RequestScraper):
+    def headers(self):
+        return {"User-Agent": "test"}
+
+
+def make_response(status_code=200, content=b"<html>page</html>", headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    return response
+
+
+@pytest.fixture
+def http_cache(tmp_path):
+    cache = FileHttpCache(str(tmp_path), store_bodies=True)
+    set_http_cache(cache)
+    yield cache
+    set_http_cache(None)
+
+
+def test_file_cache_round_trip(http_cache):
+    http_cache.set(
+        "http://test.com/p",
+        make_response(headers={"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024"}),
+    )
+
+    cached = http_cache.get("http://test.com/p")
+
+    assert cached.content == b"<html>page</html>"
+    assert cached.conditional_headers() == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2024",
+    }
+
+
+def test_cache_stores_only_validators_by_default(tmp_path):
+    cache = FileHttpCache(str(tmp_path))
+    cache.set("http://test.com/p", make_response(headers={"ETag": '"abc"'}))
+
+    cached = cache.get("http://test.com/p")
+
+    assert not cached.has_body
+    assert cached.conditional_headers() == {"If-None-Match": '"abc"'}
+
+
+def test_cache_skips_responses_without_validators(http_cache):
+    http_cache.set("http://test.com/p", make_response())
+
+    assert http_cache.get("http://test.com/p") is None
+
+
+def test_redis_cache_stores_with_ttl():
+    client = MagicMock()
+    store = {}
+    client.set.side_effect = lambda key, value, ex: store.__setitem__(key, value)
+    client.get.side_effect = store.get
+    cache = RedisHttpCache(client, ttl_seconds=60)
+
+    cache.set("http://test.com/p", make_response(headers={"ETag": '"abc"'}))
+
+    assert client.set.call_args.kwargs["ex"] == 60
+    assert cache.get("http://test.com/p").etag == '"abc"'
+
+
+def test_build_http_cache(tmp_path):
+    assert build_http_cache(None, 60) is None
+    assert isinstance(build_http_cache(f"file://{tmp_path}", 60), FileHttpCache)
+    with pytest.raises(ValueError):
+        build_http_cache("ftp://cache", 60)
+
+
+def test_fetch_page_sends_validators_and_raises_when_not_modified(http_cache):
+    http_cache.set("http://test.com/p", make_response(headers={"ETag": '"abc"'}))
+    scraper = DummyScraper()
+    scraper.retry_request = MagicMock(return_value=make_response(status_code=304))
+
+    with pytest.raises(PageNotModified):
+        scraper.fetch_page("http://test.com/p", scraper.headers(), True)
+
+    scraper.retry_request.assert_called_once_with(
+        "http://test.com/p", {"User-Agent": "test", "If-None-Match": '"abc"'}
+    )
+
+
+def test_fetch_page_returns_cached_body_when_not_modified(http_cache):
+    http_cache.set("http://test.com/p", make_response(headers={"ETag": '"abc"'}))
+    scraper = DummyScraper()
+    scraper.retry_request = MagicMock(return_value=make_response(status_code=304))
+
+    page = scraper.fetch_page("http://test.com/p")
+
+    assert isinstance(page, CachedPage)
+    assert page.text == "<html>page</html>"
+
+
+def test_fetch_page_stores_fresh_response(http_cache):
+    scraper = DummyScraper()
+    response = make_response(content=b"new", headers={"ETag": '"v2"'})
+    scraper.retry_request = MagicMock(return_value=response)
+
+    assert scraper.fetch_page("http://test.com/p") is response
+    assert http_cache.get("http://test.com/p").content == b"new"
+
+
+def test_fetch_page_without_cache_is_plain_request():
+    scraper = DummyScraper()
+    response = make_response()
+    scraper.retry_request = MagicMock(return_value=response)
+
+    assert scraper.fetch_page("http://test.com/p", {"A": "1"}) is response
+    scraper.retry_request.assert_called_once_with("http://test.com/p", {"A": "1"})
+
+
+def test_fetch_page_without_cached_body_only_revalidates_for_updates(tmp_path):
+    cache = FileHttpCache(str(tmp_path))
+    cache.set("http://test.com/p", make_response(headers={"ETag": '"abc"'}))
+    set_http_cache(cache)
+    scraper = DummyScraper()
+    response = make_response()
+    scraper.retry_request = MagicMock(return_value=response)
+    try:
+        assert scraper.fetch_page("http://test.com/p", {"A": "1"}) is response
+        scraper.retry_request.assert_called_once_with("http://test.com/p", {"A": "1"})
+
+        scraper.retry_request.return_value = make_response(status_code=304)
+        with pytest.raises(PageNotModified):
+            scraper.fetch_page("http://test.com/p", {"A": "1"}, True)
+    finally:
+        set_http_cache(None)
@@ -0,0 +1,39 @@
+from src.product_scrapers.scrapers.base.parsers import (
+    extract_assigned_json,
+    extract_attribute_json,
+    extract_script_json,
+    parse_html,
+)
+
+
+def test_parse_html_uses_configured_backend():
+    soup = parse_html(b"<html><h1 class='t'>Title</h1></html>")
+    assert soup.find("h1", class_="t").get_text() == "Title"
+
+
+def test_extract_script_json():
+    content = (
+        b'<script id="__NEXT_DATA__" type="application/json">{"a": [1, 2]}</script>'
+    )
+    assert extract_script_json(content, "__NEXT_DATA__") == {"a": [1, 2]}
+    assert extract_script_json(content, "missing") is None
+
+
+def test_extract_attribute_json_unescapes_value():
+    content = '<script data-json="{&quot;ad&quot;: {&quot;x&quot;: &quot;&amp;&quot;}}" id="initial-data"></script>'
+    assert extract_attribute_json(content, "initial-data", "data-json") == {
+        "ad": {"x": "&"}
+    }
+
+
+def test_extract_attribute_json_single_quotes():
+    content = (
+        "<script id='x'></script><script id=\"initial-data\" data-json='{\"a\": 1}'>"
+    )
+    assert extract_attribute_json(content, "initial-data", "data-json") == {"a": 1}
+
+
+def test_extract_assigned_json():
+    content = '<script>window.__INITIAL_STATE__ = {"a": "b=c"};\n</script>'
+    assert extract_assigned_json(content, "window.__INITIAL_STATE__") == {"a": "b=c"}
+    assert extract_assigned_json(content, "window.__OTHER__") is None
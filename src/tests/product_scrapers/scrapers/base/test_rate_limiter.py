@@ -0,0 +1,68 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.product_scrapers.scrapers.base import rate_limiter as rate_limiter_module
+from src.product_scrapers.scrapers.base.rate_limiter import RateLimiter
+from src.product_scrapers.scrapers.base.requests_scraper import RequestScraper
+
+
+def make_limiter(script_results, rate=(2.0, 5)):
+    redis_client = MagicMock()
+    script = MagicMock(side_effect=script_results)
+    redis_client.register_script.return_value = script
+    provider = MagicMock(return_value=rate)
+    return RateLimiter(redis_client, rate_provider=provider), script, provider
+
+
+def test_try_acquire_uses_site_bucket_and_rate():
+    limiter, script, _ = make_limiter(["0"])
+    assert limiter.try_acquire("olx") == 0.0
+    script.assert_called_once_with(keys=["rate_limit:olx"], args=[2.0, 5])
+
+
+def test_try_acquire_skips_unlimited_sites():
+    limiter, script, _ = make_limiter([], rate=None)
+    assert limiter.try_acquire("olx") == 0.0
+    script.assert_not_called()
+
+
+def test_acquire_sleeps_until_token_available():
+    limiter, script, _ = make_limiter(["0.25", "0.1", "0"])
+    with patch("src.product_scrapers.scrapers.base.rate_limiter.time.sleep") as sleep:
+        waited = limiter.acquire("olx")
+    assert sleep.call_count == 2
+    assert waited == pytest.approx(0.35)
+
+
+def test_acquire_async_sleeps_until_token_available():
+    limiter, script, _ = make_limiter(["0.01", "0"])
+    assert asyncio.run(limiter.acquire_async("olx")) == pytest.approx(0.01)
+
+
+def test_rate_config_is_cached():
+    limiter, _, provider = make_limiter(["0", "0"])
+    limiter.try_acquire("olx")
+    limiter.try_acquire("olx")
+    provider.assert_called_once_with("olx")
+
+
+def test_redis_failure_does_not_block():
+    limiter, _, _ = make_limiter(Exception("connection refused"))
+    assert limiter.try_acquire("olx") == 0.0
+
+
+def test_retry_request_waits_for_site_rate_limit():
+    class DummyScraper(RequestScraper):
+        source_website_name = "olx"
+
+        def headers(self):
+            return {}
+
+    limiter = MagicMock()
+    with patch("cloudscraper.create_scraper"):
+        scraper = DummyScraper()
+    with patch.object(rate_limiter_module, "_rate_limiter", limiter):
+        scraper.retry_request("http://test.com")
+    limiter.acquire.assert_called_once_with("olx")
@@ -1,3 +1,6 @@
+import threading
+import time
+
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -67,3 +70,27 @@ def test_retry_request_unexpected_exception(mock_create_scraper, dummy_scraper):
     scraper = DummyScraper()
     resp = scraper.retry_request("http://test.com")
     assert resp is None
+
+
+@patch("cloudscraper.create_scraper")
+def test_map_concurrently_gives_each_thread_its_own_session(mock_create_scraper):
+    mock_create_scraper.side_effect = lambda: MagicMock()
+    scraper = DummyScraper()
+    scraper.search_concurrency = 3
+    main_session = scraper._session
+
+    def session_for(item):
+        time.sleep(0.01)
+        return threading.get_ident(), scraper._session
+
+    results = list(scraper.map_concurrently(session_for, range(6)))
+
+    sessions_by_thread = {}
+    for thread_id, session in results:
+        assert session is not main_session
+        assert sessions_by_thread.setdefault(thread_id, session) is session
+    assert len({id(s) for s in sessions_by_thread.values()}) == len(sessions_by_thread)
+    for session in sessions_by_thread.values():
+        session.cookies.update.assert_called_once_with(main_session.cookies)
+        session.close.assert_called_once()
+    assert scraper._session is main_session
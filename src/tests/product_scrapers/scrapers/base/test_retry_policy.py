@@ -0,0 +1,111 @@
+from email.utils import formatdate
+from unittest.mock import MagicMock, patch
+import time
+
+import pytest
+import requests
+
+from src.product_scrapers.scrapers.base.circuit_breaker import (
+    CircuitOpenError,
+    set_circuit_breaker,
+)
+from src.product_scrapers.scrapers.base.requests_scraper import RequestScraper
+from src.product_scrapers.scrapers.base.retry_policy import (
+    RetryPolicy,
+    parse_retry_after,
+)
+
+
+class DummyScraper(RequestScraper):
+    source_website_name = "olx"
+
+    def headers(self):
+        return {}
+
+
+def http_error(status_code, headers=None):
+    response = MagicMock(status_code=status_code, headers=headers or {})
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+        response=response
+    )
+    return response
+
+
+def test_permanent_statuses_are_not_retried():
+    policy = RetryPolicy()
+    assert policy.next_delay(0, 404) is None
+    assert policy.next_delay(0, 410) is None
+    assert policy.next_delay(0, 403) is None
+
+
+def test_transient_statuses_use_jittered_backoff():
+    policy = RetryPolicy(backoff_factor=2, jitter=0.5)
+    for _ in range(20):
+        assert 2 <= policy.next_delay(2, 503) <= 4
+    assert 0.5 <= policy.next_delay(0, None) <= 1
+
+
+def test_backoff_is_capped_and_bounded_by_max_retries():
+    policy = RetryPolicy(max_retries=10, backoff_factor=10, max_backoff=5, jitter=0)
+    assert policy.next_delay(3, 500) == 5
+    assert policy.next_delay(10, 500) is None
+
+
+def test_retry_after_overrides_backoff():
+    policy = RetryPolicy(max_retry_after=60)
+    assert policy.next_delay(0, 429, {"Retry-After": "7"}) == 7
+    assert policy.next_delay(0, 429, {"Retry-After": "600"}) is None
+
+
+def test_parse_retry_after_http_date():
+    value = formatdate(time.time() + 30, usegmt=True)
+    assert parse_retry_after(value) == pytest.approx(30, abs=2)
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after(None) is None
+
+
+@patch("cloudscraper.create_scraper")
+def test_retry_request_gives_up_on_not_found(mock_create_scraper):
+    session = MagicMock()
+    session.get.return_value = http_error(404)
+    mock_create_scraper.return_value = session
+
+    with patch("time.sleep") as sleep:
+        assert DummyScraper().retry_request("http://test.com") is None
+
+    session.get.assert_called_once()
+    sleep.assert_not_called()
+
+
+@patch("cloudscraper.create_scraper")
+def test_retry_request_sleeps_for_retry_after(mock_create_scraper):
+    ok = MagicMock(status_code=200)
+    session = MagicMock()
+    session.get.side_effect = [http_error(503, {"Retry-After": "3"}), ok]
+    mock_create_scraper.return_value = session
+
+    with patch("time.sleep") as sleep:
+        assert DummyScraper().retry_request("http://test.com") is ok
+
+    sleep.assert_called_once_with(3.0)
+
+
+@patch("cloudscraper.create_scraper")
+def test_retry_request_records_blocks_and_stops_when_circuit_opens(
+    mock_create_scraper,
+):
+    session = MagicMock()
+    session.get.return_value = http_error(429, {"Retry-After": "1"})
+    mock_create_scraper.return_value = session
+    breaker = MagicMock()
+    breaker.check.side_effect = [None, CircuitOpenError("olx", 300)]
+    set_circuit_breaker(breaker)
+
+    try:
+        with patch("time.sleep"), pytest.raises(CircuitOpenError):
+            DummyScraper().retry_request("http://test.com")
+    finally:
+        set_circuit_breaker(None)
+
+    breaker.record_failure.assert_called_once_with("olx")
+    session.get.assert_called_once()
@@ -0,0 +1,81 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.product_scrapers.scrapers.base.http_cache import PageNotModified
+from src.product_scrapers.scrapers.factory.scraper_pool import ScraperPool
+
+
+@pytest.fixture
+def pool():
+    return ScraperPool(factory=lambda name: MagicMock(name=name), max_errors=2)
+
+
+def test_lease_reuses_instance_per_site(pool):
+    with pool.lease("olx") as first:
+        pass
+    with pool.lease("OLX") as second:
+        pass
+    with pool.lease("enjoei") as other:
+        pass
+
+    assert first is second
+    assert other is not first
+
+
+def test_lease_gives_each_thread_its_own_instance(pool):
+    with pool.lease("olx") as main_scraper:
+        pass
+    leased = []
+
+    def worker():
+        with pool.lease("olx") as scraper:
+            leased.append(scraper)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert leased[0] is not main_scraper
+
+
+def test_lease_recycles_session_after_repeated_errors(pool):
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            with pool.lease("olx") as scraper:
+                raise ValueError("blocked")
+
+    scraper.reset_session.assert_called_once()
+
+
+def test_lease_ignores_not_modified_pages(pool):
+    for _ in range(3):
+        with pytest.raises(PageNotModified):
+            with pool.lease("olx") as scraper:
+                raise PageNotModified("http://test.com")
+
+    scraper.reset_session.assert_not_called()
+
+
+def test_lease_recycles_session_by_age():
+    pool = ScraperPool(factory=lambda name: MagicMock(), max_age_seconds=60)
+    with patch("time.monotonic", return_value=0):
+        with pool.lease("olx") as scraper:
+            pass
+    with patch("time.monotonic", return_value=61):
+        with pool.lease("olx"):
+            pass
+
+    scraper.reset_session.assert_called_once()
+
+
+def test_close_all_closes_and_forgets_instances(pool):
+    with pool.lease("olx") as scraper:
+        pass
+
+    pool.close_all()
+
+    scraper.close.assert_called_once()
+    with pool.lease("olx") as new_scraper:
+        assert new_scraper is not scraper
@@ -1,6 +1,11 @@
 import pytest
 from unittest.mock import MagicMock
 
+from src.product_scrapers.scrapers.base.async_requests_scraper import (
+    AsyncRequestScraper,
+)
+from src.product_scrapers.scrapers.base.circuit_breaker import CircuitOpenError
+from src.product_scrapers.scrapers.base.requests_scraper import RequestScraper
 from src.product_scrapers.scrapers.manager.scraper_manager import ScraperManager
 
 
@@ -60,3 +65,82 @@ def test__chunk_urls():
     urls = ["a", "b", "c", "d", "e"]
     chunks = list(ScraperManager._chunk_urls(urls, chunk_size=2))
     assert chunks == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_scrape_products_falls_back_to_sequential_scraping(manager, mock_scraper):
+    mock_scraper.scrape_data.side_effect = [{"url": "url1"}, Exception("boom")]
+    result = manager.scrape_products(["url1", "url2"])
+    assert result == [
+        {"status": "success", "data": {"url": "url1"}},
+        {"status": "error", "url": "url2", "message": "boom"},
+    ]
+
+
+def test_scrape_products_uses_async_scraper():
+    scraper = MagicMock(spec=AsyncRequestScraper)
+    scraper.async_scraping_enabled.return_value = True
+    scraper.scrape_many.return_value = [{"status": "success", "data": {}}]
+    result = ScraperManager(scraper=scraper).scrape_products(["url1"])
+    scraper.scrape_many.assert_called_once_with(["url1"])
+    assert result == [{"status": "success", "data": {}}]
+
+
+def test_scrape_products_keeps_session_unless_async_opted_in():
+    class Scraper(RequestScraper, AsyncRequestScraper):
+        source_website_name = "olx"
+        search_concurrency = 1
+        search = update_data = headers = parse_product = MagicMock()
+        scrape_data = MagicMock(return_value={"url": "url1"})
+
+    scraper = Scraper()
+    scraper.scrape_many = MagicMock()
+
+    result = ScraperManager(scraper=scraper).scrape_products(["url1"])
+
+    scraper.scrape_many.assert_not_called()
+    assert result == [{"status": "success", "data": {"url": "url1"}}]
+
+
+def test_get_new_urls_by_chunk_streams_deduplicated_new_urls(manager, mock_scraper):
+    mock_scraper.search.return_value = iter(
+        [["u1", "u2", "u2"], ["u2", "u3", "u4"], ["u5"]]
+    )
+    is_known = MagicMock(side_effect=lambda urls: {"u3"} & set(urls))
+
+    chunks = list(manager.get_new_urls_by_chunk("notebook", is_known, chunk_size=2))
+
+    assert chunks == [["u1", "u2"], ["u4", "u5"]]
+    assert is_known.call_args_list[1].args[0] == ["u3", "u4"]
+
+
+def test_harvest_new_products_by_chunk_skips_known_products(manager, mock_scraper):
+    mock_scraper.harvest.return_value = iter(
+        [[{"url": "u1", "title": "a"}, {"url": "u2"}], [{"url": "u1"}, {"url": "u3"}]]
+    )
+    is_known = MagicMock(side_effect=lambda urls: {"u2"} & set(urls))
+
+    chunks = list(manager.harvest_new_products_by_chunk("notebook", is_known, 5))
+
+    assert chunks == [[{"url": "u1", "title": "a"}, {"url": "u3"}]]
+
+
+def test_is_complete_record():
+    record = {"url": "u", "title": "t", "price": "10", "city": "c", "state": "s"}
+
+    assert ScraperManager.is_complete_record(record)
+    assert not ScraperManager.is_complete_record({**record, "price": ""})
+    assert not ScraperManager.is_complete_record({**record, "city": None})
+
+
+def test_scrape_products_defers_urls_blocked_by_open_circuit(manager, mock_scraper):
+    mock_scraper.scrape_data.side_effect = [
+        {"url": "url1"},
+        CircuitOpenError("olx", 30),
+    ]
+
+    result = manager.scrape_products(["url1", "url2"])
+
+    assert result == [
+        {"status": "success", "data": {"url": "url1"}},
+        {"status": "deferred", "url": "url2", "retry_in": 30},
+    ]
@@ -70,8 +70,8 @@ def test_search_multiple_pages(mock_extract_links, mock_get_search_data, scraper
         (["url1"], "CURSOR"),
         (["url2"], None),
     ]
-    result = scraper.search("notebook")
-    assert result == ["url1", "url2"]
+    result = list(scraper.search("notebook"))
+    assert result == [["url1"], ["url2"]]
     assert mock_get_search_data.call_count == 2
 
 
@@ -105,3 +105,36 @@ def test_update_data_merges_product_and_updated(scrape_data_mock, scraper):
 
 def test_str_repr(scraper):
     assert str(scraper) == "Enjoei Scraper"
+
+
+def test__extract_records_uses_canonical_path(scraper):
+    data = {
+        "data": {
+            "search": {
+                "products": {
+                    "edges": [
+                        {
+                            "node": {
+                                "id": "123",
+                                "path": "/p/notebook-123",
+                                "title": "Notebook",
+                                "price": {"listed": 900, "sale": 800},
+                                "photo": "abc.jpg",
+                            },
+                            "cursor": "CURSOR1",
+                        },
+                        {"node": {"id": "456"}, "cursor": "CURSOR2"},
+                    ]
+                }
+            }
+        }
+    }
+
+    records, cursor = scraper._extract_records(data)
+
+    assert records[0]["url"] == "https://www.enjoei.com.br/p/notebook-123"
+    assert records[0]["price"] == 900
+    assert records[0]["image_urls"].endswith("/notebook-123/1200xN/abc.jpg")
+    # Without a canonical path only the product page URL is known
+    assert records[1] == {"url": "https://pages.enjoei.com.br/products/456/v2.json"}
+    assert cursor == "CURSOR2"
@@ -38,7 +38,7 @@ def test_search_success(mock_retry, scraper):
     with patch.object(
         scraper, "_get_products_list", wraps=scraper._get_products_list
     ) as mock_get_products_list:
-        links = scraper.search("livro")
+        links = [url for page in scraper.search("livro") for url in page]
         assert "/produto1" in links[0]
         assert "/produto2" in links[1]
         assert mock_get_products_list.called
@@ -57,15 +57,11 @@ def test_get_products_list(scraper):
 
 
 @patch.object(EstanteVirtualScraper, "retry_request")
-@patch.object(EstanteVirtualScraper, "_parse_html")
 @patch.object(EstanteVirtualScraper, "_extract_initial_state")
-def test_scrape_data_success(
-    mock_extract_initial_state, mock_parse_html, mock_retry, scraper
-):
+def test_scrape_data_success(mock_extract_initial_state, mock_retry, scraper):
     mock_resp = MagicMock()
     mock_resp.content = b"<html></html>"
     mock_retry.return_value = mock_resp
-    mock_parse_html.return_value = MagicMock()
     mock_extract_initial_state.return_value = {
         "Product": {
             "name": "Livro",
@@ -92,15 +88,11 @@ def test_scrape_data_success(
 
 
 @patch.object(EstanteVirtualScraper, "retry_request")
-@patch.object(EstanteVirtualScraper, "_parse_html")
 @patch.object(EstanteVirtualScraper, "_extract_initial_state")
-def test_scrape_data_no_data(
-    mock_extract_initial_state, mock_parse_html, mock_retry, scraper
-):
+def test_scrape_data_no_data(mock_extract_initial_state, mock_retry, scraper):
     mock_resp = MagicMock()
     mock_resp.content = b"<html></html>"
     mock_retry.return_value = mock_resp
-    mock_parse_html.return_value = MagicMock()
     mock_extract_initial_state.return_value = None
     data = scraper.scrape_data("https://www.estantevirtual.com.br/produto1")
     assert data == {}
@@ -155,3 +147,28 @@ def test_update_data_merges_product_and_updated(scrape_data_mock, scraper):
 
 def test_str_repr(scraper):
     assert str(scraper) == "Estante Virtual Scraper"
+
+
+@patch.object(EstanteVirtualScraper, "retry_request")
+def test_search_fans_out_remaining_pages_in_order(mock_retry, scraper):
+    def page(url, headers, params):
+        number = int(params["page"])
+        resp = MagicMock()
+        resp.json.return_value = {
+            "totalPages": 5,
+            "parentSkus": [{"productSlug": f"/produto{number}"}],
+        }
+        return resp
+
+    mock_retry.side_effect = page
+    pages = list(scraper.search("livro"))
+    assert pages == [[f"{scraper.BASE_URL}/produto{n}"] for n in range(1, 6)]
+    assert mock_retry.call_count == 5
+
+
+def test_extract_initial_state(scraper):
+    content = (
+        b'<script>window.__INITIAL_STATE__ = {"Product": {"name": "Livro"}};</script>'
+    )
+    assert scraper._extract_initial_state(content) == {"Product": {"name": "Livro"}}
+    assert scraper._extract_initial_state(b"<html></html>") == {}
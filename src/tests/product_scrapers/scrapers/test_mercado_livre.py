@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import patch, MagicMock
 
+from src.product_scrapers.scrapers.base.circuit_breaker import CircuitOpenError
+from src.product_scrapers.scrapers.base.parsers import parse_html
 from src.product_scrapers.scrapers.mercado_livre import MercadoLivreScraper
 
 
@@ -31,7 +33,7 @@ def test_extract_links(scraper):
       <span class="poly-component__title-wrapper"><a href="https://click1/ignorar"></a></span>
     </html>
     """
-    links = scraper._extract_links(html)
+    links = scraper._extract_links(parse_html(html))
     assert "https://produto1" in links
     assert "https://produto2" in links
     assert all(not link.startswith("https://click1") for link in links)
@@ -53,17 +55,35 @@ def test_search_success(mock_extract_links, mock_retry, scraper):
         ["url1", "url2"],
         [],
     ]
-    result = scraper.search("notebook")
-    assert result == ["url1", "url2"]
+    result = list(scraper.search("notebook"))
+    assert result == [["url1", "url2"]]
     assert mock_extract_links.call_count == 2
 
 
+@patch.object(MercadoLivreScraper, "retry_request")
+def test_search_parses_first_page_once(mock_retry, scraper):
+    mock_resp = MagicMock()
+    mock_resp.text = """
+    <span class="ui-search-search-result__quantity-results">1 resultado</span>
+    <span class="poly-component__title-wrapper"><a href="https://produto1"></a></span>
+    """
+    mock_retry.return_value = mock_resp
+
+    with patch(
+        "src.product_scrapers.scrapers.mercado_livre.parse_html", wraps=parse_html
+    ) as mock_parse:
+        result = list(scraper.search(""))
+
+    assert result == [["https://produto1"]]
+    mock_parse.assert_called_once()
+
+
 @patch.object(MercadoLivreScraper, "retry_request")
 def test_search_no_results(mock_retry, scraper):
     mock_resp = MagicMock()
     mock_resp.text = ""
     mock_retry.return_value = mock_resp
-    result = scraper.search("notebook")
+    result = list(scraper.search("notebook"))
     assert result == []
 
 
@@ -160,7 +180,7 @@ def test_scrape_data_success(mock_retry, scraper):
     mock_resp.content = html
     mock_retry.return_value = mock_resp
 
-    with patch("src.product_scrapers.scrapers.mercado_livre.BeautifulSoup") as bs_mock:
+    with patch("src.product_scrapers.scrapers.mercado_livre.parse_html") as bs_mock:
         soup_mock = MagicMock()
         bs_mock.return_value = soup_mock
         scraper._extract_title = MagicMock(return_value="Produto")
@@ -189,3 +209,61 @@ def test_update_data_merges_product_and_updated(scrape_data_mock, scraper):
 
 def test_str_repr(scraper):
     assert str(scraper) == "Mercado Livre Scraper"
+
+
+def test_extract_total_results(scraper):
+    html = '<span class="ui-search-search-result__quantity-results">1.234 resultados</span>'
+    assert scraper._extract_total_results(parse_html(html)) == 1234
+    assert scraper._extract_total_results(parse_html("<html></html>")) == 0
+
+
+@patch.object(MercadoLivreScraper, "retry_request")
+def test_search_fans_out_known_offsets(mock_retry, scraper):
+    def page(url, headers):
+        resp = MagicMock()
+        offset = url.split("_Desde_")[1].split("_")[0] if "_Desde_" in url else "1"
+        resp.text = (
+            '<span class="ui-search-search-result__quantity-results">6 resultados</span>'
+            f'<span class="poly-component__title-wrapper"><a href="https://p{offset}a"></a></span>'
+            f'<span class="poly-component__title-wrapper"><a href="https://p{offset}b"></a></span>'
+        )
+        return resp
+
+    mock_retry.side_effect = page
+    pages = list(scraper.search("notebook"))
+    assert pages == [
+        ["https://p1a", "https://p1b"],
+        ["https://p3a", "https://p3b"],
+        ["https://p5a", "https://p5b"],
+    ]
+    assert mock_retry.call_count == 3
+
+
+@patch.object(MercadoLivreScraper, "retry_request")
+def test_search_propagates_open_circuit(mock_retry, scraper):
+    mock_retry.side_effect = CircuitOpenError("mercado_livre", 30)
+
+    with pytest.raises(CircuitOpenError):
+        list(scraper.search("notebook"))
+
+
+@patch.object(MercadoLivreScraper, "retry_request")
+def test_fan_out_propagates_open_circuit(mock_retry, scraper):
+    first_page = MagicMock()
+    first_page.text = (
+        '<span class="ui-search-search-result__quantity-results">6 resultados</span>'
+        '<span class="poly-component__title-wrapper"><a href="https://p1a"></a></span>'
+        '<span class="poly-component__title-wrapper"><a href="https://p1b"></a></span>'
+    )
+
+    def page(url, headers):
+        if "_Desde_" in url:
+            raise CircuitOpenError("mercado_livre", 30)
+        return first_page
+
+    mock_retry.side_effect = page
+
+    pages = scraper.search("notebook")
+    assert next(pages) == ["https://p1a", "https://p1b"]
+    with pytest.raises(CircuitOpenError):
+        list(pages)
@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -34,8 +35,8 @@ def test_search_success(mock_extract_links, mock_retry, scraper):
         ["url1", "url2"],
         [],
     ]
-    result = scraper.search("notebook")
-    assert result == ["url1", "url2"]
+    result = list(scraper.search("notebook"))
+    assert result == [["url1", "url2"]]
     assert mock_extract_links.call_count == 2
 
 
@@ -45,7 +46,7 @@ def test_search_no_results(mock_retry, scraper):
     mock_resp.text = ""
     mock_retry.return_value = mock_resp
     with pytest.raises(Exception, match="No results found"):
-        scraper.search("notebook")
+        list(scraper.search("notebook"))
 
 
 def test_build_search_url(scraper):
@@ -86,24 +87,19 @@ def test_extract_links_no_ads(scraper):
 
 
 def test_extract_json_data_success(scraper):
-    class SoupMock:
-        def find(self, tag, attrs):
-            if tag == "script" and attrs.get("id") == "initial-data":
-
-                class Script:
-                    def __getitem__(self, key):
-                        if key == "data-json":
-                            return '{"ad": {"subject": "t", "body": "d", "listId": "1", "priceValue": "R$ 100,00", "images": [{"original": "img"}], "user": {"name": "seller"}, "location": {"municipality": "city", "uf": "state"}}}'
-
-                return Script()
-            return None
-
-    soup = SoupMock()
-    data = scraper._extract_json_data(soup)
+    html_content = (
+        '<script id="initial-data" data-json="{&quot;ad&quot;: {&quot;subject&quot;: '
+        '&quot;t&quot;, &quot;priceValue&quot;: &quot;R$ 100,00&quot;}}"></script>'
+    )
+    data = scraper._extract_json_data(html_content)
     assert data["subject"] == "t"
     assert data["priceValue"] == "R$ 100,00"
 
 
+def test_extract_json_data_missing(scraper):
+    assert scraper._extract_json_data(b"<html></html>") == {}
+
+
 @patch.object(OLXScraper, "retry_request")
 def test_scrape_data_success(mock_retry, scraper):
     html = """
@@ -115,23 +111,13 @@ def test_scrape_data_success(mock_retry, scraper):
     mock_resp.content = html
     mock_retry.return_value = mock_resp
 
-    # Patch BeautifulSoup to use our SoupMock
-    with patch("src.product_scrapers.scrapers.olx.BeautifulSoup") as bs_mock:
-        soup_mock = MagicMock()
-        bs_mock.return_value = soup_mock
-        soup_mock.find.return_value = MagicMock()
-        soup_mock.find.return_value.__getitem__.side_effect = (
-            lambda k: '{"ad": {"subject": "t", "body": "d", "listId": "1", "priceValue": "R$ 100,00", "images": [{"original": "img"}], "user": {"name": "seller"}, "location": {"municipality": "city", "uf": "state"}}}'
-            if k == "data-json"
-            else None
-        )
-        data = scraper.scrape_data("http://test.com")
-        assert data["title"] == "t"
-        assert data["price"] == "100.00"
-        assert data["city"] == "city"
-        assert data["state"] == "state"
-        assert data["seller_name"] == "seller"
-        assert data["is_available"] is True
+    data = scraper.scrape_data("http://test.com")
+    assert data["title"] == "t"
+    assert data["price"] == "100.00"
+    assert data["city"] == "city"
+    assert data["state"] == "state"
+    assert data["seller_name"] == "seller"
+    assert data["is_available"] is True
 
 
 @patch.object(OLXScraper, "scrape_data")
@@ -146,3 +132,47 @@ def test_update_data_merges_product_and_updated(scrape_data_mock, scraper):
 
 def test_str_repr(scraper):
     assert str(scraper) == "OLX Scraper"
+
+
+def test_extract_links_deduplicates_preserving_order(scraper):
+    ads = [{"url": "u2"}, {"url": "u1"}, {"url": "u2"}, {"url": None}, {}]
+    html_content = (
+        '<script id="__NEXT_DATA__">'
+        + json.dumps({"props": {"pageProps": {"ads": ads}}})
+        + "</script>"
+    )
+    assert scraper._extract_links(html_content) == ["u2", "u1"]
+
+
+def test_extract_records_builds_partial_products(scraper):
+    html_content = """
+    <script id="__NEXT_DATA__">
+      {"props":{"pageProps":{"ads":[
+        {"url":"u1","subject":"Notebook","priceValue":"R$ 1.200","listId":1,
+         "locationDetails":{"municipality":"Curitiba","uf":"PR"},
+         "images":[{"original":"img.jpg"}]},
+        {"url":"u1","subject":"Duplicate"},
+        {"url":"u2","subject":"No location","priceValue":"R$ 10"}
+      ]}}}
+    </script>
+    """
+
+    records = scraper._extract_records(html_content)
+
+    assert [r["url"] for r in records] == ["u1", "u2"]
+    assert records[0]["title"] == "Notebook"
+    assert records[0]["price"] == "1200"
+    assert records[0]["city"] == "Curitiba"
+    assert records[0]["state"] == "PR"
+    assert records[0]["source_product_code"] == "OLX - 1"
+    assert records[0]["image_urls"] == "img.jpg"
+    assert records[1]["city"] is None
+
+
+@patch.object(OLXScraper, "retry_request")
+@patch.object(OLXScraper, "_extract_records")
+def test_harvest_yields_records_per_page(mock_extract_records, mock_retry, scraper):
+    mock_retry.return_value = MagicMock(text="html")
+    mock_extract_records.side_effect = [[{"url": "u1"}], []]
+
+    assert list(scraper.harvest("notebook")) == [[{"url": "u1"}]]
@@ -11,5 +11,6 @@ rm -rf alembic/versions
 mkdir -p alembic/versions
 alembic revision --autogenerate -m "First Migration"
 alembic upgrade head
+python3 src/scripts/backfill_current_price.py
 
 uvicorn src.main:app --host 0.0.0.0 --port 8000 --reload